@@ -49,6 +49,33 @@ class Settings(BaseSettings):
     initial_ability_score: float = 0.0
     initial_ability_variance: float = 1.0
     
+    # Stroke analysis
+    stroke_analysis_workers: int = 2  # Process pool size for batch scoring (0 = inline)
+    stroke_analysis_pool_threshold: int = 8  # Batch size that goes to the pool
+    
+    # Learning event log
+    event_batch_size: int = 500  # Events per multi-row insert
+    event_flush_interval_ms: int = 250  # Max time an event waits in the buffer
+    event_max_buffer: int = 50000  # Oldest events are dropped beyond this
+    event_partition_check_minutes: int = 60  # How often upcoming monthly partitions are created
+    
+    # Projections (progress rebuilt from the event log)
+    projection_workers: int = 2  # Processes folding events during rebuilds (0 = inline)
+    projection_batch_size: int = 200  # Children per rebuild transaction
+    
+    # Write coalescing (counter increments on hot progress rows)
+    write_coalescing_enabled: bool = False  # Buffer stars/Nooms/feelings wheel increments
+    write_coalescing_window_ms: int = 250  # How long increments are aggregated
+    
+    # Star ledger
+    star_ledger_shards: int = 0  # Star sub-counters per child for bursty awards (0 = off)
+    
+    # Caching
+    child_cache_ttl_seconds: int = 30  # Known-active child ids
+    child_cache_negative_ttl_seconds: int = 60  # Unknown or deleted child ids
+    child_cache_max_entries: int = 50000
+    word_bank_ttl_seconds: int = 300  # Static word bank snapshot
+    
     # CORS - Allow all origins for mobile app (can't use list type with Railway env vars)
     cors_origins: str = "*"
     
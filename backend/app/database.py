@@ -3,8 +3,8 @@ WonderWorld Learning Adventure - Database Configuration
 """
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import MetaData
-from typing import AsyncGenerator
+from sqlalchemy import MetaData, text
+from typing import AsyncGenerator, List, NamedTuple
 from app.config import settings
 
 # Naming convention for constraints
@@ -59,6 +59,98 @@ async def init_db():
         await conn.run_sync(Base.metadata.create_all)
 
 
+# ============== Upgrades ==============
+
+# Advisory lock held while upgrading, so instances starting together
+# upgrade one at a time
+UPGRADE_LOCK_ID = 5067
+
+
+class Upgrade(NamedTuple):
+    """A change create_all cannot make to a table that already exists."""
+    name: str
+    pending: str  # Query that is true until the upgrade has been applied
+    statement: str
+
+
+# Checked on every startup; each is applied once
+UPGRADES = [
+    # Merge duplicate (child_id, word_id) rows into the most recently
+    # practiced one, then add the constraint the practice upsert targets
+    Upgrade(
+        "word_progress_unique",
+        "SELECT NOT EXISTS "
+        "(SELECT 1 FROM pg_constraint WHERE conname = 'uq_word_progress_child_id')",
+        """
+    DO $$
+    BEGIN
+        CREATE TEMPORARY TABLE word_progress_ranked ON COMMIT DROP AS
+        SELECT id, child_id, word_id, row_number() OVER (
+            PARTITION BY child_id, word_id
+            ORDER BY last_practiced_at DESC NULLS LAST, times_practiced DESC NULLS LAST, id
+        ) AS rank
+        FROM word_progress;
+
+        UPDATE word_progress wp
+        SET times_practiced = merged.times_practiced,
+            times_correct = merged.times_correct,
+            mastery_score = merged.mastery_score,
+            is_mastered = merged.is_mastered,
+            can_recognize = merged.can_recognize,
+            can_sound_out = merged.can_sound_out,
+            can_read = merged.can_read,
+            can_spell = merged.can_spell,
+            mastered_at = merged.mastered_at
+        FROM (
+            SELECT ranked.child_id, ranked.word_id,
+                   sum(coalesce(p.times_practiced, 0)) AS times_practiced,
+                   sum(coalesce(p.times_correct, 0)) AS times_correct,
+                   max(p.mastery_score) AS mastery_score,
+                   coalesce(bool_or(p.is_mastered), false) AS is_mastered,
+                   coalesce(bool_or(p.can_recognize), false) AS can_recognize,
+                   coalesce(bool_or(p.can_sound_out), false) AS can_sound_out,
+                   coalesce(bool_or(p.can_read), false) AS can_read,
+                   coalesce(bool_or(p.can_spell), false) AS can_spell,
+                   min(p.mastered_at) AS mastered_at
+            FROM word_progress_ranked ranked
+            JOIN word_progress p ON p.id = ranked.id
+            GROUP BY ranked.child_id, ranked.word_id
+            HAVING count(*) > 1
+        ) merged, word_progress_ranked keeper
+        WHERE keeper.rank = 1
+          AND keeper.child_id = merged.child_id
+          AND keeper.word_id = merged.word_id
+          AND wp.id = keeper.id;
+
+        DELETE FROM word_progress wp
+        USING word_progress_ranked ranked
+        WHERE wp.id = ranked.id AND ranked.rank > 1;
+
+        ALTER TABLE word_progress
+            ADD CONSTRAINT uq_word_progress_child_id UNIQUE (child_id, word_id);
+    END
+    $$
+    """
+    ),
+]
+
+
+async def upgrade_db() -> List[str]:
+    """
+    Bring existing tables up to the current models (run after init_db).
+    
+    Returns the names of the upgrades applied by this call.
+    """
+    applied = []
+    async with engine.begin() as conn:
+        await conn.execute(text(f"SELECT pg_advisory_xact_lock({UPGRADE_LOCK_ID})"))
+        for upgrade in UPGRADES:
+            if await conn.scalar(text(upgrade.pending)):
+                await conn.execute(text(upgrade.statement))
+                applied.append(upgrade.name)
+    return applied
+
+
 async def close_db():
     """Close database connections."""
     await engine.dispose()
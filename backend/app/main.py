@@ -9,8 +9,13 @@ from contextlib import asynccontextmanager
 import logging
 
 from app.config import settings
-from app.database import init_db, close_db
+from app.database import init_db, upgrade_db, close_db, async_session_maker
 from app.routers import children, literacy, numeracy, tasks, game, parent_dashboard, sel
+from app.services import stroke_analysis
+from app.services.literacy_service import LiteracyService
+from app.services.numeracy_service import NumeracyService
+from app.services.event_log import ensure_event_partitions, event_writer
+from app.services.write_coalescer import write_coalescer
 
 # Configure logging
 logging.basicConfig(
@@ -26,10 +31,30 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting WonderWorld Learning Adventure API...")
     await init_db()
+    upgraded = await upgrade_db()
+    await ensure_event_partitions()
+    async with async_session_maker() as db:
+        if "word_progress_unique" in upgraded:
+            # Merging duplicate word progress rows can leave the counters off
+            recounted = await LiteracyService(db).rebuild_words_mastered_counts()
+            logger.info(f"Recounted mastered words for {recounted} children")
+        rebuilt = await LiteracyService(db).rebuild_letter_mastery_totals(stale_only=True)
+        converted = await NumeracyService(db).backfill_numeral_bitmaps()
+    if rebuilt:
+        logger.info(f"Rebuilt letter mastery totals for {rebuilt} children")
+    if converted:
+        logger.info(f"Merged legacy numeral recognition into bitmaps for {converted} children")
     logger.info("Database initialized successfully")
+    event_writer.start()
+    write_coalescer.start()
+    glyphs = stroke_analysis.warm_reference_paths()
+    logger.info(f"Stroke analysis ready ({glyphs} reference letters)")
     yield
     # Shutdown
     logger.info("Shutting down...")
+    await write_coalescer.stop()
+    await event_writer.stop()
+    stroke_analysis.shutdown_pool()
     await close_db()
     logger.info("Database connections closed")
 
@@ -3,12 +3,14 @@ WonderWorld Learning Adventure - SQLAlchemy Models
 """
 from sqlalchemy import (
     Column, String, Integer, Boolean, DateTime, ForeignKey, 
-    Numeric, Text, Enum as SQLEnum, JSON, ARRAY
+    Numeric, Text, Enum as SQLEnum, JSON, ARRAY, UniqueConstraint, LargeBinary, Index,
+    BigInteger, Sequence
 )
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.sql import func, text
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 import enum
 import uuid
 
@@ -56,10 +58,63 @@ class WordLevel(str, enum.Enum):
     FIVE_LETTER = "5-letter"
 
 
+class LearningEventType(str, enum.Enum):
+    PHONICS_PRACTICE = "phonics_practice"
+    WORD_BUILDING = "word_building"
+    STORY_COMPLETED = "story_completed"
+    SHAPE_RECOGNITION = "shape_recognition"
+    FRIENDSHIP_STORY_COMPLETED = "friendship_story_completed"
+    BREATHING_EXERCISE = "breathing_exercise"
+    # Progress events, replayed by the projections
+    LETTER_TRACED = "letter_traced"
+    WORD_MASTERED = "word_mastered"
+    SUBITIZING_ATTEMPT = "subitizing_attempt"
+    COUNTING_ATTEMPT = "counting_attempt"
+    NUMERAL_RECOGNITION = "numeral_recognition"
+    OPERATION_ATTEMPT = "operation_attempt"
+    ST_PUZZLE_ATTEMPT = "st_puzzle_attempt"
+    NOOMS_INTERACTION = "nooms_interaction"
+    FEELINGS_WHEEL_USED = "feelings_wheel_used"
+    EMOTION_LOGGED = "emotion_logged"
+    KINDNESS_TASK_COMPLETED = "kindness_task_completed"
+    SHARING_SCENARIO = "sharing_scenario"
+    CALM_DOWN_TECHNIQUE_LEARNED = "calm_down_technique_learned"
+    STARS_ADDED = "stars_added"
+    ACHIEVEMENT_UNLOCKED = "achievement_unlocked"
+    SESSION_STARTED = "session_started"
+
+
 def generate_uuid():
     return str(uuid.uuid4())
 
 
+# Numerals 0-127 fit the recognition bitmaps; the app uses 0-100
+NUMERAL_BITMAP_BYTES = 16
+
+
+def numeral_bitmaps_to_dict(seen: Optional[bytes], recognized: Optional[bytes]) -> Dict[str, bool]:
+    seen_bits = int.from_bytes(seen or b"", "little")
+    recognized_bits = int.from_bytes(recognized or b"", "little")
+    return {
+        str(numeral): bool(recognized_bits >> numeral & 1)
+        for numeral in range(NUMERAL_BITMAP_BYTES * 8)
+        if seen_bits >> numeral & 1
+    }
+
+
+def numeral_dict_to_bitmaps(numerals: Dict[str, bool]) -> Tuple[bytes, bytes]:
+    seen_bits = recognized_bits = 0
+    for numeral, recognized in (numerals or {}).items():
+        bit = 1 << int(numeral)
+        seen_bits |= bit
+        if recognized:
+            recognized_bits |= bit
+    return (
+        seen_bits.to_bytes(NUMERAL_BITMAP_BYTES, "little"),
+        recognized_bits.to_bytes(NUMERAL_BITMAP_BYTES, "little"),
+    )
+
+
 # Parent/Guardian Model
 class Parent(Base):
     __tablename__ = "parents"
@@ -139,8 +194,8 @@ class LiteracyProgress(Base):
     # Current stage
     current_stage = Column(String(50), default="first_steps")
     
-    # Letter mastery (JSON: {"A": {"traced": true, "sound_known": true, "mastery": 0.85}})
-    letter_mastery = Column(JSON, default=dict)
+    # Letter mastery (JSONB: {"A": {"traced": true, "sound_known": true, "mastery": 0.85}})
+    letter_mastery = Column(JSONB, default=dict)
     
     # Phonemic awareness
     phoneme_blending_score = Column(Numeric(5, 2), default=0)
@@ -149,6 +204,8 @@ class LiteracyProgress(Base):
     
     # Writing
     tracing_accuracy = Column(Numeric(5, 2), default=0)
+    letter_mastery_sum = Column(Numeric(12, 6), default=0)  # Sum of per-letter mastery
+    letters_traced = Column(Integer, default=0)  # Letters in letter_mastery
     independent_writing_level = Column(SQLEnum(SkillLevel), default=SkillLevel.BEGINNER)
     
     # Comprehension
@@ -199,6 +256,12 @@ class Word(Base):
 # Word Progress Model
 class WordProgress(Base):
     __tablename__ = "word_progress"
+    __table_args__ = (
+        # One progress row per child and word (target of the practice upsert)
+        UniqueConstraint("child_id", "word_id"),
+        # "Next K due words" is a single index range read
+        Index("ix_word_progress_child_next_review", "child_id", "next_review_at"),
+    )
     
     id = Column(String(36), primary_key=True, default=generate_uuid)
     child_id = Column(String(36), ForeignKey("children.id", ondelete="CASCADE"), nullable=False)
@@ -219,15 +282,43 @@ class WordProgress(Base):
     last_practiced_at = Column(DateTime(timezone=True))
     mastered_at = Column(DateTime(timezone=True))
     
+    # Spaced repetition (SM-2)
+    review_streak = Column(Integer, default=0)  # Correct answers in a row
+    review_interval_days = Column(Integer, default=0)
+    ease_factor = Column(Numeric(4, 2), default=2.5)
+    next_review_at = Column(DateTime(timezone=True))
+    
     child = relationship("Child", back_populates="word_progress")
 
 
 # Tracing Session Model
 class TracingSession(Base):
     __tablename__ = "tracing_sessions"
+    __table_args__ = (
+        # Makes batch uploads idempotent (NULL client ids never conflict)
+        UniqueConstraint("child_id", "client_id"),
+        # Covering indexes for keyset-paginated history (index-only scans)
+        Index(
+            "ix_tracing_sessions_child_completed",
+            "child_id", text("completed_at DESC"), text("id DESC"),
+            postgresql_include=[
+                "letter", "word", "stroke_accuracy", "stroke_smoothness",
+                "time_taken_ms", "attempt_number"
+            ]
+        ),
+        Index(
+            "ix_tracing_sessions_child_letter_completed",
+            "child_id", "letter", text("completed_at DESC"), text("id DESC"),
+            postgresql_include=[
+                "word", "stroke_accuracy", "stroke_smoothness",
+                "time_taken_ms", "attempt_number"
+            ]
+        ),
+    )
     
     id = Column(String(36), primary_key=True, default=generate_uuid)
     child_id = Column(String(36), ForeignKey("children.id", ondelete="CASCADE"), nullable=False)
+    client_id = Column(String(64))  # Device-generated id for offline uploads
     
     # What was traced
     letter = Column(String(1))
@@ -240,8 +331,9 @@ class TracingSession(Base):
     time_taken_ms = Column(Integer)
     attempt_number = Column(Integer, default=1)
     
-    # PathMetrics data
-    path_deviation_data = Column(JSON)
+    # PathMetrics data (loaded only when explicitly requested)
+    path_deviation_data = deferred(Column(JSON))
+    path_samples = deferred(Column(LargeBinary))  # Packed strokes, see stroke_codec
     
     completed_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -258,7 +350,15 @@ class NumeracyProgress(Base):
     # Core skills
     subitizing_mastery = Column(Numeric(5, 2), default=0)
     counting_range = Column(Integer, default=0)
-    numeral_recognition = Column(JSON, default=dict)
+    
+    # Numeral recognition: bit n of numeral_seen is set once numeral n has
+    # been attempted, bit n of numeral_recognized if its latest attempt
+    # succeeded (set_bit/get_bit order: bit n is bit n % 8 of byte n // 8)
+    numeral_seen = Column(LargeBinary(NUMERAL_BITMAP_BYTES))
+    numeral_recognized = Column(LargeBinary(NUMERAL_BITMAP_BYTES))
+    # Superseded JSON dict; NumeracyService.backfill_numeral_bitmaps merges
+    # it into the bitmaps at startup and clears it
+    legacy_numeral_recognition = deferred(Column("numeral_recognition", JSON))
     
     # Operations
     addition_mastery = Column(Numeric(5, 2), default=0)
@@ -276,9 +376,26 @@ class NumeracyProgress(Base):
     # Digital manipulatives
     nooms_interactions = Column(Integer, default=0)
     
+    # Per-fact accuracy/latency grid (see services/fact_fluency.py)
+    fact_matrix = deferred(Column(LargeBinary))
+    
+    # Shape recognition: a 4-bit counter per shape (bit order in
+    # numeracy_service.SHAPES) and a bitmask of shapes attempted
+    shape_counters = Column(BigInteger, default=0)
+    shapes_seen = Column(Integer, default=0)
+    
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     child = relationship("Child", back_populates="numeracy_progress")
+    
+    @property
+    def numeral_recognition(self) -> Dict[str, bool]:
+        """Numeral -> recognized, for the numerals attempted so far."""
+        return numeral_bitmaps_to_dict(self.numeral_seen, self.numeral_recognized)
+    
+    @numeral_recognition.setter
+    def numeral_recognition(self, value: Dict[str, bool]) -> None:
+        self.numeral_seen, self.numeral_recognized = numeral_dict_to_bitmaps(value)
 
 
 # SEL Progress Model
@@ -314,6 +431,8 @@ class AbilityEstimate(Base):
     correct_responses = Column(Integer, default=0)
     
     last_updated = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    child = relationship("Child", back_populates="ability_estimates")
 
 
 # Task Model
@@ -434,6 +553,62 @@ class MilestoneEvent(Base):
     child = relationship("Child", back_populates="milestone_events")
 
 
+# Learning Event Model (append-only, range-partitioned by month)
+class LearningEvent(Base):
+    __tablename__ = "learning_events"
+    __table_args__ = (
+        Index("ix_learning_events_child_occurred", "child_id", "occurred_at"),
+        Index("ix_learning_events_child_id", "child_id", "id"),  # Projection replay order
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+    
+    # Global append order; the partition key must be part of the primary key
+    id = Column(BigInteger, Sequence("learning_events_id_seq"), primary_key=True)
+    occurred_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    
+    child_id = Column(String(36), ForeignKey("children.id", ondelete="CASCADE"), nullable=False)
+    module = Column(SQLEnum(LearningModule))  # None for game events (stars, achievements)
+    event_type = Column(String(50), nullable=False)  # LearningEventType value
+    payload = Column(JSONB, default=dict)
+    
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# Star Ledger Model
+class StarLedgerShard(Base):
+    """
+    One of a child's star sub-counters (sharded star ledger mode).
+    
+    Awards add to a random shard so concurrent awards do not queue on
+    the game_states row; a child's total is stars_earned plus the sum
+    of its shards until they are folded back in.
+    """
+    __tablename__ = "star_ledger"
+    
+    child_id = Column(String(36), ForeignKey("children.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    stars = Column(Integer, nullable=False, default=0)
+
+
+# Projection Checkpoint Model
+class ProjectionCheckpoint(Base):
+    __tablename__ = "projection_checkpoints"
+    
+    child_id = Column(String(36), ForeignKey("children.id", ondelete="CASCADE"), primary_key=True)
+    projection = Column(String(50), primary_key=True)  # literacy, numeracy, sel, game
+    version = Column(Integer, nullable=False)  # Reducer version the state was built with
+    
+    # Projected columns after applying events up to last_event_id
+    state = Column(JSONB, nullable=False)
+    last_event_id = Column(BigInteger, nullable=False, default=0)
+    
+    # Starting point for full replays; progress from before the event log
+    baseline = Column(JSONB, nullable=False)
+    baseline_event_id = Column(BigInteger, nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 # Refresh Token Model
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
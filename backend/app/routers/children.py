@@ -12,8 +12,16 @@ from typing import List, Optional
 
 from app.database import get_db
 from app.models.models import Child, LiteracyProgress, NumeracyProgress, SelProgress, GameState
-from app.schemas.schemas import ChildCreate, ChildUpdate, ChildResponse, ChildWithProgress
-from app.services.dependencies import get_or_create_anonymous_child, get_child_by_id
+from app.schemas.schemas import (
+    ChildCreate, ChildUpdate, ChildResponse, ChildWithProgress,
+    ChildBootstrapResponse, LiteracyProgressResponse, NumeracyProgressResponse,
+    SelProgressResponse, GameStateResponse
+)
+from app.services.dependencies import get_or_create_anonymous_child, get_child_by_id, child_cache
+from app.services.http_cache import cached_json_response
+from app.services.projections import initial_checkpoints
+from app.services.write_coalescer import write_coalescer
+from app.services.game_service import GameService
 
 router = APIRouter()
 
@@ -34,6 +42,8 @@ async def get_or_create_current_child(
         select(GameState).where(GameState.child_id == child.id)
     )
     game_state = game_result.scalar_one_or_none()
+    write_coalescer.overlay(game_state)
+    await GameService(db).overlay_star_ledger(game_state)
     
     if game_state:
         child_data.stars_earned = game_state.stars_earned or 0
@@ -74,6 +84,8 @@ async def get_all_children(
             select(GameState).where(GameState.child_id == child.id)
         )
         game_state = game_result.scalar_one_or_none()
+        write_coalescer.overlay(game_state)
+        await GameService(db).overlay_star_ledger(game_state)
         
         if game_state:
             child_data.stars_earned = game_state.stars_earned or 0
@@ -127,9 +139,12 @@ async def create_child(
     game_state = GameState(child_id=child.id, stars_earned=0)
     
     db.add_all([literacy, numeracy, sel, game_state])
+    db.add_all(initial_checkpoints(child.id))
     await db.commit()
     await db.refresh(child)
     
+    child_cache.set(child.id, True)
+    
     return child
 
 
@@ -150,6 +165,8 @@ async def get_child(
         select(GameState).where(GameState.child_id == child.id)
     )
     game_state = game_result.scalar_one_or_none()
+    write_coalescer.overlay(game_state)
+    await GameService(db).overlay_star_ledger(game_state)
     
     if game_state:
         child_data.stars_earned = game_state.stars_earned or 0
@@ -159,6 +176,71 @@ async def get_child(
     return child_data
 
 
+@router.get("/{child_id}/bootstrap", response_model=ChildBootstrapResponse)
+async def get_child_bootstrap(
+    child_id: str,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the full launch snapshot for a child in one round trip.
+    
+    Combines the profile, literacy, numeracy, SEL and game state
+    (including streak) loaded with a single joined query.
+    Returns 304 Not Modified when the client's ETag is still current.
+    """
+    if child_cache.get(child_id) is False:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Child profile not found"
+        )
+    
+    result = await db.execute(
+        select(Child, LiteracyProgress, NumeracyProgress, SelProgress, GameState)
+        .outerjoin(LiteracyProgress, LiteracyProgress.child_id == Child.id)
+        .outerjoin(NumeracyProgress, NumeracyProgress.child_id == Child.id)
+        .outerjoin(SelProgress, SelProgress.child_id == Child.id)
+        .outerjoin(GameState, GameState.child_id == Child.id)
+        .where(
+            Child.id == child_id,
+            Child.is_active == True
+        )
+    )
+    row = result.one_or_none()
+    
+    if not row:
+        child_cache.set(child_id, False)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Child profile not found"
+        )
+    
+    child, literacy, numeracy, sel, game_state = row
+    child_cache.set(child.id, True)
+    write_coalescer.overlay(numeracy, sel, game_state)
+    await GameService(db).overlay_star_ledger(game_state)
+    
+    child_data = ChildWithProgress.model_validate(child)
+    
+    if game_state:
+        child_data.stars_earned = game_state.stars_earned or 0
+        child_data.current_streak_days = game_state.current_streak_days or 0
+        child_data.last_played_at = game_state.last_played_at
+    
+    if literacy:
+        child_data.literacy_stage = literacy.current_stage
+    
+    snapshot = ChildBootstrapResponse(
+        child=child_data,
+        literacy=LiteracyProgressResponse.model_validate(literacy) if literacy else None,
+        numeracy=NumeracyProgressResponse.model_validate(numeracy) if numeracy else None,
+        sel=SelProgressResponse.model_validate(sel) if sel else None,
+        game_state=GameStateResponse.model_validate(game_state) if game_state else None
+    )
+    
+    return cached_json_response(snapshot, if_none_match)
+
+
 @router.patch("/{child_id}", response_model=ChildResponse)
 async def update_child(
     child_id: str,
@@ -193,3 +275,6 @@ async def delete_child(
     
     child.is_active = False
     await db.commit()
+    
+    # Deleted profiles must stop resolving immediately
+    child_cache.set(child_id, False)
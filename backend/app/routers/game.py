@@ -8,15 +8,16 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Tuple
 
 from app.database import get_db
 from app.models.models import Child, GameState, PlaySession
 from app.schemas.schemas import (
     GameStateResponse, GameStateUpdate, AchievementUnlock, PlaySessionResponse
 )
-from app.services.dependencies import get_child_by_id
+from app.services.dependencies import require_child_id, game_state_for_update
 from app.services.game_service import GameService
+from app.services.write_coalescer import write_coalescer
 
 router = APIRouter()
 
@@ -31,10 +32,10 @@ async def get_game_state(
     
     Includes world position, stars, achievements, and streak info.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     result = await db.execute(
-        select(GameState).where(GameState.child_id == child.id)
+        select(GameState).where(GameState.child_id == child_id)
     )
     game_state = result.scalar_one_or_none()
     
@@ -44,6 +45,8 @@ async def get_game_state(
             detail="Game state not found"
         )
     
+    write_coalescer.overlay(game_state)
+    await GameService(db).overlay_star_ledger(game_state)
     return game_state
 
 
@@ -51,17 +54,13 @@ async def get_game_state(
 async def update_game_state(
     child_id: str,
     data: GameStateUpdate,
+    loaded: Tuple[Child, Optional[GameState]] = Depends(game_state_for_update),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Update game state (checkpoint, level, world position).
     """
-    child = await get_child_by_id(child_id, db)
-    
-    result = await db.execute(
-        select(GameState).where(GameState.child_id == child.id)
-    )
-    game_state = result.scalar_one_or_none()
+    child, game_state = loaded
     
     if not game_state:
         raise HTTPException(
@@ -79,6 +78,8 @@ async def update_game_state(
     await db.commit()
     await db.refresh(game_state)
     
+    write_coalescer.overlay(game_state)
+    await GameService(db).overlay_star_ledger(game_state)
     return game_state
 
 
@@ -91,10 +92,10 @@ async def add_stars(
     """
     Add stars to a child's total.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     game_service = GameService(db)
-    result = await game_service.add_stars(child.id, stars)
+    result = await game_service.add_stars(child_id, stars)
     
     return result
 
@@ -108,10 +109,10 @@ async def unlock_achievement(
     """
     Unlock an achievement for a child.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     game_service = GameService(db)
-    achievement = await game_service.unlock_achievement(child.id, achievement_id)
+    achievement = await game_service.unlock_achievement(child_id, achievement_id)
     
     return achievement
 
@@ -121,6 +122,7 @@ async def start_play_session(
     child_id: str,
     platform: str = "web",
     screen_size: str = "tablet",
+    loaded: Tuple[Child, Optional[GameState]] = Depends(game_state_for_update),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -128,10 +130,10 @@ async def start_play_session(
     
     Track engagement and update streak.
     """
-    child = await get_child_by_id(child_id, db)
+    child, game_state = loaded
     
     game_service = GameService(db)
-    session = await game_service.start_session(child.id, platform, screen_size)
+    session = await game_service.start_session(child.id, platform, screen_size, game_state=game_state)
     
     return session
 
@@ -147,7 +149,7 @@ async def end_play_session(
     """
     End a play session.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     game_service = GameService(db)
     session = await game_service.end_session(
@@ -166,11 +168,11 @@ async def get_play_sessions(
     """
     Get play session history.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     result = await db.execute(
         select(PlaySession)
-        .where(PlaySession.child_id == child.id)
+        .where(PlaySession.child_id == child_id)
         .order_by(PlaySession.started_at.desc())
         .limit(limit)
     )
@@ -187,10 +189,10 @@ async def get_streak_info(
     """
     Get streak information.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     result = await db.execute(
-        select(GameState).where(GameState.child_id == child.id)
+        select(GameState).where(GameState.child_id == child_id)
     )
     game_state = result.scalar_one_or_none()
     
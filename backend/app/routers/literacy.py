@@ -4,22 +4,28 @@ Handles letter tracing, phonics, and word learning endpoints
 
 NOTE: Authentication disabled - kids play directly without login.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_
 from typing import List, Optional
 
 from app.database import get_db
 from app.models.models import (
     Child, LiteracyProgress, TracingSession, 
-    Word, WordProgress
+    Word, WordProgress, LearningEventType
 )
 from app.schemas.schemas import (
     LiteracyProgressResponse, TracingSessionCreate, TracingSessionResponse,
-    WordResponse, WordProgressResponse, WordsByLevel, WordLevelEnum
+    TracingBatchCreate, TracingBatchResponse,
+    WordResponse, WordProgressResponse, WordReviewItem, WordRecommendation, WordsByLevel, WordLevelEnum, AgeGroupEnum
 )
-from app.services.dependencies import get_child_by_id
+from app.services.dependencies import require_child_id
 from app.services.literacy_service import LiteracyService
+from app.services.word_bank import word_bank
+from app.services.http_cache import conditional_response
+from app.services import stroke_codec, stroke_analysis
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.event_log import event_writer
 
 router = APIRouter()
 
@@ -32,10 +38,10 @@ async def get_literacy_progress(
     """
     Get child's literacy progress including letter mastery and word reading scores.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     result = await db.execute(
-        select(LiteracyProgress).where(LiteracyProgress.child_id == child.id)
+        select(LiteracyProgress).where(LiteracyProgress.child_id == child_id)
     )
     progress = result.scalar_one_or_none()
     
@@ -58,21 +64,45 @@ async def record_tracing_session(
     Record a letter or word tracing session.
     
     This endpoint receives stroke analysis data from the Flutter app's
-    PathMetrics comparison against ideal letter paths.
+    PathMetrics comparison against ideal letter paths. When stroke samples
+    are sent for a letter, accuracy and smoothness are scored server-side
+    instead, so every device is scored the same way.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
+    
+    accuracy = data.stroke_accuracy
+    smoothness = data.stroke_smoothness
+    
+    path_samples = None
+    if data.stroke_samples:
+        try:
+            path_samples = stroke_codec.from_base64(data.stroke_samples)
+            if data.letter:
+                score = stroke_analysis.score_trace(
+                    data.letter,
+                    data.is_uppercase,
+                    stroke_codec.decode_strokes(path_samples)
+                )
+                if score is not None:
+                    accuracy, smoothness = score
+        except stroke_codec.StrokeCodecError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(exc)
+            )
     
     # Create tracing session
     session = TracingSession(
-        child_id=child.id,
+        child_id=child_id,
         letter=data.letter,
         word=data.word,
         is_uppercase=data.is_uppercase,
-        stroke_accuracy=data.stroke_accuracy,
-        stroke_smoothness=data.stroke_smoothness,
+        stroke_accuracy=accuracy,
+        stroke_smoothness=smoothness,
         time_taken_ms=data.time_taken_ms,
         attempt_number=data.attempt_number,
-        path_deviation_data=data.path_deviation_data
+        path_deviation_data=data.path_deviation_data,
+        path_samples=path_samples
     )
     
     db.add(session)
@@ -81,9 +111,9 @@ async def record_tracing_session(
     if data.letter:
         literacy_service = LiteracyService(db)
         await literacy_service.update_letter_mastery(
-            child.id, 
+            child_id, 
             data.letter, 
-            data.stroke_accuracy
+            accuracy
         )
     
     await db.commit()
@@ -92,37 +122,108 @@ async def record_tracing_session(
     return session
 
 
+@router.post("/{child_id}/tracing/batch", response_model=TracingBatchResponse)
+async def record_tracing_batch(
+    child_id: str,
+    data: TracingBatchCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Record an ordered batch of tracing sessions, e.g. after playing offline.
+    
+    Each session carries a client_id; sessions already uploaded are
+    reported as duplicates instead of being stored twice.
+    """
+    child_id = await require_child_id(child_id, db)
+    
+    literacy_service = LiteracyService(db)
+    return await literacy_service.record_tracing_batch(child_id, data.sessions)
+
+
 @router.get("/{child_id}/tracing/history", response_model=List[TracingSessionResponse])
 async def get_tracing_history(
     child_id: str,
+    response: Response,
     letter: Optional[str] = Query(None, max_length=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    include_strokes: bool = Query(default=False, description="Decode and return stroke points"),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Get tracing session history for a child.
+    Get tracing session history for a child, newest first.
+    
+    Paginated by keyset on (completed_at, id): when more sessions exist,
+    the X-Next-Cursor response header holds the cursor for the next page.
+    Only the listed columns are read, so pages are served from the
+    covering index; stroke samples are only loaded with include_strokes.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
+    
+    columns = [
+        TracingSession.id,
+        TracingSession.letter,
+        TracingSession.word,
+        TracingSession.stroke_accuracy,
+        TracingSession.stroke_smoothness,
+        TracingSession.time_taken_ms,
+        TracingSession.attempt_number,
+        TracingSession.completed_at,
+    ]
+    if include_strokes:
+        columns.append(TracingSession.path_samples)
     
-    query = select(TracingSession).where(TracingSession.child_id == child.id)
+    query = select(*columns).where(TracingSession.child_id == child_id)
     
     if letter:
         query = query.where(TracingSession.letter == letter.upper())
     
-    query = query.order_by(TracingSession.completed_at.desc()).limit(limit)
+    if cursor:
+        try:
+            after_completed_at, after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.where(
+            tuple_(TracingSession.completed_at, TracingSession.id)
+            < tuple_(after_completed_at, after_id)
+        )
     
-    result = await db.execute(query)
-    sessions = result.scalars().all()
+    # One extra row tells us whether another page exists
+    query = query.order_by(
+        TracingSession.completed_at.desc(), TracingSession.id.desc()
+    ).limit(limit + 1)
     
-    return sessions
+    result = await db.execute(query)
+    rows = result.all()
+    
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.completed_at, last.id)
+    
+    history = []
+    for row in rows:
+        item = TracingSessionResponse.model_validate(row)
+        if include_strokes and row.path_samples:
+            item.strokes = stroke_codec.strokes_to_lists(
+                stroke_codec.decode_strokes(row.path_samples)
+            )
+        history.append(item)
+    
+    return history
 
 
 @router.get("/words", response_model=List[WordResponse])
 async def get_words(
     level: Optional[WordLevelEnum] = None,
     category: Optional[str] = None,
-    age_group: Optional[str] = None,
+    word_family: Optional[str] = None,
+    age_group: Optional[AgeGroupEnum] = None,
     limit: int = Query(50, ge=1, le=200),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -131,44 +232,73 @@ async def get_words(
     Filter by:
     - level: 2-letter, 3-letter, 4-letter, 5-letter
     - category: short_a, short_e, cvcc, sight_word, etc.
+    - word_family: -at, -an, etc.
     - age_group: 2-3, 4-5, 6-7, 8
-    """
-    query = select(Word).where(Word.is_active == True)
-    
-    if level:
-        query = query.where(Word.level == level)
-    
-    if category:
-        query = query.where(Word.category == category)
-    
-    if age_group:
-        query = query.where(Word.age_group_min <= age_group)
-        query = query.where(Word.age_group_max >= age_group)
     
-    query = query.order_by(Word.difficulty).limit(limit)
-    
-    result = await db.execute(query)
-    words = result.scalars().all()
+    Served from the in-memory word bank; the ETag changes only when the
+    word bank does.
+    """
+    bank = await word_bank.get(db)
+    body = bank.render(level, category, word_family, age_group, limit)
     
-    return words
+    return conditional_response(body, bank.etag, if_none_match, "public, max-age=300")
 
 
 @router.get("/{child_id}/words/progress", response_model=List[WordsByLevel])
 async def get_word_progress_by_level(
     child_id: str,
+    counts_only: bool = Query(default=False, description="Omit word lists, return counts only"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get child's word learning progress organized by level.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     literacy_service = LiteracyService(db)
-    progress = await literacy_service.get_word_progress_by_level(child.id)
+    progress = await literacy_service.get_word_progress_by_level(
+        child_id, counts_only=counts_only
+    )
     
     return progress
 
 
+@router.get("/{child_id}/words/recommended", response_model=List[WordRecommendation])
+async def get_recommended_words(
+    child_id: str,
+    limit: int = Query(10, ge=1, le=50),
+    max_new_phonemes: int = Query(1, ge=0, le=5),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the words a child can decode next.
+    
+    Words using only phonemes from the child's mastered words come first,
+    then words introducing up to max_new_phonemes new sounds. Words from
+    word families the child already knows are preferred.
+    """
+    child_id = await require_child_id(child_id, db)
+    
+    literacy_service = LiteracyService(db)
+    return await literacy_service.recommend_words(child_id, limit, max_new_phonemes)
+
+
+@router.get("/{child_id}/words/review-queue", response_model=List[WordReviewItem])
+async def get_word_review_queue(
+    child_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    due_only: bool = Query(default=True, description="Only words due for review now"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the child's spaced-repetition review queue, most overdue first.
+    """
+    child_id = await require_child_id(child_id, db)
+    
+    literacy_service = LiteracyService(db)
+    return await literacy_service.get_review_queue(child_id, limit, due_only)
+
+
 @router.post("/{child_id}/words/{word_id}/practice", response_model=WordProgressResponse)
 async def record_word_practice(
     child_id: str,
@@ -179,11 +309,11 @@ async def record_word_practice(
     """
     Record a word practice attempt.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     literacy_service = LiteracyService(db)
     progress = await literacy_service.record_word_practice(
-        child.id, word_id, is_correct
+        child_id, word_id, is_correct
     )
     
     return progress
@@ -203,10 +333,10 @@ async def get_letter_groups_progress(
     3. Diagonals: A, V, W, M, N, K, X, Y, Z
     4. Mixed: B, D, J, P, R, U
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     literacy_service = LiteracyService(db)
-    groups = await literacy_service.get_letter_groups_progress(child.id)
+    groups = await literacy_service.get_letter_groups_progress(child_id)
     
     return groups
 
@@ -269,11 +399,16 @@ async def record_story_completion(
     """
     Record completion of a story reading session.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
+    event_writer.record(child_id, LearningEventType.STORY_COMPLETED, {
+        "story_id": story_id,
+        "pages_read": pages_read,
+        "time_spent_seconds": time_spent_seconds,
+    })
     
     return {
         "success": True,
-        "child_id": str(child.id),
+        "child_id": child_id,
         "story_id": story_id,
         "pages_read": pages_read,
         "time_spent_seconds": time_spent_seconds,
@@ -294,11 +429,16 @@ async def record_phonics_practice(
     
     Tracks letter sounds and example words learned.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
+    event_writer.record(child_id, LearningEventType.PHONICS_PRACTICE, {
+        "letter": letter.upper(),
+        "sound_played": sound_played,
+        "word_example": word_example,
+    })
     
     return {
         "success": True,
-        "child_id": str(child.id),
+        "child_id": child_id,
         "letter": letter.upper(),
         "sound_played": sound_played,
         "word_example": word_example,
@@ -320,11 +460,17 @@ async def record_word_building(
     
     Tracks words built by dragging letters.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
+    event_writer.record(child_id, LearningEventType.WORD_BUILDING, {
+        "word": word.upper(),
+        "completed": completed,
+        "attempts": attempts,
+        "time_taken_seconds": time_taken_seconds,
+    })
     
     return {
         "success": True,
-        "child_id": str(child.id),
+        "child_id": child_id,
         "word": word.upper(),
         "completed": completed,
         "attempts": attempts,
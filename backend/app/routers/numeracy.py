@@ -11,9 +11,13 @@ from typing import List, Optional
 
 from app.database import get_db
 from app.models.models import Child, NumeracyProgress
-from app.schemas.schemas import NumeracyProgressResponse
-from app.services.dependencies import get_child_by_id
-from app.services.numeracy_service import NumeracyService
+from app.schemas.schemas import (
+    NumeracyProgressResponse, FactFluency, NumeracyEventBatch, NumeracyEventBatchResponse
+)
+from app.services.dependencies import require_child_id
+from app.services.numeracy_service import NumeracyService, SHAPES
+from app.services.fact_fluency import FACT_OPERATIONS
+from app.services.write_coalescer import write_coalescer
 
 router = APIRouter()
 
@@ -26,10 +30,10 @@ async def get_numeracy_progress(
     """
     Get child's numeracy progress including counting, operations, and puzzles.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     result = await db.execute(
-        select(NumeracyProgress).where(NumeracyProgress.child_id == child.id)
+        select(NumeracyProgress).where(NumeracyProgress.child_id == child_id)
     )
     progress = result.scalar_one_or_none()
     
@@ -39,6 +43,7 @@ async def get_numeracy_progress(
             detail="Numeracy progress not found"
         )
     
+    write_coalescer.overlay(progress)
     return progress
 
 
@@ -56,11 +61,11 @@ async def record_subitizing_attempt(
     Subitizing is the ability to instantly recognize small quantities (1-4)
     without counting. Essential for ages 2-4.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     numeracy_service = NumeracyService(db)
     result = await numeracy_service.record_subitizing(
-        child.id, shown_count, guessed_count, response_time_ms
+        child_id, shown_count, guessed_count, response_time_ms
     )
     
     return result
@@ -78,11 +83,11 @@ async def record_counting_attempt(
     
     Tracks how high a child can count accurately.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     numeracy_service = NumeracyService(db)
     result = await numeracy_service.record_counting(
-        child.id, target_count, reached_count
+        child_id, target_count, reached_count
     )
     
     return result
@@ -100,11 +105,11 @@ async def record_numeral_recognition(
     
     Tracks which numerals a child can visually identify.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     numeracy_service = NumeracyService(db)
     result = await numeracy_service.record_numeral_recognition(
-        child.id, numeral, recognized
+        child_id, numeral, recognized
     )
     
     return result
@@ -126,11 +131,11 @@ async def record_operation_attempt(
     
     Tracks addition, subtraction, multiplication, and division performance.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     numeracy_service = NumeracyService(db)
     result = await numeracy_service.record_operation(
-        child_id=child.id,
+        child_id=child_id,
         operation=operation,
         operand1=operand1,
         operand2=operand2,
@@ -142,6 +147,51 @@ async def record_operation_attempt(
     return result
 
 
+@router.post("/{child_id}/events/batch", response_model=NumeracyEventBatchResponse)
+async def record_event_batch(
+    child_id: str,
+    data: NumeracyEventBatch,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Record a batch of mixed numeracy events from fast mini-games.
+    
+    Accepts subitizing, counting, numeral, operation, st_puzzle and
+    nooms events in play order, applies them in a single update and
+    returns the resulting progress.
+    """
+    child_id = await require_child_id(child_id, db)
+    
+    numeracy_service = NumeracyService(db)
+    result = await numeracy_service.record_event_batch(child_id, data.events)
+    if "error" in result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Numeracy progress not found"
+        )
+    
+    return result
+
+
+@router.get("/{child_id}/facts/weakest", response_model=List[FactFluency])
+async def get_weakest_facts(
+    child_id: str,
+    k: int = Query(default=10, ge=1, le=50),
+    operation: Optional[str] = Query(default=None, pattern=f"^({'|'.join(FACT_OPERATIONS)})$"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the arithmetic facts (operands 0-10) the child is least fluent in.
+    
+    Weakest first, ranked by accuracy scaled down for slow answers; only
+    facts the child has attempted are included.
+    """
+    child_id = await require_child_id(child_id, db)
+    
+    numeracy_service = NumeracyService(db)
+    return await numeracy_service.get_weakest_facts(child_id, k, operation)
+
+
 @router.post("/{child_id}/st-puzzle")
 async def record_st_puzzle_completion(
     child_id: str,
@@ -156,11 +206,11 @@ async def record_st_puzzle_completion(
     ST puzzles are language-independent math challenges (like JiJi in ST Math)
     that help develop mathematical intuition through visual problem-solving.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     numeracy_service = NumeracyService(db)
     result = await numeracy_service.record_st_puzzle(
-        child.id, puzzle_level, completed, attempts
+        child_id, puzzle_level, completed, attempts
     )
     
     return result
@@ -179,11 +229,11 @@ async def record_nooms_interaction(
     Nooms are Montessori-inspired digital blocks used for
     concrete understanding of addition and subtraction.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     numeracy_service = NumeracyService(db)
     result = await numeracy_service.record_nooms_interaction(
-        child.id, interaction_type, blocks_used
+        child_id, interaction_type, blocks_used
     )
     
     return result
@@ -191,7 +241,11 @@ async def record_nooms_interaction(
 @router.post("/{child_id}/shapes")
 async def record_shape_recognition(
     child_id: str,
-    shape_name: str = Query(..., description="Name of the shape (circle, square, triangle, star, heart, diamond)"),
+    shape_name: str = Query(
+        ...,
+        pattern=f"^({'|'.join(SHAPES)})$",
+        description="Name of the shape (circle, square, triangle, star, heart, diamond, rectangle, oval)"
+    ),
     recognized: bool = Query(...),
     response_time_ms: int = Query(..., ge=0),
     db: AsyncSession = Depends(get_db)
@@ -201,15 +255,19 @@ async def record_shape_recognition(
     
     Tracks which shapes a child can visually identify.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
+    
+    numeracy_service = NumeracyService(db)
+    result = await numeracy_service.record_shape_recognition(
+        child_id, shape_name, recognized, response_time_ms
+    )
+    if "error" in result:
+        return result
     
-    # For now, return success - can be expanded with shape progress tracking
     return {
         "success": True,
-        "child_id": str(child.id),
-        "shape": shape_name,
-        "recognized": recognized,
-        "response_time_ms": response_time_ms,
+        "child_id": child_id,
+        **result,
         "message": f"Shape recognition recorded for {shape_name}"
     }
 
@@ -222,15 +280,11 @@ async def get_shapes_progress(
     """
     Get child's shape recognition progress.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
-    # Return default progress - can be expanded with database storage
-    shapes = ["circle", "square", "triangle", "star", "heart", "diamond", "rectangle", "oval"]
-    return {
-        "child_id": str(child.id),
-        "shapes_learned": shapes[:4],
-        "shapes_in_progress": shapes[4:6],
-        "shapes_not_started": shapes[6:],
-        "total_shapes": len(shapes),
-        "mastery_percentage": 50.0
-    }
\ No newline at end of file
+    numeracy_service = NumeracyService(db)
+    result = await numeracy_service.get_shapes_progress(child_id)
+    if "error" in result:
+        return result
+    
+    return {"child_id": child_id, **result}
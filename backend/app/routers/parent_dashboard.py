@@ -20,7 +20,7 @@ from app.schemas.schemas import (
     DashboardOverview, MilestoneResponse, 
     WeeklyProgressReport, PlaySessionResponse
 )
-from app.services.dependencies import get_child_by_id
+from app.services.dependencies import get_child_by_id, require_child_id
 from app.services.dashboard_service import DashboardService
 
 router = APIRouter()
@@ -58,9 +58,9 @@ async def get_milestones(
     Milestones include things like "First letter traced!",
     "Counted to 10!", "Read first word!", etc.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
-    query = select(MilestoneEvent).where(MilestoneEvent.child_id == child.id)
+    query = select(MilestoneEvent).where(MilestoneEvent.child_id == child_id)
     
     if unread_only:
         query = query.where(MilestoneEvent.parent_viewed == False)
@@ -115,10 +115,10 @@ async def get_weekly_report(
     - Conversation starters for parents
     - Suggested activities
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     dashboard_service = DashboardService(db)
-    report = await dashboard_service.generate_weekly_report(child.id, week_offset)
+    report = await dashboard_service.generate_weekly_report(child_id, week_offset)
     
     return report
 
@@ -135,10 +135,10 @@ async def get_conversation_starters(
     - "I see your child learned the word 'cat' today. 
        Ask them to point out cats in your neighborhood!"
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     dashboard_service = DashboardService(db)
-    starters = await dashboard_service.get_conversation_starters(child.id)
+    starters = await dashboard_service.get_conversation_starters(child_id)
     
     return starters
 
@@ -152,14 +152,14 @@ async def get_activity_time(
     """
     Get activity/play time statistics.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     start_date = datetime.utcnow() - timedelta(days=days)
     
     result = await db.execute(
         select(PlaySession)
         .where(
-            PlaySession.child_id == child.id,
+            PlaySession.child_id == child_id,
             PlaySession.started_at >= start_date
         )
     )
@@ -188,10 +188,10 @@ async def request_data_deletion(
     This initiates a data deletion request that will be processed
     according to regulatory requirements.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     dashboard_service = DashboardService(db)
-    await dashboard_service.request_data_deletion(child.id, None)
+    await dashboard_service.request_data_deletion(child_id, None)
     
     return {
         "status": "deletion_requested",
@@ -207,9 +207,9 @@ async def export_child_data(
     """
     Export all child data (GDPR data portability right).
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     dashboard_service = DashboardService(db)
-    data = await dashboard_service.export_child_data(child.id)
+    data = await dashboard_service.export_child_data(child_id)
     
     return data
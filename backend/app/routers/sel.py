@@ -7,13 +7,15 @@ NOTE: Authentication disabled - kids play directly without login.
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import List, Optional, Tuple
 
 from app.database import get_db
-from app.models.models import Child, SelProgress
+from app.models.models import Child, SelProgress, LearningEventType
 from app.schemas.schemas import SelProgressResponse, EmotionLogEntry
-from app.services.dependencies import get_child_by_id
+from app.services.dependencies import require_child_id, sel_progress_for_update
 from app.services.sel_service import SelService
+from app.services.event_log import event_writer
+from app.services.write_coalescer import write_coalescer
 
 router = APIRouter()
 
@@ -33,10 +35,10 @@ async def get_sel_progress(
     - Sharing scenarios passed
     - Calm-down techniques learned
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     result = await db.execute(
-        select(SelProgress).where(SelProgress.child_id == child.id)
+        select(SelProgress).where(SelProgress.child_id == child_id)
     )
     progress = result.scalar_one_or_none()
     
@@ -46,6 +48,7 @@ async def get_sel_progress(
             detail="SEL progress not found"
         )
     
+    write_coalescer.overlay(progress)
     return progress
 
 
@@ -53,6 +56,7 @@ async def get_sel_progress(
 async def record_feelings_wheel_use(
     child_id: str,
     emotion: str,
+    loaded: Tuple[Child, Optional[SelProgress]] = Depends(sel_progress_for_update),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -60,10 +64,10 @@ async def record_feelings_wheel_use(
     
     The feelings wheel helps children identify and express emotions.
     """
-    child = await get_child_by_id(child_id, db)
+    child, progress = loaded
     
     sel_service = SelService(db)
-    result = await sel_service.record_feelings_wheel(child.id, emotion)
+    result = await sel_service.record_feelings_wheel(child.id, emotion, progress=progress)
     
     return result
 
@@ -72,15 +76,16 @@ async def record_feelings_wheel_use(
 async def log_emotion(
     child_id: str,
     entry: EmotionLogEntry,
+    loaded: Tuple[Child, Optional[SelProgress]] = Depends(sel_progress_for_update),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Log an emotion identification event.
     """
-    child = await get_child_by_id(child_id, db)
+    child, progress = loaded
     
     sel_service = SelService(db)
-    result = await sel_service.log_emotion(child.id, entry)
+    result = await sel_service.log_emotion(child.id, entry, progress=progress)
     
     return result
 
@@ -89,6 +94,7 @@ async def log_emotion(
 async def complete_kindness_bingo(
     child_id: str,
     task_completed: str,
+    loaded: Tuple[Child, Optional[SelProgress]] = Depends(sel_progress_for_update),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -100,10 +106,10 @@ async def complete_kindness_bingo(
     - Helping with chores
     - Giving a compliment
     """
-    child = await get_child_by_id(child_id, db)
+    child, progress = loaded
     
     sel_service = SelService(db)
-    result = await sel_service.complete_kindness_task(child.id, task_completed)
+    result = await sel_service.complete_kindness_task(child.id, task_completed, progress=progress)
     
     return result
 
@@ -114,6 +120,7 @@ async def complete_sharing_scenario(
     scenario_id: str,
     response_chosen: str,
     was_prosocial: bool,
+    loaded: Tuple[Child, Optional[SelProgress]] = Depends(sel_progress_for_update),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -122,11 +129,12 @@ async def complete_sharing_scenario(
     Scenarios present social situations and track
     whether children choose prosocial responses.
     """
-    child = await get_child_by_id(child_id, db)
+    child, progress = loaded
     
     sel_service = SelService(db)
     result = await sel_service.record_sharing_scenario(
-        child.id, scenario_id, response_chosen, was_prosocial
+        child.id, scenario_id, response_chosen, was_prosocial,
+        progress=progress
     )
     
     return result
@@ -137,6 +145,7 @@ async def learn_calm_down_technique(
     child_id: str,
     technique: str,
     practiced: bool = True,
+    loaded: Tuple[Child, Optional[SelProgress]] = Depends(sel_progress_for_update),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -149,10 +158,10 @@ async def learn_calm_down_technique(
     - Find a quiet spot
     - Talk about feelings
     """
-    child = await get_child_by_id(child_id, db)
+    child, progress = loaded
     
     sel_service = SelService(db)
-    result = await sel_service.learn_calm_down_technique(child.id, technique)
+    result = await sel_service.learn_calm_down_technique(child.id, technique, progress=progress)
     
     return result
 
@@ -167,10 +176,10 @@ async def get_emotions_summary(
     
     Helps parents understand their child's emotional patterns.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     sel_service = SelService(db)
-    summary = await sel_service.get_emotions_summary(child.id)
+    summary = await sel_service.get_emotions_summary(child_id)
     
     return summary
 
@@ -232,11 +241,16 @@ async def record_friendship_story_completion(
     """
     Record completion of a friendship story.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
+    event_writer.record(child_id, LearningEventType.FRIENDSHIP_STORY_COMPLETED, {
+        "story_id": story_id,
+        "pages_read": pages_read,
+        "understood_lesson": understood_lesson,
+    })
     
     return {
         "success": True,
-        "child_id": str(child.id),
+        "child_id": child_id,
         "story_id": story_id,
         "pages_read": pages_read,
         "understood_lesson": understood_lesson,
@@ -255,11 +269,16 @@ async def record_breathing_exercise(
     """
     Record a breathing/calming exercise session.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
+    event_writer.record(child_id, LearningEventType.BREATHING_EXERCISE, {
+        "exercise_type": exercise_type,
+        "duration_seconds": duration_seconds,
+        "completed": completed,
+    })
     
     return {
         "success": True,
-        "child_id": str(child.id),
+        "child_id": child_id,
         "exercise_type": exercise_type,
         "duration_seconds": duration_seconds,
         "completed": completed,
@@ -13,9 +13,11 @@ from app.database import get_db
 from app.models.models import Child, Task, TaskResponse as TaskResponseModel
 from app.schemas.schemas import (
     TaskResponse, TaskSubmission, TaskResultResponse, 
-    AdaptiveTaskRequest, LearningModuleEnum
+    AdaptiveTaskRequest, GenerateTaskRequest, GeneratedTaskResponse,
+    GeneratedTaskSubmission,
+    LearningModuleEnum
 )
-from app.services.dependencies import get_child_by_id
+from app.services.dependencies import require_child_id
 from app.services.adaptive_learning_service import AdaptiveLearningService
 
 router = APIRouter()
@@ -38,11 +40,11 @@ async def get_next_task(
     - B = Child's ability level
     - D = Task difficulty
     """
-    child = await get_child_by_id(request.child_id, db)
+    child_id = await require_child_id(request.child_id, db)
     
     adaptive_service = AdaptiveLearningService(db)
     task = await adaptive_service.select_next_task(
-        child_id=child.id,
+        child_id=child_id,
         module=request.module,
         task_type=request.task_type
     )
@@ -56,6 +58,51 @@ async def get_next_task(
     return task
 
 
+@router.post("/generate", response_model=GeneratedTaskResponse)
+async def generate_task(
+    request: GenerateTaskRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Generate a numeracy problem at the child's target difficulty.
+    
+    Supports addition, subtraction, multiplication, subitizing and
+    counting. Problems are drawn from precomputed difficulty tables,
+    so they are not stored in the tasks table; submit the child's
+    answer to /generate/submit with the returned parameters.
+    """
+    child_id = await require_child_id(request.child_id, db)
+    
+    adaptive_service = AdaptiveLearningService(db)
+    return await adaptive_service.generate_task(child_id, request.task_type)
+
+
+@router.post("/generate/submit", response_model=TaskResultResponse)
+async def submit_generated_task(
+    submission: GeneratedTaskSubmission,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Submit the answer to a generated problem.
+    
+    Checks the answer and updates the child's numeracy ability estimate
+    with the same Rasch update as /submit, so the next generated problem
+    adapts. Mastery progress is still recorded through /numeracy.
+    """
+    await require_child_id(submission.child_id, db)
+    
+    adaptive_service = AdaptiveLearningService(db)
+    result = await adaptive_service.submit_generated_task(submission)
+    
+    if isinstance(result, dict) and "error" in result:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=result["error"]
+        )
+    
+    return result
+
+
 @router.post("/submit", response_model=TaskResultResponse)
 async def submit_task_response(
     submission: TaskSubmission,
@@ -98,9 +145,9 @@ async def get_task_history(
     """
     Get a child's task response history.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
-    query = select(TaskResponseModel).where(TaskResponseModel.child_id == child.id)
+    query = select(TaskResponseModel).where(TaskResponseModel.child_id == child_id)
     
     if module:
         query = query.join(Task).where(Task.module == module)
@@ -121,9 +168,9 @@ async def get_ability_estimates(
     """
     Get a child's ability estimates across all modules.
     """
-    child = await get_child_by_id(child_id, db)
+    child_id = await require_child_id(child_id, db)
     
     adaptive_service = AdaptiveLearningService(db)
-    abilities = await adaptive_service.get_ability_estimates(child.id)
+    abilities = await adaptive_service.get_ability_estimates(child_id)
     
     return abilities
@@ -26,15 +26,26 @@ from app.schemas.schemas import (
     WordCreate,
     WordResponse,
     WordProgressResponse,
+    WordReviewItem,
+    WordRecommendation,
     WordsByLevel,
     
     # Literacy
     LiteracyProgressResponse,
     TracingSessionCreate,
     TracingSessionResponse,
+    TracingBatchItem,
+    TracingBatchCreate,
+    TracingBatchItemResult,
+    TracingBatchResponse,
     
     # Numeracy
     NumeracyProgressResponse,
+    FactFluency,
+    NumeracyEvent,
+    NumeracyEventBatch,
+    NumeracyEventResult,
+    NumeracyEventBatchResponse,
     
     # Tasks
     TaskContent,
@@ -42,6 +53,9 @@ from app.schemas.schemas import (
     TaskSubmission,
     TaskResultResponse,
     AdaptiveTaskRequest,
+    GenerateTaskRequest,
+    GeneratedTaskResponse,
+    GeneratedTaskSubmission,
     
     # Game
     GameStateResponse,
@@ -57,6 +71,9 @@ from app.schemas.schemas import (
     SelProgressResponse,
     EmotionLogEntry,
     
+    # Bootstrap
+    ChildBootstrapResponse,
+    
     # Reports
     WeeklyProgressReport,
 )
@@ -81,16 +98,30 @@ __all__ = [
     "WordCreate",
     "WordResponse",
     "WordProgressResponse",
+    "WordReviewItem",
+    "WordRecommendation",
     "WordsByLevel",
     "LiteracyProgressResponse",
     "TracingSessionCreate",
     "TracingSessionResponse",
+    "TracingBatchItem",
+    "TracingBatchCreate",
+    "TracingBatchItemResult",
+    "TracingBatchResponse",
     "NumeracyProgressResponse",
+    "FactFluency",
+    "NumeracyEvent",
+    "NumeracyEventBatch",
+    "NumeracyEventResult",
+    "NumeracyEventBatchResponse",
     "TaskContent",
     "TaskResponse",
     "TaskSubmission",
     "TaskResultResponse",
     "AdaptiveTaskRequest",
+    "GenerateTaskRequest",
+    "GeneratedTaskResponse",
+    "GeneratedTaskSubmission",
     "GameStateResponse",
     "GameStateUpdate",
     "AchievementUnlock",
@@ -99,5 +130,6 @@ __all__ = [
     "PlaySessionResponse",
     "SelProgressResponse",
     "EmotionLogEntry",
+    "ChildBootstrapResponse",
     "WeeklyProgressReport",
 ]
@@ -2,7 +2,7 @@
 WonderWorld Learning Adventure - Pydantic Schemas
 """
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal, Union, Annotated
 from datetime import datetime
 from enum import Enum
 
@@ -179,16 +179,37 @@ class WordProgressResponse(BaseModel):
     can_sound_out: bool
     can_read: bool
     can_spell: bool
+    newly_mastered: bool = False  # This attempt crossed the mastery threshold
+    next_review_at: Optional[datetime] = None
+    review_interval_days: Optional[int] = None
     
     class Config:
         from_attributes = True
 
 
+class WordRecommendation(BaseModel):
+    word: WordResponse
+    new_phonemes: List[str]  # Phonemes the child hasn't met in a mastered word
+    decodable: bool  # Uses only known phonemes
+    in_known_family: bool  # Shares a word family with a mastered word
+
+
+class WordReviewItem(BaseModel):
+    word_id: str
+    word: str
+    level: WordLevelEnum
+    mastery_score: float
+    is_mastered: bool
+    review_interval_days: int
+    next_review_at: datetime
+    is_due: bool
+
+
 class WordsByLevel(BaseModel):
     level: WordLevelEnum
     total_count: int
     mastered_count: int
-    words: List[WordResponse]
+    words: List[WordResponse] = []
 
 
 # ============== Literacy Schemas ==============
@@ -220,6 +241,8 @@ class TracingSessionCreate(BaseModel):
     time_taken_ms: int = Field(..., ge=0)
     attempt_number: int = Field(default=1, ge=1)
     path_deviation_data: Optional[Dict[str, Any]] = None
+    # Base64 of packed stroke samples (stroke_codec format)
+    stroke_samples: Optional[str] = Field(None, max_length=200000)
 
 
 class TracingSessionResponse(BaseModel):
@@ -231,11 +254,35 @@ class TracingSessionResponse(BaseModel):
     time_taken_ms: int
     attempt_number: int
     completed_at: datetime
+    strokes: Optional[List[List[List[float]]]] = None  # Only with include_strokes
     
     class Config:
         from_attributes = True
 
 
+class TracingBatchItem(TracingSessionCreate):
+    client_id: str = Field(..., min_length=1, max_length=64)
+
+
+class TracingBatchCreate(BaseModel):
+    sessions: List[TracingBatchItem] = Field(..., min_length=1, max_length=100)
+
+
+class TracingBatchItemResult(BaseModel):
+    client_id: str
+    status: str  # created, duplicate, rejected
+    session_id: Optional[str] = None
+    stroke_accuracy: Optional[float] = None
+    stroke_smoothness: Optional[float] = None
+    detail: Optional[str] = None
+
+
+class TracingBatchResponse(BaseModel):
+    results: List[TracingBatchItemResult]
+    letter_mastery: Dict[str, float]  # New mastery of letters updated by this batch
+    overall_accuracy: Optional[float] = None
+
+
 # ============== Numeracy Schemas ==============
 
 class NumeracyProgressResponse(BaseModel):
@@ -255,6 +302,84 @@ class NumeracyProgressResponse(BaseModel):
         from_attributes = True
 
 
+class FactFluency(BaseModel):
+    operation: str
+    operand1: int
+    operand2: int
+    attempts: int
+    accuracy: float  # Recent-weighted share of correct answers, 0-1
+    avg_response_ms: int  # Recent-weighted response time
+    fluency: float  # Accuracy scaled down for slow answers, 0-1
+
+
+# Batched mini-game events; fields match the single-event endpoints
+
+class SubitizingEvent(BaseModel):
+    type: Literal["subitizing"]
+    shown_count: int = Field(..., ge=1, le=10)
+    guessed_count: int = Field(..., ge=0, le=20)
+    response_time_ms: int = Field(..., ge=0)
+
+
+class CountingEvent(BaseModel):
+    type: Literal["counting"]
+    target_count: int = Field(..., ge=1, le=100)
+    reached_count: int = Field(..., ge=0, le=100)
+
+
+class NumeralRecognitionEvent(BaseModel):
+    type: Literal["numeral"]
+    numeral: int = Field(..., ge=0, le=100)
+    recognized: bool
+
+
+class OperationEvent(BaseModel):
+    type: Literal["operation"]
+    operation: str = Field(..., pattern="^(addition|subtraction|multiplication|division)$")
+    operand1: int = Field(..., ge=0, le=100)
+    operand2: int = Field(..., ge=0, le=100)
+    answer: int = Field(..., ge=-100, le=200)
+    response_time_ms: int = Field(..., ge=0)
+    used_manipulatives: bool = False
+
+
+class STPuzzleEvent(BaseModel):
+    type: Literal["st_puzzle"]
+    puzzle_level: int = Field(..., ge=1)
+    completed: bool
+    attempts: int = Field(default=1, ge=1)
+
+
+class NoomsEvent(BaseModel):
+    type: Literal["nooms"]
+    interaction_type: str
+    blocks_used: int = Field(default=1, ge=1)
+
+
+NumeracyEvent = Annotated[
+    Union[
+        SubitizingEvent, CountingEvent, NumeralRecognitionEvent,
+        OperationEvent, STPuzzleEvent, NoomsEvent
+    ],
+    Field(discriminator="type")
+]
+
+
+class NumeracyEventBatch(BaseModel):
+    events: List[NumeracyEvent] = Field(..., min_length=1, max_length=200)
+
+
+class NumeracyEventResult(BaseModel):
+    type: str
+    success: bool  # Correct, reached, recognized or completed
+
+
+class NumeracyEventBatchResponse(BaseModel):
+    processed: int
+    results: List[NumeracyEventResult]
+    progress: NumeracyProgressResponse  # State after the whole batch
+
+
 # ============== Task & Adaptive Learning Schemas ==============
 
 class TaskContent(BaseModel):
@@ -299,6 +424,28 @@ class AdaptiveTaskRequest(BaseModel):
     task_type: Optional[str] = None
 
 
+class GenerateTaskRequest(BaseModel):
+    child_id: str
+    task_type: str = Field(..., pattern="^(addition|subtraction|multiplication|subitizing|counting)$")
+
+
+class GeneratedTaskResponse(BaseModel):
+    module: LearningModuleEnum = LearningModuleEnum.NUMERACY
+    task_type: str
+    difficulty: float
+    target_difficulty: float
+    content: TaskContent
+    parameters: Dict[str, int]
+
+
+class GeneratedTaskSubmission(BaseModel):
+    child_id: str
+    task_type: str = Field(..., pattern="^(addition|subtraction|multiplication|subitizing|counting)$")
+    parameters: Dict[str, int]  # As returned by /tasks/generate
+    answer: int
+    response_time_ms: int = Field(..., ge=0)
+
+
 # ============== Game State Schemas ==============
 
 class GameStateResponse(BaseModel):
@@ -398,6 +545,17 @@ class EmotionLogEntry(BaseModel):
     context: Optional[str] = None
 
 
+# ============== Bootstrap Schemas ==============
+
+class ChildBootstrapResponse(BaseModel):
+    """Everything the app needs on launch, loaded in a single round trip."""
+    child: ChildWithProgress
+    literacy: Optional[LiteracyProgressResponse] = None
+    numeracy: Optional[NumeracyProgressResponse] = None
+    sel: Optional[SelProgressResponse] = None
+    game_state: Optional[GameStateResponse] = None
+
+
 # ============== Progress Report Schemas ==============
 
 class WeeklyProgressReport(BaseModel):
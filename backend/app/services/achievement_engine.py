@@ -0,0 +1,238 @@
+"""
+WonderWorld Learning Adventure - Achievement Engine
+Unlocks achievements from progress events, in the event's transaction
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, cast, column, Numeric
+from sqlalchemy.dialects.postgresql import JSONB
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+from app.models.models import (
+    LiteracyProgress, NumeracyProgress, SelProgress, GameState,
+    MilestoneEvent, LearningEventType
+)
+from app.services.event_log import append_event, event_hooks
+
+
+# Achievement definitions
+ACHIEVEMENTS = {
+    "first_letter": {
+        "name": "First Letter!",
+        "description": "Traced your first letter",
+        "stars": 5
+    },
+    "alphabet_starter": {
+        "name": "Alphabet Starter",
+        "description": "Traced 5 different letters",
+        "stars": 10
+    },
+    "alphabet_master": {
+        "name": "Alphabet Master",
+        "description": "Mastered all 26 letters",
+        "stars": 50
+    },
+    "first_word": {
+        "name": "First Word!",
+        "description": "Read your first word",
+        "stars": 10
+    },
+    "word_explorer": {
+        "name": "Word Explorer",
+        "description": "Learned 10 words",
+        "stars": 20
+    },
+    "counting_star": {
+        "name": "Counting Star",
+        "description": "Counted to 10",
+        "stars": 10
+    },
+    "math_whiz": {
+        "name": "Math Whiz",
+        "description": "Completed 10 math puzzles",
+        "stars": 15
+    },
+    "streak_3": {
+        "name": "3-Day Streak!",
+        "description": "Played for 3 days in a row",
+        "stars": 15
+    },
+    "streak_7": {
+        "name": "Week Warrior!",
+        "description": "Played for 7 days in a row",
+        "stars": 30
+    },
+    "feelings_friend": {
+        "name": "Feelings Friend",
+        "description": "Identified 5 different emotions",
+        "stars": 10
+    },
+    "kindness_champion": {
+        "name": "Kindness Champion",
+        "description": "Completed a kindness bingo",
+        "stars": 20
+    }
+}
+
+
+# ============== Rules ==============
+
+LETTER_MASTERED_AT = 0.8  # Per-letter mastery (0-1) that counts as mastered
+
+
+class AchievementRule(NamedTuple):
+    """Unlock achievement_id once counter reaches threshold on model's row."""
+    achievement_id: str
+    event_types: Tuple[LearningEventType, ...]  # Events that can move the counter
+    model: Any
+    counter: Any  # SQL expression over the model's row
+    threshold: int
+
+
+# Letters whose mastery entry is at least LETTER_MASTERED_AT (26 entries at most)
+_letter = func.jsonb_each(LiteracyProgress.letter_mastery).table_valued(
+    "key", column("value", JSONB)
+).alias("letter")
+LETTERS_MASTERED = (
+    select(func.count())
+    .select_from(_letter)
+    .where(_letter.c.value["mastery"].astext.cast(Numeric) >= LETTER_MASTERED_AT)
+    .scalar_subquery()
+)
+
+WORDS_MASTERED = (
+    func.coalesce(LiteracyProgress.two_letter_words_mastered, 0)
+    + func.coalesce(LiteracyProgress.three_letter_words_mastered, 0)
+    + func.coalesce(LiteracyProgress.four_letter_words_mastered, 0)
+    + func.coalesce(LiteracyProgress.five_letter_words_mastered, 0)
+)
+
+EMOTIONS_IDENTIFIED = func.coalesce(
+    func.jsonb_array_length(cast(SelProgress.emotions_identified, JSONB)), 0
+)
+
+RULES = [
+    AchievementRule("first_letter", (LearningEventType.LETTER_TRACED,),
+                    LiteracyProgress, LiteracyProgress.letters_traced, 1),
+    AchievementRule("alphabet_starter", (LearningEventType.LETTER_TRACED,),
+                    LiteracyProgress, LiteracyProgress.letters_traced, 5),
+    AchievementRule("alphabet_master", (LearningEventType.LETTER_TRACED,),
+                    LiteracyProgress, LETTERS_MASTERED, 26),
+    AchievementRule("first_word", (LearningEventType.WORD_MASTERED,),
+                    LiteracyProgress, WORDS_MASTERED, 1),
+    AchievementRule("word_explorer", (LearningEventType.WORD_MASTERED,),
+                    LiteracyProgress, WORDS_MASTERED, 10),
+    AchievementRule("counting_star", (LearningEventType.COUNTING_ATTEMPT,),
+                    NumeracyProgress, NumeracyProgress.counting_range, 10),
+    AchievementRule("math_whiz", (LearningEventType.ST_PUZZLE_ATTEMPT,),
+                    NumeracyProgress, NumeracyProgress.st_puzzles_completed, 10),
+    AchievementRule("streak_3", (LearningEventType.SESSION_STARTED,),
+                    GameState, GameState.current_streak_days, 3),
+    AchievementRule("streak_7", (LearningEventType.SESSION_STARTED,),
+                    GameState, GameState.current_streak_days, 7),
+    AchievementRule("feelings_friend", (LearningEventType.FEELINGS_WHEEL_USED, LearningEventType.EMOTION_LOGGED),
+                    SelProgress, EMOTIONS_IDENTIFIED, 5),
+    # kindness_bingo_completed counts tasks; a full bingo card is 5
+    AchievementRule("kindness_champion", (LearningEventType.KINDNESS_TASK_COMPLETED,),
+                    SelProgress, SelProgress.kindness_bingo_completed, 5),
+]
+
+# Event type -> rules it can satisfy
+RULES_BY_EVENT: Dict[LearningEventType, List[AchievementRule]] = {}
+for _rule in RULES:
+    for _event_type in _rule.event_types:
+        RULES_BY_EVENT.setdefault(_event_type, []).append(_rule)
+
+
+# ============== Evaluation ==============
+
+async def award_achievement(db: AsyncSession, child_id: str, achievement_id: str) -> bool:
+    """
+    Unlock an achievement in the caller's transaction (no commit).
+    
+    The achievement is appended and its stars added by one UPDATE that
+    only matches while the achievement is still locked, so concurrent
+    unlocks award the stars exactly once. Returns True if this call
+    unlocked it.
+    """
+    achievement = ACHIEVEMENTS[achievement_id]
+    achievements = func.coalesce(cast(GameState.achievements, JSONB), cast("[]", JSONB))
+    
+    unlocked = await db.scalar(
+        update(GameState)
+        .where(
+            GameState.child_id == child_id,
+            ~achievements.has_key(achievement_id)
+        )
+        .values(
+            achievements=achievements.concat(func.jsonb_build_array(achievement_id)),
+            stars_earned=GameState.stars_earned + achievement["stars"]
+        )
+        .returning(GameState.id)
+        .execution_options(synchronize_session=False)
+    )
+    if unlocked is None:
+        return False
+    
+    db.add(MilestoneEvent(
+        child_id=child_id,
+        milestone_type="achievement",
+        milestone_name=achievement["name"],
+        description=achievement["description"],
+        conversation_starters=[
+            f"Congratulations! Ask your child about their '{achievement['name']}' achievement!"
+        ]
+    ))
+    await append_event(db, child_id, LearningEventType.ACHIEVEMENT_UNLOCKED, {
+        "achievement_id": achievement_id
+    })
+    return True
+
+
+async def evaluate_achievements(
+    db: AsyncSession,
+    child_id: str,
+    event_types: List[LearningEventType]
+) -> List[str]:
+    """
+    Unlock the achievements the given events may have earned.
+    
+    Only the rules indexed under these event types are checked, with one
+    query per progress table reading their counters and the child's
+    unlocked achievements; history is never scanned. Returns the ids
+    unlocked.
+    """
+    rules: Dict[str, AchievementRule] = {}
+    for event_type in event_types:
+        for rule in RULES_BY_EVENT.get(event_type, ()):
+            rules[rule.achievement_id] = rule
+    if not rules:
+        return []
+    
+    by_model: Dict[Any, List[AchievementRule]] = {}
+    for rule in rules.values():
+        by_model.setdefault(rule.model, []).append(rule)
+    
+    unlocked = []
+    for model, model_rules in by_model.items():
+        query = select(
+            GameState.achievements,
+            *[rule.counter.label(rule.achievement_id) for rule in model_rules]
+        )
+        if model is not GameState:
+            query = query.select_from(model).join(GameState, GameState.child_id == model.child_id)
+        row = (await db.execute(query.where(model.child_id == child_id))).one_or_none()
+        if row is None:
+            continue
+        
+        already = set(row.achievements or [])
+        for rule in model_rules:
+            value = row._mapping[rule.achievement_id]
+            if rule.achievement_id in already or value is None or value < rule.threshold:
+                continue
+            if await award_achievement(db, child_id, rule.achievement_id):
+                unlocked.append(rule.achievement_id)
+    
+    return unlocked
+
+
+event_hooks.append(evaluate_achievements)
@@ -4,7 +4,7 @@ Implements the Rasch Model for personalized task selection
 """
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 import math
 import numpy as np
 
@@ -13,10 +13,11 @@ from app.models.models import (
     AbilityEstimate, Child
 )
 from app.schemas.schemas import (
-    TaskSubmission, TaskResultResponse, 
+    TaskSubmission, TaskResultResponse, GeneratedTaskSubmission,
     LearningModuleEnum, ErrorTypeEnum
 )
 from app.config import settings
+from app.services.problem_generator import generate_problem, find_problem, HINTS
 
 
 class AdaptiveLearningService:
@@ -48,6 +49,16 @@ class AdaptiveLearningService:
         logit = max(-10, min(10, logit))
         return math.exp(logit) / (1 + math.exp(logit))
     
+    def target_difficulty(self, ability: float) -> float:
+        """
+        Difficulty at which P(correct) equals the target success rate.
+        
+        From P = e^(B-D)/(1+e^(B-D)), solving for D when P = target:
+        D = B - ln(P/(1-P))
+        """
+        target_p = settings.target_success_rate
+        return ability - math.log(target_p / (1 - target_p))
+    
     async def get_ability_estimate(
         self, 
         child_id: str, 
@@ -101,10 +112,7 @@ class AdaptiveLearningService:
             return None
         
         # Calculate target difficulty for desired success rate
-        # From P = e^(B-D)/(1+e^(B-D)), solving for D when P = target
-        # D = B - ln(P/(1-P))
-        target_p = settings.target_success_rate
-        target_difficulty = ability - math.log(target_p / (1 - target_p))
+        target_difficulty = self.target_difficulty(ability)
         
         # Get tasks within appropriate range
         query = select(Task).where(
@@ -132,6 +140,55 @@ class AdaptiveLearningService:
         
         return best_task
     
+    async def generate_task(self, child_id: str, task_type: str) -> Dict[str, Any]:
+        """
+        Generate a numeracy problem at the child's target difficulty.
+        
+        Problems come from in-memory difficulty tables rather than the
+        tasks table, so every call can serve a fresh problem.
+        """
+        estimate = await self.get_ability_estimate(child_id, LearningModuleEnum.NUMERACY)
+        target_difficulty = self.target_difficulty(float(estimate.ability_score))
+        return generate_problem(task_type, target_difficulty)
+    
+    async def submit_generated_task(
+        self,
+        submission: GeneratedTaskSubmission
+    ) -> Union[TaskResultResponse, Dict[str, Any]]:
+        """
+        Check the answer to a generated problem and update the child's
+        numeracy ability estimate, as /tasks/submit does for stored tasks.
+        
+        The problem and its difficulty are looked up from the submitted
+        parameters, so neither is trusted from the client.
+        """
+        problem = find_problem(submission.task_type, submission.parameters)
+        if problem is None:
+            return {"error": "Unknown problem"}
+        
+        is_correct = submission.answer == problem.answer
+        error_type = None
+        hint = None
+        if not is_correct:
+            if submission.task_type in ["addition", "subtraction"]:
+                error_type = ErrorTypeEnum.PROCEDURAL
+            else:
+                error_type = ErrorTypeEnum.FACTUAL
+            hint = HINTS[submission.task_type][0]
+        
+        estimate = await self.get_ability_estimate(submission.child_id, LearningModuleEnum.NUMERACY)
+        ability_change = await self._update_ability(estimate, problem.difficulty, is_correct)
+        
+        return TaskResultResponse(
+            is_correct=is_correct,
+            correct_answer=problem.answer,
+            error_type=error_type,
+            hint=hint,
+            stars_earned=self._calculate_stars(is_correct, submission.response_time_ms),
+            ability_change=ability_change,
+            next_task_available=True
+        )
+    
     async def evaluate_response(
         self, 
         task: Task, 
@@ -165,7 +222,7 @@ class AdaptiveLearningService:
         
         # Update ability estimate
         estimate = await self.get_ability_estimate(child_id, task.module)
-        ability_change = await self._update_ability(estimate, task, is_correct)
+        ability_change = await self._update_ability(estimate, float(task.difficulty), is_correct)
         
         # Record response
         response = TaskResponseModel(
@@ -243,7 +300,7 @@ class AdaptiveLearningService:
     async def _update_ability(
         self, 
         estimate: AbilityEstimate, 
-        task: Task,
+        difficulty: float,
         is_correct: bool
     ) -> float:
         """
@@ -253,7 +310,6 @@ class AdaptiveLearningService:
         performance relative to expected probability.
         """
         ability = float(estimate.ability_score)
-        difficulty = float(task.difficulty)
         
         # Calculate expected probability
         expected_p = self.calculate_probability(ability, difficulty)
@@ -12,6 +12,8 @@ from app.models.models import (
     MilestoneEvent, PlaySession, TracingSession, WordProgress
 )
 from app.schemas.schemas import DashboardOverview, WeeklyProgressReport
+from app.services.write_coalescer import write_coalescer
+from app.services.game_service import GameService
 
 
 class DashboardService:
@@ -37,6 +39,8 @@ class DashboardService:
             select(GameState).where(GameState.child_id == child.id)
         )
         game_state = game_result.scalar_one_or_none()
+        write_coalescer.overlay(numeracy, game_state)
+        await GameService(self.db).overlay_star_ledger(game_state)
         
         # Calculate words mastered
         words_mastered = 0
@@ -9,15 +9,91 @@ from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import Optional
+from typing import Optional, Dict, Tuple, Any
+import time
 
+from app.config import settings
 from app.database import get_db
-from app.models.models import Parent, Child
+from app.models.models import (
+    Parent, Child, LiteracyProgress, NumeracyProgress, SelProgress, GameState
+)
+from app.services.projections import initial_checkpoints
 
 # Security scheme (optional - kept for parent dashboard if needed later)
 security = HTTPBearer(auto_error=False)
 
 
+class ChildExistenceCache:
+    """
+    Process-local cache of which child ids exist and are active.
+    
+    Known children are remembered for a short TTL so routes that only
+    need the id can skip the lookup query. Unknown ids are cached too
+    (negative caching) so stale devices hitting 404s stop costing a query.
+    """
+    
+    def __init__(self, ttl_seconds: int, negative_ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[bool, float]] = {}
+    
+    def get(self, child_id: str) -> Optional[bool]:
+        """Return True/False if the answer is cached, None if unknown."""
+        entry = self._entries.get(child_id)
+        if entry is None:
+            return None
+        
+        exists, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(child_id, None)
+            return None
+        
+        return exists
+    
+    def set(self, child_id: str, exists: bool) -> None:
+        """Remember whether a child id exists."""
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+        
+        ttl = self.ttl_seconds if exists else self.negative_ttl_seconds
+        self._entries[child_id] = (exists, time.monotonic() + ttl)
+    
+    def invalidate(self, child_id: str) -> None:
+        """Forget a child id (e.g. after a profile change)."""
+        self._entries.pop(child_id, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest half if still full."""
+        now = time.monotonic()
+        self._entries = {
+            key: entry for key, entry in self._entries.items() if entry[1] > now
+        }
+        if len(self._entries) >= self.max_entries:
+            keep = list(self._entries.items())[len(self._entries) // 2:]
+            self._entries = dict(keep)
+
+
+child_cache = ChildExistenceCache(
+    ttl_seconds=settings.child_cache_ttl_seconds,
+    negative_ttl_seconds=settings.child_cache_negative_ttl_seconds,
+    max_entries=settings.child_cache_max_entries
+)
+
+# Key for the request-scoped child cache kept in AsyncSession.info
+_SESSION_CHILDREN_KEY = "loaded_children"
+
+
+def _child_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Child profile not found"
+    )
+
+
 async def get_current_parent_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db)
@@ -39,8 +115,17 @@ async def get_child_by_id(
 ) -> Child:
     """
     Get a child by ID (no parent verification - anonymous access).
-    Creates a new child record if not found.
+    
+    The loaded child is reused for the rest of the request (one session
+    per request), and unknown ids are answered from the negative cache.
     """
+    loaded = db.info.setdefault(_SESSION_CHILDREN_KEY, {})
+    if child_id in loaded:
+        return loaded[child_id]
+    
+    if child_cache.get(child_id) is False:
+        raise _child_not_found()
+    
     result = await db.execute(
         select(Child).where(
             Child.id == child_id,
@@ -50,14 +135,85 @@ async def get_child_by_id(
     child = result.scalar_one_or_none()
     
     if not child:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Child profile not found"
-        )
+        child_cache.set(child_id, False)
+        raise _child_not_found()
+    
+    child_cache.set(child_id, True)
+    loaded[child_id] = child
     
     return child
 
 
+async def require_child_id(
+    child_id: str,
+    db: AsyncSession
+) -> str:
+    """
+    Ensure a child exists and return its ID.
+    
+    For routes that only need the id: skips the lookup query entirely
+    while the child is known to exist in the short-TTL cache.
+    """
+    if child_cache.get(child_id) is True:
+        return child_id
+    
+    child = await get_child_by_id(child_id, db)
+    return child.id
+
+
+class ChildProgressLoader:
+    """
+    Route dependency that loads a child together with one of its progress
+    rows (SelProgress or GameState) in a single statement, instead of
+    get_child_by_id followed by the service's own progress query.
+    
+    The progress row is locked (SELECT ... FOR UPDATE) until the request
+    commits, serializing concurrent writers.
+    
+    Resolves to a (child, progress) tuple; progress is None if the child
+    has no progress row.
+    """
+    
+    def __init__(self, progress_model: Any):
+        self.progress_model = progress_model
+    
+    async def __call__(
+        self,
+        child_id: str,
+        db: AsyncSession = Depends(get_db)
+    ) -> Tuple[Child, Optional[Any]]:
+        if child_cache.get(child_id) is False:
+            raise _child_not_found()
+        
+        model = self.progress_model
+        # FOR UPDATE cannot lock the nullable side of an outer join
+        result = await db.execute(
+            select(Child, model)
+            .join(model, model.child_id == Child.id)
+            .where(
+                Child.id == child_id,
+                Child.is_active == True
+            )
+            .with_for_update(of=model)
+        )
+        row = result.one_or_none()
+        
+        if row is None:
+            # Either the child is unknown or it has no progress row
+            return await get_child_by_id(child_id, db), None
+        
+        child, progress = row
+        child_cache.set(child.id, True)
+        db.info.setdefault(_SESSION_CHILDREN_KEY, {})[child.id] = child
+        
+        return child, progress
+
+
+# Pre-built loaders for write endpoints
+sel_progress_for_update = ChildProgressLoader(SelProgress)
+game_state_for_update = ChildProgressLoader(GameState)
+
+
 async def get_or_create_anonymous_child(
     device_id: str = Header(None, alias="X-Device-ID"),
     db: AsyncSession = Depends(get_db)
@@ -79,11 +235,10 @@ async def get_or_create_anonymous_child(
     child = result.scalar_one_or_none()
     
     if child:
+        child_cache.set(child.id, True)
         return child
     
     # Create new anonymous child profile
-    from app.models.models import LiteracyProgress, NumeracyProgress, SelProgress, GameState
-    
     child = Child(
         display_name="Little Learner",
         avatar_id="avatar_star",
@@ -102,9 +257,12 @@ async def get_or_create_anonymous_child(
     game_state = GameState(child_id=child.id, stars_earned=0)
     
     db.add_all([literacy, numeracy, sel, game_state])
+    db.add_all(initial_checkpoints(child.id))
     await db.commit()
     await db.refresh(child)
     
+    child_cache.set(child.id, True)
+    
     return child
 
 
@@ -0,0 +1,310 @@
+"""
+WonderWorld Learning Adventure - Learning Event Log
+Append-only event table with monthly partitions and a batched writer
+"""
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import date, datetime, timezone
+import asyncio
+import logging
+import time
+
+from app.config import settings
+from app.database import engine, async_session_maker
+from app.models.models import LearningEvent, LearningEventType, LearningModule
+
+logger = logging.getLogger(__name__)
+
+
+# Module each event type belongs to (game events have none)
+EVENT_MODULES = {
+    LearningEventType.PHONICS_PRACTICE: LearningModule.LITERACY,
+    LearningEventType.WORD_BUILDING: LearningModule.LITERACY,
+    LearningEventType.STORY_COMPLETED: LearningModule.LITERACY,
+    LearningEventType.SHAPE_RECOGNITION: LearningModule.NUMERACY,
+    LearningEventType.FRIENDSHIP_STORY_COMPLETED: LearningModule.SEL,
+    LearningEventType.BREATHING_EXERCISE: LearningModule.SEL,
+    LearningEventType.LETTER_TRACED: LearningModule.LITERACY,
+    LearningEventType.WORD_MASTERED: LearningModule.LITERACY,
+    LearningEventType.SUBITIZING_ATTEMPT: LearningModule.NUMERACY,
+    LearningEventType.COUNTING_ATTEMPT: LearningModule.NUMERACY,
+    LearningEventType.NUMERAL_RECOGNITION: LearningModule.NUMERACY,
+    LearningEventType.OPERATION_ATTEMPT: LearningModule.NUMERACY,
+    LearningEventType.ST_PUZZLE_ATTEMPT: LearningModule.NUMERACY,
+    LearningEventType.NOOMS_INTERACTION: LearningModule.NUMERACY,
+    LearningEventType.FEELINGS_WHEEL_USED: LearningModule.SEL,
+    LearningEventType.EMOTION_LOGGED: LearningModule.SEL,
+    LearningEventType.KINDNESS_TASK_COMPLETED: LearningModule.SEL,
+    LearningEventType.SHARING_SCENARIO: LearningModule.SEL,
+    LearningEventType.CALM_DOWN_TECHNIQUE_LEARNED: LearningModule.SEL,
+}
+
+
+# Called as hook(db, child_id, event_types) after progress events are
+# appended, inside the same transaction (e.g. the achievement engine)
+event_hooks: List[Callable[[AsyncSession, str, List[LearningEventType]], Awaitable[Any]]] = []
+
+
+def _event_row(
+    child_id: str,
+    event_type: LearningEventType,
+    payload: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    return {
+        "child_id": child_id,
+        "module": EVENT_MODULES.get(event_type),
+        "event_type": event_type.value,
+        "payload": payload or {},
+    }
+
+
+async def append_events(
+    db: AsyncSession,
+    child_id: str,
+    events: List[Tuple[LearningEventType, Dict[str, Any]]]
+) -> None:
+    """
+    Append progress events to the caller's transaction.
+    
+    Used where an event changes a progress row, so the event commits (or
+    rolls back) together with the change. Call it after the progress row
+    has been updated or locked: projections rely on a child's events being
+    appended while that row is held (see projections.py).
+    """
+    if not events:
+        return
+    # Pending ORM changes go first so the progress row is locked
+    await db.flush()
+    await db.execute(
+        insert(LearningEvent),
+        [_event_row(child_id, event_type, payload) for event_type, payload in events]
+    )
+    for hook in event_hooks:
+        await hook(db, child_id, [event_type for event_type, _ in events])
+
+
+async def append_event(
+    db: AsyncSession,
+    child_id: str,
+    event_type: LearningEventType,
+    payload: Optional[Dict[str, Any]] = None
+) -> None:
+    """Append a single progress event to the caller's transaction."""
+    await append_events(db, child_id, [(event_type, payload)])
+
+
+# ============== Partitions ==============
+
+def _month_start(day: date, offset: int = 0) -> date:
+    month_index = day.year * 12 + day.month - 1 + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+# Advisory lock held while partitions are created, so instances do not
+# race to create the same month
+PARTITION_LOCK_ID = 5068
+
+
+async def ensure_event_partitions(months_ahead: int = 2) -> None:
+    """
+    Create the default partition and monthly partitions from the current
+    month up to months_ahead months ahead (idempotent; run at startup and
+    periodically by the event writer).
+    
+    Events with no monthly partition land in the default one. A month
+    that already has events there gets its partition filled with them
+    while detached, and then attached.
+    """
+    today = datetime.now(timezone.utc).date()
+    async with engine.begin() as conn:
+        await conn.execute(text(f"SELECT pg_advisory_xact_lock({PARTITION_LOCK_ID})"))
+        await conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS learning_events_default "
+            "PARTITION OF learning_events DEFAULT"
+        ))
+        for offset in range(months_ahead + 1):
+            start, end = _month_start(today, offset), _month_start(today, offset + 1)
+            name = f"learning_events_{start:%Y_%m}"
+            if await conn.scalar(text(f"SELECT to_regclass('{name}')")) is not None:
+                continue
+            
+            bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            in_range = f"occurred_at >= '{start.isoformat()}' AND occurred_at < '{end.isoformat()}'"
+            # Attaching scans the default partition anyway; holding it
+            # keeps new events out of the range until the partition exists
+            await conn.execute(text("LOCK TABLE learning_events_default IN ACCESS EXCLUSIVE MODE"))
+            strays = await conn.scalar(text(
+                f"SELECT EXISTS (SELECT 1 FROM learning_events_default WHERE {in_range})"
+            ))
+            if not strays:
+                await conn.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF learning_events FOR VALUES {bounds}"
+                ))
+                continue
+            
+            await conn.execute(text(f"CREATE TABLE {name} (LIKE learning_events INCLUDING DEFAULTS)"))
+            moved = await conn.execute(text(
+                f"WITH moved AS (DELETE FROM learning_events_default WHERE {in_range} RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ))
+            await conn.execute(text(
+                f"ALTER TABLE learning_events ATTACH PARTITION {name} FOR VALUES {bounds}"
+            ))
+            logger.info(f"Moved {moved.rowcount} learning events from the default partition to {name}")
+
+
+# ============== Batched Writer ==============
+
+def _database_unavailable(error: Exception) -> bool:
+    """True if a write failed because of the database rather than its rows."""
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, (OperationalError, InterfaceError, OSError, asyncio.TimeoutError))
+
+
+class EventWriter:
+    """
+    Buffers learning events in memory and writes them in batches.
+
+    record() only appends to a list, so requests never wait on the
+    database. A background task flushes with one multi-row INSERT when
+    batch_size events are waiting or flush_interval_ms has passed, and
+    stop() flushes whatever is left at shutdown. The same task creates
+    upcoming monthly partitions every partition_check_minutes.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval_ms: int,
+        max_buffer: int,
+        partition_check_minutes: int
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_buffer = max_buffer
+        self.partition_check_interval = partition_check_minutes * 60
+        self._buffer: List[Dict[str, Any]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+
+    def record(
+        self,
+        child_id: str,
+        event_type: LearningEventType,
+        payload: Optional[Dict[str, Any]] = None,
+        occurred_at: Optional[datetime] = None
+    ) -> None:
+        """Queue an event for the next batch."""
+        if len(self._buffer) >= self.max_buffer:
+            # Database unreachable for a long time; shed the oldest events
+            logger.warning("Learning event buffer full, dropping oldest event")
+            self._buffer.pop(0)
+
+        row = _event_row(child_id, event_type, payload)
+        row["occurred_at"] = occurred_at or datetime.now(timezone.utc)
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write all buffered events."""
+        if self._task is not None:
+            # Let an in-flight insert finish rather than cancelling it
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+        while self._buffer:
+            if not await self.flush():
+                logger.error(f"Dropping {len(self._buffer)} learning events at shutdown")
+                break
+
+    async def flush(self) -> bool:
+        """Write up to one batch of buffered events. Returns False on error."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return True
+
+            batch = self._buffer[:self.batch_size]
+            del self._buffer[:len(batch)]
+
+            try:
+                await self._insert(batch)
+            except Exception as error:
+                logger.exception(f"Failed to write {len(batch)} learning events")
+                if _database_unavailable(error):
+                    # Keep them for the next attempt, ahead of newer events
+                    self._buffer[:0] = batch
+                    return False
+                # Some row is bad; write them one at a time to find it
+                return await self._insert_rows(batch)
+
+            return True
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        async with async_session_maker() as session:
+            await session.execute(insert(LearningEvent), rows)
+            await session.commit()
+
+    async def _insert_rows(self, batch: List[Dict[str, Any]]) -> bool:
+        """Write a failed batch row by row, dropping rows that cannot be written."""
+        for index, row in enumerate(batch):
+            try:
+                await self._insert([row])
+            except Exception as error:
+                if _database_unavailable(error):
+                    self._buffer[:0] = batch[index:]
+                    return False
+                # The driver error only; the statement would log the payload
+                reason = getattr(error, "orig", None) or error
+                logger.error(
+                    f"Dropping learning event {row['event_type']} for child {row['child_id']}: {reason!r}"
+                )
+        return True
+
+    async def _run(self) -> None:
+        next_partition_check = time.monotonic() + self.partition_check_interval
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                break
+
+            started = time.monotonic()
+            while self._buffer:
+                if not await self.flush():
+                    # Back off before retrying a failing database
+                    await asyncio.sleep(self.flush_interval)
+                    break
+                if len(self._buffer) < self.batch_size and \
+                        time.monotonic() - started < self.flush_interval:
+                    break
+
+            if time.monotonic() >= next_partition_check:
+                next_partition_check = time.monotonic() + self.partition_check_interval
+                try:
+                    await ensure_event_partitions()
+                except Exception:
+                    logger.exception("Failed to create learning event partitions")
+
+
+event_writer = EventWriter(
+    batch_size=settings.event_batch_size,
+    flush_interval_ms=settings.event_flush_interval_ms,
+    max_buffer=settings.event_max_buffer,
+    partition_check_minutes=settings.event_partition_check_minutes
+)
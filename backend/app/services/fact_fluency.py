@@ -0,0 +1,115 @@
+"""
+WonderWorld Learning Adventure - Arithmetic Fact Fluency
+Per-fact accuracy and speed, packed into one binary column
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Operations with a fact grid; division attempts are not tracked per fact
+FACT_OPERATIONS = ["addition", "subtraction", "multiplication"]
+FACT_MAX_OPERAND = 10  # Facts cover operands 0-10
+FACT_SIZE = FACT_MAX_OPERAND + 1
+
+# Fields per fact, all uint16
+ATTEMPTS, ACCURACY, LATENCY = range(3)
+FACT_FIELDS = 3
+ACCURACY_SCALE = 1000  # Accuracy is stored in thousandths
+UINT16_MAX = np.iinfo(np.uint16).max
+
+FACT_MATRIX_SHAPE = (len(FACT_OPERATIONS), FACT_SIZE, FACT_SIZE, FACT_FIELDS)
+FACT_MATRIX_BYTES = int(np.prod(FACT_MATRIX_SHAPE)) * 2
+
+# Exponential moving averages favour recent attempts
+EMA_WEIGHT = 0.3
+# Answers at or under this time count as fluent; slower ones scale down
+FLUENT_RESPONSE_MS = 3000
+
+
+def decode_matrix(blob: Optional[bytes]) -> np.ndarray:
+    """Writable fact matrix from its packed bytes (zeros if missing)."""
+    if not blob or len(blob) != FACT_MATRIX_BYTES:
+        return np.zeros(FACT_MATRIX_SHAPE, dtype=np.uint16)
+    return np.frombuffer(blob, dtype="<u2").astype(np.uint16).reshape(FACT_MATRIX_SHAPE)
+
+
+def encode_matrix(matrix: np.ndarray) -> bytes:
+    return matrix.astype("<u2", copy=False).tobytes()
+
+
+def fact_index(operation: str, operand1: int, operand2: int) -> Optional[Tuple[int, int, int]]:
+    """Matrix index of a fact, or None if it is outside the grid."""
+    if operation not in FACT_OPERATIONS:
+        return None
+    if not (0 <= operand1 <= FACT_MAX_OPERAND and 0 <= operand2 <= FACT_MAX_OPERAND):
+        return None
+    return FACT_OPERATIONS.index(operation), operand1, operand2
+
+
+def record_fact_attempt(
+    matrix: np.ndarray,
+    index: Tuple[int, int, int],
+    is_correct: bool,
+    response_time_ms: int
+) -> None:
+    """Fold one attempt into a fact's cell, in place."""
+    cell = matrix[index]
+    accuracy = ACCURACY_SCALE if is_correct else 0
+    latency = min(response_time_ms, UINT16_MAX)
+
+    if cell[ATTEMPTS] == 0:
+        cell[ACCURACY], cell[LATENCY] = accuracy, latency
+    else:
+        cell[ACCURACY] = round(cell[ACCURACY] + EMA_WEIGHT * (accuracy - int(cell[ACCURACY])))
+        cell[LATENCY] = round(cell[LATENCY] + EMA_WEIGHT * (latency - int(cell[LATENCY])))
+    cell[ATTEMPTS] = min(int(cell[ATTEMPTS]) + 1, UINT16_MAX)
+
+
+def fluency_scores(matrix: np.ndarray) -> np.ndarray:
+    """Fluency 0-1 per fact: accuracy scaled down for slow answers."""
+    accuracy = matrix[..., ACCURACY] / ACCURACY_SCALE
+    latency = np.maximum(matrix[..., LATENCY], 1)
+    speed = np.minimum(1.0, FLUENT_RESPONSE_MS / latency)
+    return accuracy * speed
+
+
+def weakest_facts(
+    matrix: np.ndarray,
+    k: int = 10,
+    operation: Optional[str] = None
+) -> List[Dict[str, object]]:
+    """
+    The k attempted facts with the lowest fluency, weakest first.
+
+    Ranks every fact of the grid at once; ties go to the fact with more
+    attempts (more evidence it is weak).
+    """
+    fluency = fluency_scores(matrix)
+    attempts = matrix[..., ATTEMPTS]
+
+    candidates = attempts > 0
+    if operation is not None:
+        only = np.zeros(len(FACT_OPERATIONS), dtype=bool)
+        only[FACT_OPERATIONS.index(operation)] = True
+        candidates &= only[:, None, None]
+
+    flat = np.flatnonzero(candidates)
+    if len(flat) > k:
+        flat = flat[np.argpartition(fluency.ravel()[flat], k - 1)[:k]]
+    order = np.lexsort((-attempts.ravel()[flat].astype(np.int64), fluency.ravel()[flat]))
+
+    facts = []
+    for position in flat[order]:
+        op_index, operand1, operand2 = np.unravel_index(position, fluency.shape)
+        cell = matrix[op_index, operand1, operand2]
+        facts.append({
+            "operation": FACT_OPERATIONS[op_index],
+            "operand1": int(operand1),
+            "operand2": int(operand2),
+            "attempts": int(cell[ATTEMPTS]),
+            "accuracy": round(float(cell[ACCURACY]) / ACCURACY_SCALE, 3),
+            "avg_response_ms": int(cell[LATENCY]),
+            "fluency": round(float(fluency[op_index, operand1, operand2]), 3),
+        })
+    return facts
@@ -3,72 +3,40 @@ WonderWorld Learning Adventure - Game Service
 Handles stars, achievements, streaks, and sessions
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Dict, Any, Optional
+from sqlalchemy import select, update, delete, func, bindparam
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+import random
 
-from app.models.models import GameState, PlaySession, MilestoneEvent
+from app.config import settings
+from app.models.models import (
+    GameState, PlaySession, LearningEventType, StarLedgerShard
+)
 from app.schemas.schemas import AchievementUnlock, PlaySessionResponse
+from app.services.event_log import append_event
+from app.services.write_coalescer import write_coalescer
+from app.services.achievement_engine import ACHIEVEMENTS, award_achievement
 
 
-# Achievement definitions
-ACHIEVEMENTS = {
-    "first_letter": {
-        "name": "First Letter!",
-        "description": "Traced your first letter",
-        "stars": 5
-    },
-    "alphabet_starter": {
-        "name": "Alphabet Starter",
-        "description": "Traced 5 different letters",
-        "stars": 10
-    },
-    "alphabet_master": {
-        "name": "Alphabet Master",
-        "description": "Mastered all 26 letters",
-        "stars": 50
-    },
-    "first_word": {
-        "name": "First Word!",
-        "description": "Read your first word",
-        "stars": 10
-    },
-    "word_explorer": {
-        "name": "Word Explorer",
-        "description": "Learned 10 words",
-        "stars": 20
-    },
-    "counting_star": {
-        "name": "Counting Star",
-        "description": "Counted to 10",
-        "stars": 10
-    },
-    "math_whiz": {
-        "name": "Math Whiz",
-        "description": "Completed 10 math puzzles",
-        "stars": 15
-    },
-    "streak_3": {
-        "name": "3-Day Streak!",
-        "description": "Played for 3 days in a row",
-        "stars": 15
-    },
-    "streak_7": {
-        "name": "Week Warrior!",
-        "description": "Played for 7 days in a row",
-        "stars": 30
-    },
-    "feelings_friend": {
-        "name": "Feelings Friend",
-        "description": "Identified 5 different emotions",
-        "stars": 10
-    },
-    "kindness_champion": {
-        "name": "Kindness Champion",
-        "description": "Completed a kindness bingo",
-        "stars": 20
-    }
-}
+async def take_star_ledger(db: AsyncSession, child_ids: List[str]) -> Dict[str, int]:
+    """
+    Delete the children's star ledger shards and return their star sums.
+    
+    Lock the children's game_states rows FOR UPDATE first: awards hold a
+    share lock on that row while writing a shard, so taking the row
+    first keeps this from deadlocking with them.
+    """
+    result = await db.execute(
+        delete(StarLedgerShard)
+        .where(StarLedgerShard.child_id.in_(child_ids))
+        .returning(StarLedgerShard.child_id, StarLedgerShard.stars)
+    )
+    stars: Dict[str, int] = {}
+    for child_id, shard_stars in result.all():
+        stars[child_id] = stars.get(child_id, 0) + shard_stars
+    return stars
 
 
 class GameService:
@@ -83,82 +51,175 @@ class GameService:
         return result.scalar_one_or_none()
     
     async def add_stars(self, child_id: str, stars: int) -> Dict[str, Any]:
-        """Add stars to a child's total."""
-        game_state = await self._get_game_state(child_id)
-        if not game_state:
-            return {"error": "Game state not found"}
+        """
+        Add stars to a child's total.
+        
+        A single UPDATE ... SET stars_earned = stars_earned + n, so
+        concurrent awards never lose stars. With star_ledger_shards set,
+        the stars go to one of the child's ledger shards instead, and
+        with write coalescing they are written behind the request.
+        """
+        event = (LearningEventType.STARS_ADDED, {"stars": stars})
+        
+        if write_coalescer.enabled:
+            total = await self.get_total_stars(child_id)
+            if total is None:
+                return {"error": "Game state not found"}
+            write_coalescer.add(GameState, child_id, {"stars_earned": stars}, event=event)
+            total += stars
+        elif settings.star_ledger_shards > 0:
+            total = await self._add_ledger_stars(child_id, stars, event)
+        else:
+            total = await self.db.scalar(
+                update(GameState)
+                .where(GameState.child_id == child_id)
+                .values(stars_earned=GameState.stars_earned + stars)
+                .returning(GameState.stars_earned)
+                .execution_options(synchronize_session=False)
+            )
+            if total is not None:
+                await append_event(self.db, child_id, *event)
         
-        game_state.stars_earned += stars
+        if total is None:
+            await self.db.rollback()
+            return {"error": "Game state not found"}
         await self.db.commit()
         
         return {
             "stars_added": stars,
-            "total_stars": game_state.stars_earned
+            "total_stars": total
         }
     
+    async def _add_ledger_stars(self, child_id: str, stars: int, event) -> Optional[int]:
+        """Add stars to a random ledger shard; returns the new total."""
+        # A share lock lets awards run side by side while keeping out
+        # writers that lock the row (projection catch-up, ledger folding)
+        exists = await self.db.scalar(
+            select(GameState.id).where(GameState.child_id == child_id).with_for_update(read=True)
+        )
+        if exists is None:
+            return None
+        
+        shard = random.randrange(settings.star_ledger_shards)
+        statement = insert(StarLedgerShard).values(child_id=child_id, shard=shard, stars=stars)
+        await self.db.execute(statement.on_conflict_do_update(
+            index_elements=[StarLedgerShard.child_id, StarLedgerShard.shard],
+            set_={"stars": StarLedgerShard.stars + statement.excluded.stars}
+        ))
+        await append_event(self.db, child_id, *event)
+        return await self.get_total_stars(child_id)
+    
+    async def get_total_stars(self, child_id: str) -> Optional[int]:
+        """stars_earned plus any unfolded ledger shards and pending increments."""
+        ledger = (
+            select(func.coalesce(func.sum(StarLedgerShard.stars), 0))
+            .where(StarLedgerShard.child_id == child_id)
+            .scalar_subquery()
+        )
+        total = await self.db.scalar(
+            select(GameState.stars_earned + ledger).where(GameState.child_id == child_id)
+        )
+        if total is None:
+            return None
+        return total + write_coalescer.pending(GameState, child_id).get("stars_earned", 0)
+    
+    async def overlay_star_ledger(self, *game_states: Optional[GameState]) -> None:
+        """Add unfolded ledger shards to loaded game states (ledger mode only)."""
+        loaded = {gs.child_id: gs for gs in game_states if gs is not None}
+        if settings.star_ledger_shards <= 0 or not loaded:
+            return
+        
+        result = await self.db.execute(
+            select(StarLedgerShard.child_id, func.sum(StarLedgerShard.stars))
+            .where(StarLedgerShard.child_id.in_(list(loaded)))
+            .group_by(StarLedgerShard.child_id)
+        )
+        for child_id, stars in result.all():
+            game_state = loaded[child_id]
+            set_committed_value(game_state, "stars_earned", (game_state.stars_earned or 0) + stars)
+    
+    async def fold_star_ledger(self) -> int:
+        """
+        Move every ledger shard back into stars_earned.
+        
+        Run after turning star_ledger_shards off (projection catch-up
+        also folds the shards of the children it processes). Returns the
+        number of children folded.
+        """
+        result = await self.db.execute(select(StarLedgerShard.child_id).distinct())
+        child_ids = sorted(result.scalars().all())
+        if not child_ids:
+            return 0
+        
+        await self.db.execute(
+            select(GameState.id)
+            .where(GameState.child_id.in_(child_ids))
+            .order_by(GameState.child_id)
+            .with_for_update()
+        )
+        stars = await take_star_ledger(self.db, child_ids)
+        if stars:
+            table = GameState.__table__
+            await self.db.execute(
+                update(table)
+                .where(table.c.child_id == bindparam("_child_id"))
+                .values(stars_earned=table.c.stars_earned + bindparam("_stars")),
+                [{"_child_id": child_id, "_stars": total} for child_id, total in sorted(stars.items())]
+            )
+        await self.db.commit()
+        
+        return len(stars)
+    
     async def unlock_achievement(
         self, 
         child_id: str, 
         achievement_id: str
     ) -> AchievementUnlock:
-        """Unlock an achievement and award stars."""
+        """
+        Unlock an achievement and award stars.
+        
+        Unlocking is atomic, so concurrent unlocks award the stars once
+        (see award_achievement).
+        """
         if achievement_id not in ACHIEVEMENTS:
             raise ValueError(f"Unknown achievement: {achievement_id}")
         
         achievement = ACHIEVEMENTS[achievement_id]
-        game_state = await self._get_game_state(child_id)
-        
-        if not game_state:
-            raise ValueError("Game state not found")
-        
-        # Check if already unlocked
-        current_achievements = game_state.achievements or []
-        if achievement_id in current_achievements:
-            return AchievementUnlock(
-                achievement_id=achievement_id,
-                achievement_name=achievement["name"],
-                description=achievement["description"],
-                stars_reward=0  # Already unlocked
-            )
-        
-        # Unlock achievement
-        current_achievements.append(achievement_id)
-        game_state.achievements = current_achievements
-        game_state.stars_earned += achievement["stars"]
-        
-        # Create milestone event
-        milestone = MilestoneEvent(
-            child_id=child_id,
-            milestone_type="achievement",
-            milestone_name=achievement["name"],
-            description=achievement["description"],
-            conversation_starters=[
-                f"Congratulations! Ask your child about their '{achievement['name']}' achievement!"
-            ]
-        )
-        self.db.add(milestone)
+        unlocked = await award_achievement(self.db, child_id, achievement_id)
         
+        if not unlocked:
+            exists = await self.db.scalar(
+                select(GameState.id).where(GameState.child_id == child_id)
+            )
+            if exists is None:
+                raise ValueError("Game state not found")
         await self.db.commit()
         
         return AchievementUnlock(
             achievement_id=achievement_id,
             achievement_name=achievement["name"],
             description=achievement["description"],
-            stars_reward=achievement["stars"]
+            stars_reward=achievement["stars"] if unlocked else 0  # 0 if already unlocked
         )
     
     async def start_session(
         self, 
         child_id: str, 
         platform: str,
-        screen_size: str
+        screen_size: str,
+        game_state: Optional[GameState] = None
     ) -> PlaySession:
         """Start a new play session."""
-        game_state = await self._get_game_state(child_id)
+        if game_state is None:
+            game_state = await self._get_game_state(child_id)
         
         # Update streak
         if game_state:
             await self._update_streak(game_state)
+            # Lets streak achievements unlock in this transaction
+            await append_event(self.db, child_id, LearningEventType.SESSION_STARTED, {
+                "streak_days": game_state.current_streak_days
+            })
         
         # Create session
         session = PlaySession(
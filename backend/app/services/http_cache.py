@@ -0,0 +1,64 @@
+"""
+WonderWorld Learning Adventure - HTTP Caching Helpers
+ETag generation and conditional (304 Not Modified) responses
+"""
+from fastapi import Response, status
+from fastapi.encoders import jsonable_encoder
+from typing import Any, Optional
+import hashlib
+import json
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from a response body."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag."""
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    # Weak comparison, as required for If-None-Match
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+def conditional_response(
+    body: bytes,
+    etag: str,
+    if_none_match: Optional[str],
+    cache_control: str = "private, no-cache"
+) -> Response:
+    """
+    Return the body with its ETag, or an empty 304 if the client
+    already holds the current version.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def encode_json(payload: Any) -> bytes:
+    """Serialize a payload to compact, key-sorted JSON bytes."""
+    return json.dumps(
+        jsonable_encoder(payload),
+        separators=(",", ":"),
+        sort_keys=True
+    ).encode("utf-8")
+
+
+def cached_json_response(
+    payload: Any,
+    if_none_match: Optional[str],
+    cache_control: str = "private, no-cache"
+) -> Response:
+    """Serialize a payload and answer with an ETag derived from its content."""
+    body = encode_json(payload)
+    return conditional_response(body, make_etag(body), if_none_match, cache_control)
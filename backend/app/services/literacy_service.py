@@ -3,14 +3,157 @@ WonderWorld Learning Adventure - Literacy Service
 Handles letter tracing, phonics, and word learning logic
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from sqlalchemy import select, update, func, case, and_, or_, not_, cast, literal, column, Text, Integer
+from sqlalchemy.dialects.postgresql import insert, array, ARRAY, JSONB
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta
 
 from app.models.models import (
-    LiteracyProgress, TracingSession, Word, WordProgress, LetterGroup
+    LiteracyProgress, TracingSession, Word, WordProgress, LetterGroup, LearningEventType
 )
-from app.schemas.schemas import WordsByLevel, WordLevelEnum
+from app.schemas.schemas import WordsByLevel, WordLevelEnum, TracingBatchItem
+from app.services.word_bank import word_bank
+from app.services.word_recommender import recommender_for
+from app.services import stroke_codec, stroke_analysis
+from app.services.event_log import append_event, append_events
+
+
+# Word level -> mastered-word counter on LiteracyProgress
+LEVEL_MASTERED_COLUMNS = {
+    WordLevelEnum.TWO_LETTER: "two_letter_words_mastered",
+    WordLevelEnum.THREE_LETTER: "three_letter_words_mastered",
+    WordLevelEnum.FOUR_LETTER: "four_letter_words_mastered",
+    WordLevelEnum.FIVE_LETTER: "five_letter_words_mastered",
+}
+
+# SM-2 spaced repetition; a correct answer is quality 5, a miss quality 2
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+EASE_CHANGE_CORRECT = 0.1
+EASE_CHANGE_MISSED = -0.32
+
+
+def review_schedule(is_correct: bool, now: datetime) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    SM-2 scheduling values for a word practice attempt.
+    
+    Returns (insert_values, update_values): plain values for a word's
+    first attempt and SQL expressions over the existing row otherwise.
+    Intervals go 1 day, 6 days, then grow by the ease factor; a miss
+    resets the streak and brings the word back the next day.
+    """
+    streak = func.coalesce(WordProgress.review_streak, 0)
+    interval = func.coalesce(WordProgress.review_interval_days, 0)
+    ease = func.coalesce(WordProgress.ease_factor, INITIAL_EASE)
+    
+    if is_correct:
+        new_streak = streak + 1
+        new_interval = case(
+            (streak == 0, 1),
+            (streak == 1, 6),
+            else_=cast(func.ceil(interval * ease), Integer)
+        )
+        ease_change = EASE_CHANGE_CORRECT
+    else:
+        new_streak = literal(0)
+        new_interval = literal(1)
+        ease_change = EASE_CHANGE_MISSED
+    
+    insert_values = {
+        "review_streak": 1 if is_correct else 0,
+        "review_interval_days": 1,
+        "ease_factor": max(MIN_EASE, INITIAL_EASE + ease_change),
+        "next_review_at": now + timedelta(days=1),
+    }
+    update_values = {
+        "review_streak": new_streak,
+        "review_interval_days": new_interval,
+        "ease_factor": func.greatest(MIN_EASE, ease + ease_change),
+        "next_review_at": literal(now) + func.make_interval(0, 0, 0, new_interval),
+    }
+    return insert_values, update_values
+
+
+# Weight of the newest tracing score in a letter's running mastery
+NEW_SCORE_WEIGHT = 0.7
+
+
+def fold_letter_scores(accuracies: List[float]) -> Tuple[float, float, float]:
+    """
+    Fold consecutive tracing scores (0-100) for one letter.
+    
+    Each score updates mastery as m = 0.7 * score + 0.3 * m, so n scores
+    applied to an existing mastery m0 give m = decay * m0 + offset.
+    A letter traced for the first time starts at its first score, giving
+    first_mastery. Returns (decay, offset, first_mastery); a single
+    score is the n = 1 case.
+    """
+    keep = 1 - NEW_SCORE_WEIGHT
+    decay, offset = 1.0, 0.0
+    for accuracy in accuracies:
+        decay *= keep
+        offset = offset * keep + accuracy / 100 * NEW_SCORE_WEIGHT
+    
+    first_mastery = accuracies[0] / 100
+    for accuracy in accuracies[1:]:
+        first_mastery = first_mastery * keep + accuracy / 100 * NEW_SCORE_WEIGHT
+    
+    return decay, offset, first_mastery
+
+
+def letter_mastery_update(scores: Dict[str, List[float]]) -> Dict[str, Any]:
+    """
+    Build UPDATE values applying tracing scores, letter -> scores in order.
+    
+    Each letter's scores are folded and written in place with jsonb_set,
+    and the running mastery sum / letter count are adjusted by each
+    letter's change, so the statement touches only those keys and never
+    re-reads the whole blob.
+    """
+    mastery_json = func.coalesce(
+        LiteracyProgress.letter_mastery, cast({}, JSONB), type_=JSONB
+    )
+    updated_json = mastery_json
+    sum_change = literal(0.0)
+    new_letters = literal(0)
+    
+    for letter, accuracies in scores.items():
+        decay, offset, first_mastery = fold_letter_scores(accuracies)
+        entry = mastery_json[letter]
+        exists = mastery_json.has_key(letter)
+        
+        old_mastery = func.coalesce(entry["mastery"].as_float(), 0.0)
+        new_mastery = case(
+            (exists, func.least(1.0, old_mastery * decay + offset)),
+            else_=literal(first_mastery)
+        )
+        
+        new_entry = func.jsonb_build_object(
+            "traced", True,
+            "sound_known", func.coalesce(entry["sound_known"], cast(False, JSONB)),
+            "mastery", new_mastery,
+            "attempts", func.coalesce(entry["attempts"].as_integer(), 0) + len(accuracies)
+        )
+        updated_json = func.jsonb_set(
+            updated_json, cast(array([letter]), ARRAY(Text)), new_entry, type_=JSONB
+        )
+        sum_change = sum_change + new_mastery - case((exists, old_mastery), else_=0.0)
+        new_letters = new_letters + case((exists, 0), else_=1)
+    
+    mastery_sum = func.coalesce(LiteracyProgress.letter_mastery_sum, 0) + sum_change
+    letters_traced = func.coalesce(LiteracyProgress.letters_traced, 0) + new_letters
+    
+    return {
+        "letter_mastery": updated_json,
+        "letter_mastery_sum": mastery_sum,
+        "letters_traced": letters_traced,
+        # Average over letters; keeps the old value if the count is still
+        # zero (rows not yet rebuilt by rebuild_letter_mastery_totals)
+        "tracing_accuracy": func.coalesce(
+            mastery_sum * 100 / func.nullif(letters_traced, 0),
+            LiteracyProgress.tracing_accuracy
+        ),
+    }
 
 
 class LiteracyService:
@@ -35,83 +178,269 @@ class LiteracyService:
         Update mastery level for a specific letter.
         
         Uses weighted average with more recent attempts having higher weight.
+        Runs as one atomic UPDATE, so concurrent tracing submissions can't
+        overwrite each other.
         """
         letter = letter.upper()
         
-        # Get literacy progress
+        values = letter_mastery_update({letter: [accuracy]})
+        
         result = await self.db.execute(
-            select(LiteracyProgress).where(LiteracyProgress.child_id == child_id)
+            update(LiteracyProgress)
+            .where(LiteracyProgress.child_id == child_id)
+            .values(**values)
+            .returning(
+                LiteracyProgress.letter_mastery[letter]["mastery"].as_float(),
+                LiteracyProgress.tracing_accuracy
+            )
+            .execution_options(synchronize_session=False)
         )
-        progress = result.scalar_one_or_none()
+        row = result.one_or_none()
         
-        if not progress:
+        if row is None:
             return {"error": "Progress not found"}
         
-        # Update letter mastery
-        letter_mastery = progress.letter_mastery or {}
+        await append_event(self.db, child_id, LearningEventType.LETTER_TRACED, {
+            "letter": letter,
+            "accuracy": accuracy
+        })
+        await self.db.commit()
         
-        if letter not in letter_mastery:
-            letter_mastery[letter] = {
-                "traced": True,
-                "sound_known": False,
-                "mastery": accuracy / 100,
-                "attempts": 1
-            }
-        else:
-            # Weighted average: 70% new score, 30% previous
-            current = letter_mastery[letter]
-            new_mastery = (accuracy / 100 * 0.7) + (current.get("mastery", 0) * 0.3)
-            letter_mastery[letter] = {
-                "traced": True,
-                "sound_known": current.get("sound_known", False),
-                "mastery": min(1.0, new_mastery),
-                "attempts": current.get("attempts", 0) + 1
+        return {
+            "letter": letter,
+            "mastery": row[0],
+            "overall_accuracy": row.tracing_accuracy
+        }
+    
+    async def record_tracing_batch(
+        self,
+        child_id: str,
+        items: List[TracingBatchItem]
+    ) -> Dict[str, Any]:
+        """
+        Record an ordered batch of tracing sessions (e.g. played offline).
+        
+        New sessions are written with one multi-row INSERT that skips
+        client ids already stored, so resending a batch is safe. Letter
+        scores of the new sessions are folded in order into a single
+        letter-mastery UPDATE, with one commit for the whole batch.
+        """
+        results: List[Dict[str, Any]] = []
+        pending: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []  # (result, row)
+        to_score = []
+        first_results: Dict[str, Dict[str, Any]] = {}
+        repeats: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []  # (result, first result)
+        
+        for item in items:
+            result = {"client_id": item.client_id}
+            results.append(result)
+            
+            if item.client_id in first_results:
+                repeats.append((result, first_results[item.client_id]))
+                continue
+            first_results[item.client_id] = result
+            
+            path_samples = None
+            if item.stroke_samples:
+                try:
+                    path_samples = stroke_codec.from_base64(item.stroke_samples)
+                except stroke_codec.StrokeCodecError as exc:
+                    result.update(status="rejected", detail=str(exc))
+                    continue
+            
+            row = {
+                "child_id": child_id,
+                "client_id": item.client_id,
+                "letter": item.letter,
+                "word": item.word,
+                "is_uppercase": item.is_uppercase,
+                "stroke_accuracy": item.stroke_accuracy,
+                "stroke_smoothness": item.stroke_smoothness,
+                "time_taken_ms": item.time_taken_ms,
+                "attempt_number": item.attempt_number,
+                "path_deviation_data": item.path_deviation_data,
+                "path_samples": path_samples,
             }
+            pending.append((result, row))
+            
+            if path_samples and item.letter:
+                to_score.append((row, (item.letter, item.is_uppercase, path_samples)))
         
-        progress.letter_mastery = letter_mastery
+        # Score server-side (large batches go to the process pool)
+        if to_score:
+            scores = await stroke_analysis.score_packed_traces_async(
+                [trace for _, trace in to_score]
+            )
+            for (row, _), score in zip(to_score, scores):
+                if score is not None:
+                    row["stroke_accuracy"], row["stroke_smoothness"] = score
+        
+        created: Dict[str, str] = {}
+        if pending:
+            insert_result = await self.db.execute(
+                insert(TracingSession)
+                .values([row for _, row in pending])
+                .on_conflict_do_nothing(index_elements=["child_id", "client_id"])
+                .returning(TracingSession.id, TracingSession.client_id)
+            )
+            created = {client_id: session_id for session_id, client_id in insert_result.all()}
+        
+        # Sessions stored by an earlier upload of the same batch
+        existing = {}
+        duplicate_ids = [row["client_id"] for _, row in pending if row["client_id"] not in created]
+        if duplicate_ids:
+            existing_result = await self.db.execute(
+                select(
+                    TracingSession.client_id,
+                    TracingSession.id,
+                    TracingSession.stroke_accuracy,
+                    TracingSession.stroke_smoothness
+                ).where(
+                    TracingSession.child_id == child_id,
+                    TracingSession.client_id.in_(duplicate_ids)
+                )
+            )
+            existing = {row.client_id: row for row in existing_result.all()}
+        
+        letter_scores: Dict[str, List[float]] = {}
+        traced: List[Tuple[LearningEventType, Dict[str, Any]]] = []
+        for result, row in pending:
+            session_id = created.get(row["client_id"])
+            if session_id is None:
+                stored = existing.get(row["client_id"])
+                result.update(
+                    status="duplicate",
+                    session_id=stored.id if stored else None,
+                    stroke_accuracy=stored.stroke_accuracy if stored else None,
+                    stroke_smoothness=stored.stroke_smoothness if stored else None
+                )
+                continue
+            
+            result.update(
+                status="created",
+                session_id=session_id,
+                stroke_accuracy=row["stroke_accuracy"],
+                stroke_smoothness=row["stroke_smoothness"]
+            )
+            if row["letter"]:
+                letter_scores.setdefault(row["letter"].upper(), []).append(row["stroke_accuracy"])
+                traced.append((LearningEventType.LETTER_TRACED, {
+                    "letter": row["letter"].upper(),
+                    "accuracy": row["stroke_accuracy"]
+                }))
         
-        # Update average tracing accuracy
-        all_mastery = [v.get("mastery", 0) for v in letter_mastery.values()]
-        progress.tracing_accuracy = sum(all_mastery) / len(all_mastery) * 100
+        letter_mastery: Dict[str, float] = {}
+        overall_accuracy = None
+        if letter_scores:
+            letters = list(letter_scores)
+            mastery_result = await self.db.execute(
+                update(LiteracyProgress)
+                .where(LiteracyProgress.child_id == child_id)
+                .values(**letter_mastery_update(letter_scores))
+                .returning(
+                    LiteracyProgress.tracing_accuracy,
+                    *(LiteracyProgress.letter_mastery[letter]["mastery"].as_float() for letter in letters)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            row = mastery_result.one_or_none()
+            if row is not None:
+                overall_accuracy = row[0]
+                letter_mastery = dict(zip(letters, row[1:]))
+                await append_events(self.db, child_id, traced)
         
         await self.db.commit()
         
+        # Client ids repeated within this batch report their first occurrence
+        for result, first in repeats:
+            result.update({key: value for key, value in first.items() if key != "status"})
+            result["status"] = "duplicate"
+        
         return {
-            "letter": letter,
-            "mastery": letter_mastery[letter]["mastery"],
-            "overall_accuracy": progress.tracing_accuracy
+            "results": results,
+            "letter_mastery": letter_mastery,
+            "overall_accuracy": overall_accuracy
         }
     
-    async def get_word_progress_by_level(self, child_id: str) -> List[WordsByLevel]:
+    async def rebuild_letter_mastery_totals(
+        self,
+        child_id: Optional[str] = None,
+        stale_only: bool = False
+    ) -> int:
         """
-        Get word learning progress organized by level.
+        Recompute letter_mastery_sum, letters_traced and tracing_accuracy
+        from the letter_mastery JSON.
+        
+        Backfills rows written before the running totals existed; run at
+        startup with stale_only, which skips rows whose letters_traced
+        already matches the JSON. Rebuilds one child, or every child when
+        child_id is None. Returns the number of rows rebuilt.
         """
-        results = []
+        letters = func.jsonb_each(
+            func.coalesce(LiteracyProgress.letter_mastery, cast({}, JSONB))
+        ).table_valued(column("key", Text), column("value", JSONB)).render_derived()
+        
+        mastery_sum = (
+            select(func.coalesce(func.sum(letters.c.value["mastery"].as_float()), 0.0))
+            .correlate(LiteracyProgress)
+            .scalar_subquery()
+        )
+        letter_count = (
+            select(func.count())
+            .select_from(letters)
+            .correlate(LiteracyProgress)
+            .scalar_subquery()
+        )
         
-        for level in WordLevelEnum:
-            # Get all words at this level
-            word_result = await self.db.execute(
-                select(Word).where(
-                    Word.level == level,
-                    Word.is_active == True
-                ).order_by(Word.difficulty)
+        stmt = update(LiteracyProgress).values(
+            letter_mastery_sum=mastery_sum,
+            letters_traced=letter_count,
+            tracing_accuracy=case(
+                (letter_count > 0, mastery_sum * 100 / letter_count),
+                else_=0
             )
-            words = word_result.scalars().all()
-            
-            # Get mastered count
-            mastered_result = await self.db.execute(
-                select(func.count(WordProgress.id)).where(
-                    WordProgress.child_id == child_id,
-                    WordProgress.is_mastered == True
-                ).join(Word).where(Word.level == level)
+        )
+        if child_id is not None:
+            stmt = stmt.where(LiteracyProgress.child_id == child_id)
+        if stale_only:
+            stmt = stmt.where(
+                func.coalesce(LiteracyProgress.letters_traced, 0) != letter_count
             )
-            mastered_count = mastered_result.scalar() or 0
-            
+        
+        result = await self.db.execute(stmt.execution_options(synchronize_session=False))
+        await self.db.commit()
+        
+        return result.rowcount
+    
+    async def get_word_progress_by_level(
+        self,
+        child_id: str,
+        counts_only: bool = False
+    ) -> List[WordsByLevel]:
+        """
+        Get word learning progress organized by level.
+        
+        Words come from the cached word bank and mastered counts from the
+        per-level counters on LiteracyProgress. With counts_only the word
+        lists are left empty.
+        """
+        bank = await word_bank.get(self.db)
+        
+        counts_result = await self.db.execute(
+            select(*(
+                getattr(LiteracyProgress, attr) for attr in LEVEL_MASTERED_COLUMNS.values()
+            )).where(LiteracyProgress.child_id == child_id)
+        )
+        counts = counts_result.one_or_none()
+        
+        results = []
+        
+        for index, level in enumerate(WordLevelEnum):
             results.append(WordsByLevel(
                 level=level,
-                total_count=len(words),
-                mastered_count=mastered_count,
-                words=words
+                total_count=bank.count(level),
+                mastered_count=(counts[index] or 0) if counts else 0,
+                words=[] if counts_only else bank.by_level[level]
             ))
         
         return results
@@ -121,78 +450,217 @@ class LiteracyService:
         child_id: str, 
         word_id: str, 
         is_correct: bool
-    ) -> WordProgress:
+    ) -> Dict[str, Any]:
         """
         Record a word practice attempt and update mastery.
+        
+        A single INSERT ... ON CONFLICT DO UPDATE ... RETURNING creates or
+        updates the (child, word) row, computing the counters, mastery score,
+        mastered flag and next review date in SQL so double-taps can't race
+        or duplicate rows.
         """
-        # Get or create word progress
-        result = await self.db.execute(
-            select(WordProgress).where(
-                WordProgress.child_id == child_id,
-                WordProgress.word_id == word_id
-            )
+        now = datetime.utcnow()
+        correct = 1 if is_correct else 0
+        
+        # Values after this attempt (column refs are the existing row)
+        times_practiced = WordProgress.times_practiced + 1
+        times_correct = WordProgress.times_correct + correct
+        
+        # Consider mastered if 80%+ accuracy over 5+ attempts
+        reaches_mastery = and_(
+            times_practiced >= 5,
+            times_correct * 5 >= times_practiced * 4
         )
-        progress = result.scalar_one_or_none()
         
-        if not progress:
-            progress = WordProgress(
-                child_id=child_id,
-                word_id=word_id
-            )
-            self.db.add(progress)
+        schedule_insert, schedule_update = review_schedule(is_correct, now)
         
-        # Update stats
-        progress.times_practiced += 1
-        if is_correct:
-            progress.times_correct += 1
+        stmt = insert(WordProgress).values(
+            child_id=child_id,
+            word_id=word_id,
+            times_practiced=1,
+            times_correct=correct,
+            mastery_score=0,
+            is_mastered=False,
+            last_practiced_at=now,
+            **schedule_insert
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[WordProgress.child_id, WordProgress.word_id],
+            set_={
+                "times_practiced": times_practiced,
+                "times_correct": times_correct,
+                # Mastery score kicks in after 3 attempts
+                "mastery_score": case(
+                    (times_practiced >= 3, times_correct * 100.0 / times_practiced),
+                    else_=WordProgress.mastery_score
+                ),
+                "is_mastered": or_(WordProgress.is_mastered, reaches_mastery),
+                "mastered_at": case(
+                    (and_(not_(WordProgress.is_mastered), reaches_mastery), now),
+                    else_=WordProgress.mastered_at
+                ),
+                "last_practiced_at": now,
+                **schedule_update,
+            }
+        )
         
-        progress.last_practiced_at = datetime.utcnow()
+        word_text = select(Word.word).where(Word.id == word_id).scalar_subquery()
+        word_level = select(Word.level).where(Word.id == word_id).scalar_subquery()
+        # mastered_at is only stamped with this attempt's time when it flips
+        newly_mastered = func.coalesce(
+            and_(WordProgress.is_mastered, WordProgress.mastered_at == WordProgress.last_practiced_at),
+            False
+        )
         
-        # Calculate mastery score
-        if progress.times_practiced >= 3:
-            mastery = progress.times_correct / progress.times_practiced
-            progress.mastery_score = mastery * 100
-            
-            # Consider mastered if 80%+ accuracy over 5+ attempts
-            if progress.times_practiced >= 5 and mastery >= 0.8:
-                if not progress.is_mastered:
-                    progress.is_mastered = True
-                    progress.mastered_at = datetime.utcnow()
-                    
-                    # Update literacy progress count
-                    await self._update_words_mastered_count(child_id)
+        result = await self.db.execute(
+            stmt.returning(
+                WordProgress.word_id,
+                word_text.label("word"),
+                WordProgress.times_practiced,
+                WordProgress.times_correct,
+                WordProgress.mastery_score,
+                WordProgress.is_mastered,
+                WordProgress.can_recognize,
+                WordProgress.can_sound_out,
+                WordProgress.can_read,
+                WordProgress.can_spell,
+                WordProgress.next_review_at,
+                WordProgress.review_interval_days,
+                newly_mastered.label("newly_mastered"),
+                word_level.label("word_level")
+            )
+        )
+        progress = dict(result.one()._mapping)
+        level = progress.pop("word_level")
+        
+        if progress["newly_mastered"] and level is not None:
+            # Update literacy progress count
+            await self._increment_words_mastered(child_id, WordLevelEnum(level))
+            await append_event(self.db, child_id, LearningEventType.WORD_MASTERED, {
+                "word_id": word_id,
+                "level": WordLevelEnum(level).value
+            })
         
         await self.db.commit()
-        await self.db.refresh(progress)
         
         return progress
     
-    async def _update_words_mastered_count(self, child_id: str):
-        """Update the word mastery counts in literacy progress."""
-        # Get literacy progress
+    async def recommend_words(
+        self,
+        child_id: str,
+        limit: int = 10,
+        max_new_phonemes: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Recommend the words a child can decode next.
+        
+        Only the child's mastered word ids are read from the database;
+        ranking runs over the cached word bank's phoneme bitsets.
+        """
+        bank = await word_bank.get(self.db)
+        recommender = recommender_for(bank)
+        
         result = await self.db.execute(
-            select(LiteracyProgress).where(LiteracyProgress.child_id == child_id)
+            select(WordProgress.word_id).where(
+                WordProgress.child_id == child_id,
+                WordProgress.is_mastered == True
+            )
         )
-        progress = result.scalar_one_or_none()
+        mastered_ids = result.scalars().all()
+        
+        recommendations = []
+        for position, new_mask, in_known_family in recommender.recommend(
+            mastered_ids, limit, max_new_phonemes
+        ):
+            new_phonemes = recommender.phonemes_in(new_mask)
+            recommendations.append({
+                "word": bank.words[position],
+                "new_phonemes": new_phonemes,
+                "decodable": not new_phonemes,
+                "in_known_family": in_known_family
+            })
+        
+        return recommendations
+    
+    async def get_review_queue(
+        self,
+        child_id: str,
+        limit: int = 20,
+        due_only: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the child's words in review order (earliest next_review_at first).
         
-        if not progress:
-            return
-        
-        # Count mastered words by level
-        for level, attr in [
-            (WordLevelEnum.TWO_LETTER, "two_letter_words_mastered"),
-            (WordLevelEnum.THREE_LETTER, "three_letter_words_mastered"),
-            (WordLevelEnum.FOUR_LETTER, "four_letter_words_mastered"),
-            (WordLevelEnum.FIVE_LETTER, "five_letter_words_mastered"),
-        ]:
-            count_result = await self.db.execute(
-                select(func.count(WordProgress.id)).where(
-                    WordProgress.child_id == child_id,
-                    WordProgress.is_mastered == True
-                ).join(Word).where(Word.level == level)
+        Reads the (child_id, next_review_at) index range, then joins the
+        few selected rows to their words.
+        """
+        query = (
+            select(
+                WordProgress.word_id,
+                Word.word,
+                Word.level,
+                WordProgress.mastery_score,
+                WordProgress.is_mastered,
+                WordProgress.review_interval_days,
+                WordProgress.next_review_at,
+                (WordProgress.next_review_at <= func.now()).label("is_due")
+            )
+            .join(Word, Word.id == WordProgress.word_id)
+            .where(
+                WordProgress.child_id == child_id,
+                WordProgress.next_review_at.is_not(None)
             )
-            count = count_result.scalar() or 0
-            setattr(progress, attr, count)
+        )
+        if due_only:
+            query = query.where(WordProgress.next_review_at <= func.now())
+        
+        result = await self.db.execute(
+            query.order_by(WordProgress.next_review_at).limit(limit)
+        )
+        return [dict(row._mapping) for row in result.all()]
+    
+    async def _increment_words_mastered(self, child_id: str, level: WordLevelEnum):
+        """Bump the mastered-word counter for one level by a single UPDATE."""
+        column = getattr(LiteracyProgress, LEVEL_MASTERED_COLUMNS[level])
+        
+        await self.db.execute(
+            update(LiteracyProgress)
+            .where(LiteracyProgress.child_id == child_id)
+            .values({column: func.coalesce(column, 0) + 1})
+            .execution_options(synchronize_session=False)
+        )
+    
+    async def rebuild_words_mastered_counts(self, child_id: Optional[str] = None) -> int:
+        """
+        Recompute the per-level mastered-word counters from word_progress.
+        
+        Repair job for counters that drifted (e.g. rows edited by hand);
+        run at startup after word_progress duplicates have been merged.
+        Rebuilds one child, or every child when child_id is None, in a
+        single UPDATE. Returns the number of progress rows updated.
+        """
+        values = {}
+        for level, attr in LEVEL_MASTERED_COLUMNS.items():
+            values[attr] = (
+                select(func.count(WordProgress.id))
+                .join(Word, Word.id == WordProgress.word_id)
+                .where(
+                    WordProgress.child_id == LiteracyProgress.child_id,
+                    WordProgress.is_mastered == True,
+                    Word.level == level
+                )
+                .correlate(LiteracyProgress)
+                .scalar_subquery()
+            )
+        
+        stmt = update(LiteracyProgress).values(**values)
+        if child_id is not None:
+            stmt = stmt.where(LiteracyProgress.child_id == child_id)
+        
+        result = await self.db.execute(stmt.execution_options(synchronize_session=False))
+        await self.db.commit()
+        
+        return result.rowcount
     
     async def get_letter_groups_progress(self, child_id: str) -> Dict[str, Any]:
         """
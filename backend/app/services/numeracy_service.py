@@ -3,11 +3,187 @@ WonderWorld Learning Adventure - Numeracy Service
 Handles math learning, counting, and operations logic
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Dict, Any
+from sqlalchemy import select, update, func, case, literal, bindparam, null, Integer, LargeBinary
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
-from app.models.models import NumeracyProgress
+from app.models.models import (
+    NumeracyProgress, LearningEventType, NUMERAL_BITMAP_BYTES,
+    numeral_dict_to_bitmaps, numeral_bitmaps_to_dict
+)
+from app.services.event_log import append_events
+from app.services import fact_fluency
+from app.services.write_coalescer import write_coalescer
+
+
+# Operation -> mastery column on NumeracyProgress
+OPERATION_MASTERY = {
+    "addition": "addition_mastery",
+    "subtraction": "subtraction_mastery",
+    "multiplication": "multiplication_intro",
+}
+
+
+def score_subitizing(
+    shown_count: int,
+    guessed_count: int,
+    response_time_ms: int
+) -> Tuple[bool, bool, float]:
+    """
+    Score a subitizing attempt.
+    
+    Returns (is_correct, is_fast, mastery_delta), weighted by
+    correctness and speed.
+    """
+    is_correct = shown_count == guessed_count
+    is_fast = response_time_ms < 2000  # Under 2 seconds
+    
+    if is_correct and is_fast and shown_count <= 4:
+        # Perfect subitizing
+        return is_correct, is_fast, 2.0
+    if is_correct:
+        return is_correct, is_fast, 1.0
+    return is_correct, is_fast, -0.5
+
+
+def score_operation(
+    operation: str,
+    operand1: int,
+    operand2: int,
+    answer: int,
+    used_manipulatives: bool
+) -> Tuple[int, bool, str, float]:
+    """
+    Score a math operation attempt.
+    
+    Returns (correct_answer, is_correct, mastery_column, mastery_delta).
+    """
+    if operation == "addition":
+        correct = operand1 + operand2
+    elif operation == "subtraction":
+        correct = operand1 - operand2
+    else:  # multiplication
+        correct = operand1 * operand2
+    
+    mastery_attr = OPERATION_MASTERY.get(operation, "multiplication_intro")
+    is_correct = answer == correct
+    
+    if is_correct:
+        # Bigger bonus if not using manipulatives
+        delta = 1.5 if not used_manipulatives else 1.0
+    else:
+        delta = -0.5
+    
+    return correct, is_correct, mastery_attr, delta
+
+
+# Shapes in bit order: shape i uses bits 4i..4i+3 of shape_counters
+# and bit i of shapes_seen
+SHAPES = ["circle", "square", "triangle", "star", "heart", "diamond", "rectangle", "oval"]
+SHAPE_COUNTER_BITS = 4
+SHAPE_COUNTER_MAX = (1 << SHAPE_COUNTER_BITS) - 1
+SHAPE_LEARNED_AT = 3  # Counter value at which a shape counts as learned
+
+
+def shape_counter(counters: int, index: int) -> int:
+    """Recognition counter of one shape from the packed counters."""
+    return (counters >> (index * SHAPE_COUNTER_BITS)) & SHAPE_COUNTER_MAX
+
+
+def apply_shape_attempt(counters: int, seen: int, index: int, recognized: bool) -> Tuple[int, int]:
+    """
+    Packed (counters, seen) after one attempt at shape index.
+    
+    A recognition raises the shape's counter by one and a miss lowers it,
+    staying within 0-15. Mirrors shape_attempt_update.
+    """
+    counter = shape_counter(counters, index)
+    step = 1 << (index * SHAPE_COUNTER_BITS)
+    if recognized and counter < SHAPE_COUNTER_MAX:
+        counters += step
+    elif not recognized and counter > 0:
+        counters -= step
+    return counters, seen | (1 << index)
+
+
+def shape_attempt_update(index: int, recognized: bool) -> Dict[str, Any]:
+    """UPDATE values applying one shape attempt in SQL (no read-modify-write)."""
+    counters = func.coalesce(NumeracyProgress.shape_counters, 0)
+    seen = func.coalesce(NumeracyProgress.shapes_seen, 0)
+    counter = counters.bitwise_rshift(literal(index * SHAPE_COUNTER_BITS, Integer)).bitwise_and(SHAPE_COUNTER_MAX)
+    step = 1 << (index * SHAPE_COUNTER_BITS)
+    
+    if recognized:
+        new_counters = counters + case((counter < SHAPE_COUNTER_MAX, step), else_=0)
+    else:
+        new_counters = counters - case((counter > 0, step), else_=0)
+    
+    return {
+        "shape_counters": new_counters,
+        "shapes_seen": seen.bitwise_or(1 << index),
+    }
+
+
+def numeral_recognition_update(numerals: Dict[int, bool]) -> Dict[str, Any]:
+    """UPDATE values setting each numeral's seen/recognized bits with set_bit."""
+    empty = bytes(NUMERAL_BITMAP_BYTES)
+    seen = func.coalesce(NumeracyProgress.numeral_seen, empty, type_=LargeBinary)
+    recognized_bits = func.coalesce(NumeracyProgress.numeral_recognized, empty, type_=LargeBinary)
+    
+    for numeral, recognized in numerals.items():
+        seen = func.set_bit(seen, numeral, 1, type_=LargeBinary)
+        recognized_bits = func.set_bit(
+            recognized_bits, numeral, 1 if recognized else 0, type_=LargeBinary
+        )
+    return {"numeral_seen": seen, "numeral_recognized": recognized_bits}
+
+
+MASTERY_MIN, MASTERY_MAX = 0, 100
+
+
+def clamped_mastery(column, delta: float):
+    """SQL expression adding delta to a 0-100 mastery column, clamped."""
+    return func.greatest(MASTERY_MIN, func.least(MASTERY_MAX, column + delta))
+
+
+# A mastery step (shift, low, high) maps x to min(high, max(low, x + shift))
+MasteryStep = Tuple[float, float, float]
+MASTERY_IDENTITY: MasteryStep = (0.0, MASTERY_MIN, MASTERY_MAX)
+
+
+def compose_mastery_step(step: MasteryStep, delta: float) -> MasteryStep:
+    """
+    Step followed by adding delta and clamping to 0-100, as one step.
+    
+    clamp(clamp(x + s, lo, hi) + d) == clamp(x + s + d, clamp(lo + d), clamp(hi + d)),
+    so any run of clamped deltas is again a single shift and clamp.
+    """
+    shift, low, high = step
+    clamp = lambda value: min(MASTERY_MAX, max(MASTERY_MIN, value))
+    return shift + delta, clamp(low + delta), clamp(high + delta)
+
+
+def composed_mastery(column, step: MasteryStep):
+    """SQL expression applying a composed mastery step to a column."""
+    shift, low, high = step
+    return func.greatest(low, func.least(high, column + shift))
+
+
+# Columns returned after a batch, enough to build NumeracyProgressResponse
+BATCH_STATE_COLUMNS = (
+    NumeracyProgress.subitizing_mastery,
+    NumeracyProgress.counting_range,
+    NumeracyProgress.numeral_seen,
+    NumeracyProgress.numeral_recognized,
+    NumeracyProgress.addition_mastery,
+    NumeracyProgress.subtraction_mastery,
+    NumeracyProgress.multiplication_intro,
+    NumeracyProgress.place_value_mastery,
+    NumeracyProgress.two_digit_operations,
+    NumeracyProgress.st_puzzles_completed,
+    NumeracyProgress.st_current_level,
+    NumeracyProgress.nooms_interactions,
+)
 
 
 class NumeracyService:
@@ -21,6 +197,46 @@ class NumeracyService:
         )
         return result.scalar_one_or_none()
     
+    async def _apply_update(
+        self,
+        child_id: str,
+        values: Dict[str, Any],
+        *returning,
+        event: Optional[Tuple[LearningEventType, Dict[str, Any]]] = None,
+        events: Optional[List[Tuple[LearningEventType, Dict[str, Any]]]] = None
+    ):
+        """
+        Apply one atomic UPDATE to the child's progress row and commit.
+        
+        Counters are changed by SQL expressions (e.g. col = col + 1), so
+        concurrent writers never lose increments. With no values the row
+        is only locked and read. The event (or events), if given, are
+        appended in the same transaction. Returns the RETURNING row, or
+        None if the child has no progress row.
+        """
+        if values:
+            result = await self.db.execute(
+                update(NumeracyProgress)
+                .where(NumeracyProgress.child_id == child_id)
+                .values(**values)
+                .returning(*returning)
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            result = await self.db.execute(
+                select(*returning)
+                .where(NumeracyProgress.child_id == child_id)
+                .with_for_update()
+            )
+        row = result.one_or_none()
+        
+        if event is not None:
+            events = [event, *(events or [])]
+        if row is not None and events:
+            await append_events(self.db, child_id, events)
+        await self.db.commit()
+        return row
+    
     async def record_subitizing(
         self, 
         child_id: str, 
@@ -35,29 +251,27 @@ class NumeracyService:
         - 1-3: Should be instant (< 1 second)
         - 4-6: May require counting
         """
-        progress = await self._get_progress(child_id)
-        if not progress:
-            return {"error": "Progress not found"}
-        
-        is_correct = shown_count == guessed_count
-        is_fast = response_time_ms < 2000  # Under 2 seconds
-        
-        # Update subitizing mastery
-        # Weight by correctness and speed
-        if is_correct and is_fast and shown_count <= 4:
-            # Perfect subitizing
-            progress.subitizing_mastery = min(100, progress.subitizing_mastery + 2)
-        elif is_correct:
-            progress.subitizing_mastery = min(100, progress.subitizing_mastery + 1)
-        else:
-            progress.subitizing_mastery = max(0, progress.subitizing_mastery - 0.5)
+        is_correct, is_fast, delta = score_subitizing(
+            shown_count, guessed_count, response_time_ms
+        )
         
-        await self.db.commit()
+        row = await self._apply_update(
+            child_id,
+            {"subitizing_mastery": clamped_mastery(NumeracyProgress.subitizing_mastery, delta)},
+            NumeracyProgress.subitizing_mastery,
+            event=(LearningEventType.SUBITIZING_ATTEMPT, {
+                "shown_count": shown_count,
+                "guessed_count": guessed_count,
+                "response_time_ms": response_time_ms,
+            })
+        )
+        if row is None:
+            return {"error": "Progress not found"}
         
         return {
             "is_correct": is_correct,
             "is_fast": is_fast,
-            "subitizing_mastery": float(progress.subitizing_mastery)
+            "subitizing_mastery": float(row.subitizing_mastery)
         }
     
     async def record_counting(
@@ -71,20 +285,28 @@ class NumeracyService:
         
         Update the counting range (how high they can count).
         """
-        progress = await self._get_progress(child_id)
-        if not progress:
-            return {"error": "Progress not found"}
-        
         # Update counting range if they reached higher
-        if reached_count >= target_count and target_count > progress.counting_range:
-            progress.counting_range = target_count
+        values = {}
+        if reached_count >= target_count:
+            values["counting_range"] = func.greatest(NumeracyProgress.counting_range, target_count)
         
-        await self.db.commit()
+        row = await self._apply_update(
+            child_id,
+            values,
+            NumeracyProgress.counting_range,
+            event=(LearningEventType.COUNTING_ATTEMPT, {
+                "target_count": target_count,
+                "reached_count": reached_count,
+            })
+        )
+        
+        if row is None:
+            return {"error": "Progress not found"}
         
         return {
             "target": target_count,
             "reached": reached_count,
-            "counting_range": progress.counting_range
+            "counting_range": row.counting_range
         }
     
     async def record_numeral_recognition(
@@ -95,25 +317,86 @@ class NumeracyService:
     ) -> Dict[str, Any]:
         """
         Record numeral recognition progress.
+        
+        Sets the numeral's bits with one atomic UPDATE and counts the
+        recognized numerals by popcount.
         """
-        progress = await self._get_progress(child_id)
-        if not progress:
+        row = await self._apply_update(
+            child_id,
+            numeral_recognition_update({numeral: recognized}),
+            func.bit_count(NumeracyProgress.numeral_recognized).label("total_recognized"),
+            event=(LearningEventType.NUMERAL_RECOGNITION, {
+                "numeral": numeral,
+                "recognized": recognized,
+            })
+        )
+        if row is None:
             return {"error": "Progress not found"}
         
-        numeral_recognition = progress.numeral_recognition or {}
-        numeral_recognition[str(numeral)] = recognized
-        progress.numeral_recognition = numeral_recognition
-        
-        await self.db.commit()
-        
-        recognized_count = sum(1 for v in numeral_recognition.values() if v)
-        
         return {
             "numeral": numeral,
             "recognized": recognized,
-            "total_recognized": recognized_count
+            "total_recognized": row.total_recognized
         }
     
+    async def backfill_numeral_bitmaps(self, batch_size: int = 1000) -> int:
+        """
+        Merge the legacy numeral_recognition JSON into the numeral bitmaps.
+        
+        Run at startup for rows written before the bitmaps existed. Bits
+        already set by newer attempts win over the JSON; the JSON is
+        cleared once merged, which marks the row as converted. Rows are
+        locked while merged, so concurrent attempts are not lost.
+        Returns the number of rows converted.
+        """
+        table = NumeracyProgress.__table__
+        merge = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values(
+                numeral_seen=bindparam("_seen"),
+                numeral_recognized=bindparam("_recognized"),
+                numeral_recognition=null()
+            )
+        )
+        
+        converted = 0
+        while True:
+            result = await self.db.execute(
+                select(
+                    NumeracyProgress.id,
+                    NumeracyProgress.numeral_seen,
+                    NumeracyProgress.numeral_recognized,
+                    NumeracyProgress.legacy_numeral_recognition
+                )
+                .where(NumeracyProgress.legacy_numeral_recognition.is_not(None))
+                .limit(batch_size)
+                .with_for_update()
+            )
+            rows = result.all()
+            if not rows:
+                break
+            
+            params = []
+            for row_id, seen, recognized, numerals in rows:
+                legacy_seen, legacy_recognized = (
+                    int.from_bytes(bitmap, "little") for bitmap in numeral_dict_to_bitmaps(numerals)
+                )
+                seen_bits = int.from_bytes(seen or b"", "little")
+                recognized_bits = int.from_bytes(recognized or b"", "little")
+                params.append({
+                    "_id": row_id,
+                    "_seen": (seen_bits | legacy_seen).to_bytes(NUMERAL_BITMAP_BYTES, "little"),
+                    "_recognized": (
+                        (recognized_bits & seen_bits) | (legacy_recognized & ~seen_bits)
+                    ).to_bytes(NUMERAL_BITMAP_BYTES, "little"),
+                })
+            await self.db.execute(merge, params)
+            await self.db.commit()
+            converted += len(params)
+        
+        return converted
+    
     async def record_operation(
         self, 
         child_id: str, 
@@ -127,34 +410,39 @@ class NumeracyService:
         """
         Record a math operation attempt.
         """
-        progress = await self._get_progress(child_id)
-        if not progress:
-            return {"error": "Progress not found"}
+        correct, is_correct, mastery_attr, delta = score_operation(
+            operation, operand1, operand2, answer, used_manipulatives
+        )
+        mastery_column = getattr(NumeracyProgress, mastery_attr)
+        values = {mastery_attr: clamped_mastery(mastery_column, delta)}
         
-        # Calculate correct answer
-        if operation == "addition":
-            correct = operand1 + operand2
-            mastery_attr = "addition_mastery"
-        elif operation == "subtraction":
-            correct = operand1 - operand2
-            mastery_attr = "subtraction_mastery"
-        else:  # multiplication
-            correct = operand1 * operand2
-            mastery_attr = "multiplication_intro"
-        
-        is_correct = answer == correct
-        
-        # Update mastery
-        current_mastery = getattr(progress, mastery_attr)
-        if is_correct:
-            # Bigger bonus if not using manipulatives
-            bonus = 1.5 if not used_manipulatives else 1.0
-            new_mastery = min(100, current_mastery + bonus)
-        else:
-            new_mastery = max(0, current_mastery - 0.5)
+        index = fact_fluency.fact_index(operation, operand1, operand2)
+        if index is not None:
+            # Row lock keeps concurrent attempts from overwriting the matrix
+            result = await self.db.execute(
+                select(NumeracyProgress.fact_matrix)
+                .where(NumeracyProgress.child_id == child_id)
+                .with_for_update()
+            )
+            matrix = fact_fluency.decode_matrix(result.scalar_one_or_none())
+            fact_fluency.record_fact_attempt(matrix, index, is_correct, response_time_ms)
+            values["fact_matrix"] = fact_fluency.encode_matrix(matrix)
         
-        setattr(progress, mastery_attr, new_mastery)
-        await self.db.commit()
+        row = await self._apply_update(
+            child_id,
+            values,
+            mastery_column,
+            event=(LearningEventType.OPERATION_ATTEMPT, {
+                "operation": operation,
+                "operand1": operand1,
+                "operand2": operand2,
+                "answer": answer,
+                "response_time_ms": response_time_ms,
+                "used_manipulatives": used_manipulatives,
+            })
+        )
+        if row is None:
+            return {"error": "Progress not found"}
         
         return {
             "operation": operation,
@@ -162,9 +450,154 @@ class NumeracyService:
             "answer_given": answer,
             "correct_answer": correct,
             "is_correct": is_correct,
-            "mastery": float(new_mastery)
+            "mastery": float(row[0])
         }
     
+    async def record_event_batch(self, child_id: str, events: List[Any]) -> Dict[str, Any]:
+        """
+        Record a batch of mini-game events with one atomic UPDATE.
+        
+        Events are folded in order into one set of deltas. Mastery deltas
+        are composed so the result equals applying them one at a time,
+        each clamped to 0-100. Every event is still appended to the event
+        log, exactly as the single-event endpoints would.
+        """
+        mastery_steps: Dict[str, MasteryStep] = {}
+        counted_to = 0
+        numerals: Dict[int, bool] = {}
+        st_completed, st_next_level = 0, 0
+        nooms = 0
+        fact_attempts = []
+        log, results = [], []
+        
+        def add_mastery(attr: str, delta: float):
+            mastery_steps[attr] = compose_mastery_step(
+                mastery_steps.get(attr, MASTERY_IDENTITY), delta
+            )
+        
+        for event in events:
+            if event.type == "subitizing":
+                success, _, delta = score_subitizing(
+                    event.shown_count, event.guessed_count, event.response_time_ms
+                )
+                add_mastery("subitizing_mastery", delta)
+                log.append((LearningEventType.SUBITIZING_ATTEMPT, {
+                    "shown_count": event.shown_count,
+                    "guessed_count": event.guessed_count,
+                    "response_time_ms": event.response_time_ms,
+                }))
+            
+            elif event.type == "counting":
+                success = event.reached_count >= event.target_count
+                if success:
+                    counted_to = max(counted_to, event.target_count)
+                log.append((LearningEventType.COUNTING_ATTEMPT, {
+                    "target_count": event.target_count,
+                    "reached_count": event.reached_count,
+                }))
+            
+            elif event.type == "numeral":
+                success = event.recognized
+                # The last attempt at a numeral wins, as with single updates
+                numerals[event.numeral] = event.recognized
+                log.append((LearningEventType.NUMERAL_RECOGNITION, {
+                    "numeral": event.numeral,
+                    "recognized": event.recognized,
+                }))
+            
+            elif event.type == "operation":
+                _, success, mastery_attr, delta = score_operation(
+                    event.operation, event.operand1, event.operand2,
+                    event.answer, event.used_manipulatives
+                )
+                add_mastery(mastery_attr, delta)
+                index = fact_fluency.fact_index(event.operation, event.operand1, event.operand2)
+                if index is not None:
+                    fact_attempts.append((index, success, event.response_time_ms))
+                log.append((LearningEventType.OPERATION_ATTEMPT, {
+                    "operation": event.operation,
+                    "operand1": event.operand1,
+                    "operand2": event.operand2,
+                    "answer": event.answer,
+                    "response_time_ms": event.response_time_ms,
+                    "used_manipulatives": event.used_manipulatives,
+                }))
+            
+            elif event.type == "st_puzzle":
+                success = event.completed
+                if success:
+                    st_completed += 1
+                    st_next_level = max(st_next_level, event.puzzle_level + 1)
+                log.append((LearningEventType.ST_PUZZLE_ATTEMPT, {
+                    "puzzle_level": event.puzzle_level,
+                    "completed": event.completed,
+                    "attempts": event.attempts,
+                }))
+            
+            else:  # nooms
+                success = True
+                nooms += 1
+                log.append((LearningEventType.NOOMS_INTERACTION, {
+                    "interaction_type": event.interaction_type,
+                    "blocks_used": event.blocks_used,
+                }))
+            
+            results.append({"type": event.type, "success": success})
+        
+        values = {
+            attr: composed_mastery(getattr(NumeracyProgress, attr), step)
+            for attr, step in mastery_steps.items()
+        }
+        if counted_to:
+            values["counting_range"] = func.greatest(NumeracyProgress.counting_range, counted_to)
+        if numerals:
+            values.update(numeral_recognition_update(numerals))
+        if st_completed:
+            values["st_puzzles_completed"] = NumeracyProgress.st_puzzles_completed + st_completed
+            values["st_current_level"] = func.greatest(NumeracyProgress.st_current_level, st_next_level)
+        if nooms:
+            values["nooms_interactions"] = NumeracyProgress.nooms_interactions + nooms
+        if fact_attempts:
+            # Row lock keeps concurrent attempts from overwriting the matrix
+            result = await self.db.execute(
+                select(NumeracyProgress.fact_matrix)
+                .where(NumeracyProgress.child_id == child_id)
+                .with_for_update()
+            )
+            matrix = fact_fluency.decode_matrix(result.scalar_one_or_none())
+            for index, is_correct, response_time_ms in fact_attempts:
+                fact_fluency.record_fact_attempt(matrix, index, is_correct, response_time_ms)
+            values["fact_matrix"] = fact_fluency.encode_matrix(matrix)
+        
+        row = await self._apply_update(child_id, values, *BATCH_STATE_COLUMNS, events=log)
+        if row is None:
+            return {"error": "Progress not found"}
+        
+        progress = dict(row._mapping)
+        progress["numeral_recognition"] = numeral_bitmaps_to_dict(
+            progress.pop("numeral_seen"), progress.pop("numeral_recognized")
+        )
+        for column, delta in write_coalescer.pending(NumeracyProgress, child_id).items():
+            progress[column] += delta
+        return {"processed": len(events), "results": results, "progress": progress}
+    
+    async def get_weakest_facts(
+        self,
+        child_id: str,
+        k: int = 10,
+        operation: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The child's k least fluent arithmetic facts, weakest first.
+        
+        Loads only the packed fact matrix and ranks all facts at once.
+        """
+        result = await self.db.execute(
+            select(NumeracyProgress.fact_matrix).where(NumeracyProgress.child_id == child_id)
+        )
+        matrix = fact_fluency.decode_matrix(result.scalar_one_or_none())
+        return fact_fluency.weakest_facts(matrix, k, operation)
+    
     async def record_st_puzzle(
         self, 
         child_id: str, 
@@ -177,25 +610,38 @@ class NumeracyService:
         
         ST puzzles are language-independent visual math challenges.
         """
-        progress = await self._get_progress(child_id)
-        if not progress:
-            return {"error": "Progress not found"}
+        columns = (NumeracyProgress.st_puzzles_completed, NumeracyProgress.st_current_level)
         
+        values = {}
         if completed:
-            progress.st_puzzles_completed += 1
-            
             # Level up if completed current level
-            if puzzle_level >= progress.st_current_level:
-                progress.st_current_level = puzzle_level + 1
+            values = {
+                "st_puzzles_completed": NumeracyProgress.st_puzzles_completed + 1,
+                "st_current_level": func.greatest(
+                    NumeracyProgress.st_current_level, puzzle_level + 1
+                ),
+            }
         
-        await self.db.commit()
+        row = await self._apply_update(
+            child_id,
+            values,
+            *columns,
+            event=(LearningEventType.ST_PUZZLE_ATTEMPT, {
+                "puzzle_level": puzzle_level,
+                "completed": completed,
+                "attempts": attempts,
+            })
+        )
+        
+        if row is None:
+            return {"error": "Progress not found"}
         
         return {
             "puzzle_level": puzzle_level,
             "completed": completed,
             "attempts": attempts,
-            "total_completed": progress.st_puzzles_completed,
-            "current_level": progress.st_current_level
+            "total_completed": row.st_puzzles_completed,
+            "current_level": row.st_current_level
         }
     
     async def record_nooms_interaction(
@@ -209,15 +655,112 @@ class NumeracyService:
         
         Nooms are Montessori-inspired digital blocks.
         """
-        progress = await self._get_progress(child_id)
-        if not progress:
-            return {"error": "Progress not found"}
+        event = (LearningEventType.NOOMS_INTERACTION, {
+            "interaction_type": interaction_type,
+            "blocks_used": blocks_used,
+        })
         
-        progress.nooms_interactions += 1
-        await self.db.commit()
+        if write_coalescer.enabled:
+            # Written behind the request; report the total including pending taps
+            total = await self.db.scalar(
+                select(NumeracyProgress.nooms_interactions)
+                .where(NumeracyProgress.child_id == child_id)
+            )
+            if total is None:
+                return {"error": "Progress not found"}
+            write_coalescer.add(NumeracyProgress, child_id, {"nooms_interactions": 1}, event=event)
+            total += write_coalescer.pending(NumeracyProgress, child_id)["nooms_interactions"]
+        else:
+            row = await self._apply_update(
+                child_id,
+                {"nooms_interactions": NumeracyProgress.nooms_interactions + 1},
+                NumeracyProgress.nooms_interactions,
+                event=event
+            )
+            if row is None:
+                return {"error": "Progress not found"}
+            total = row.nooms_interactions
         
         return {
             "interaction_type": interaction_type,
             "blocks_used": blocks_used,
-            "total_interactions": progress.nooms_interactions
+            "total_interactions": total
+        }
+    
+    async def record_shape_recognition(
+        self,
+        child_id: str,
+        shape: str,
+        recognized: bool,
+        response_time_ms: int
+    ) -> Dict[str, Any]:
+        """
+        Record a shape recognition attempt.
+        
+        Updates the shape's packed counter and seen bit in one UPDATE.
+        """
+        index = SHAPES.index(shape)
+        
+        row = await self._apply_update(
+            child_id,
+            shape_attempt_update(index, recognized),
+            NumeracyProgress.shape_counters,
+            event=(LearningEventType.SHAPE_RECOGNITION, {
+                "shape": shape,
+                "recognized": recognized,
+                "response_time_ms": response_time_ms,
+            })
+        )
+        if row is None:
+            return {"error": "Progress not found"}
+        
+        level = shape_counter(row.shape_counters, index)
+        return {
+            "shape": shape,
+            "recognized": recognized,
+            "response_time_ms": response_time_ms,
+            "recognition_level": level,
+            "learned": level >= SHAPE_LEARNED_AT
+        }
+    
+    async def get_shapes_progress(self, child_id: str) -> Dict[str, Any]:
+        """
+        Split shapes into learned, in progress and not started.
+        
+        Reads only the two packed columns; learned shapes have a counter
+        of at least SHAPE_LEARNED_AT, in-progress shapes are seen but not
+        yet learned.
+        """
+        result = await self.db.execute(
+            select(NumeracyProgress.shape_counters, NumeracyProgress.shapes_seen)
+            .where(NumeracyProgress.child_id == child_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return {"error": "Progress not found"}
+        
+        counters, seen = row.shape_counters or 0, row.shapes_seen or 0
+        learned, in_progress, not_started = [], [], []
+        credit = 0
+        
+        for index, shape in enumerate(SHAPES):
+            counter = shape_counter(counters, index)
+            credit += min(counter, SHAPE_LEARNED_AT)
+            if counter >= SHAPE_LEARNED_AT:
+                learned.append(shape)
+            elif seen >> index & 1:
+                in_progress.append(shape)
+            else:
+                not_started.append(shape)
+        
+        return {
+            "shapes_learned": learned,
+            "shapes_in_progress": in_progress,
+            "shapes_not_started": not_started,
+            "shape_levels": {
+                shape: shape_counter(counters, index) for index, shape in enumerate(SHAPES)
+            },
+            "total_shapes": len(SHAPES),
+            # Partial credit for shapes on their way to learned
+            "mastery_percentage": round(credit * 100 / (SHAPE_LEARNED_AT * len(SHAPES)), 1)
         }
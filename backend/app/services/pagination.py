@@ -0,0 +1,25 @@
+"""
+WonderWorld Learning Adventure - Keyset Pagination
+Opaque cursors for (timestamp, id) ordered listings
+"""
+from datetime import datetime
+from typing import Tuple
+import base64
+import binascii
+
+
+def encode_cursor(timestamp: datetime, row_id: str) -> str:
+    """Encode the last row's sort key as an opaque, URL-safe cursor."""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor; raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        timestamp, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), row_id
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
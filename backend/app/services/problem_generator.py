@@ -0,0 +1,223 @@
+"""
+WonderWorld Learning Adventure - Procedural Problem Generator
+Numeracy problems drawn from precomputed difficulty tables
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+import math
+import random
+
+
+# Difficulty bins on the Rasch logit scale; targets outside are clamped
+DIFFICULTY_MIN = -4.0
+DIFFICULTY_MAX = 4.0
+BIN_WIDTH = 0.25
+BIN_COUNT = int((DIFFICULTY_MAX - DIFFICULTY_MIN) / BIN_WIDTH)
+
+OPTION_COUNT = 4
+
+
+class Problem(NamedTuple):
+    operands: Tuple[int, ...]
+    answer: int
+    difficulty: float
+
+
+# ============== Difficulty Models ==============
+
+def addition_difficulty(a: int, b: int) -> float:
+    """Larger sums, carrying and two-digit operands make addition harder."""
+    logit = -2.5 + 0.12 * (a + b)
+    if (a % 10) + (b % 10) >= 10:
+        logit += 1.0  # Carry / crossing ten
+    if a >= 10 and b >= 10:
+        logit += 0.5
+    if min(a, b) <= 1:
+        logit -= 0.75  # Adding 0 or 1 is counting on
+    return logit
+
+
+def subtraction_difficulty(a: int, b: int) -> float:
+    """Borrowing across ten costs the most; taking away 0, 1 or all is easy."""
+    logit = -2.0 + 0.1 * a + 0.05 * b
+    if a % 10 < b % 10:
+        logit += 1.25  # Borrow / crossing ten downwards
+    if b <= 1 or a == b:
+        logit -= 0.75
+    return logit
+
+
+def multiplication_difficulty(a: int, b: int) -> float:
+    """Difficulty grows with the larger factor; 0, 1, 2, 5 and 10 are easier."""
+    logit = -1.0 + 0.25 * max(a, b)
+    for factor in (a, b):
+        if factor in (0, 1, 10):
+            logit -= 1.0
+        elif factor in (2, 5):
+            logit -= 0.5
+    if a == b:
+        logit -= 0.25  # Squares are memorable
+    return logit
+
+
+def subitizing_difficulty(count: int) -> float:
+    """Up to 3 items are seen at a glance; beyond 4 children start counting."""
+    return -3.0 + 0.5 * count + 0.75 * max(0, count - 4)
+
+
+def counting_difficulty(count: int) -> float:
+    """Counting gets harder with size, and again past ten and twenty."""
+    logit = -3.0 + 0.12 * count
+    if count > 10:
+        logit += 0.5
+    if count > 20:
+        logit += 0.5
+    return logit
+
+
+# ============== Difficulty Tables ==============
+
+def _bin_index(difficulty: float) -> int:
+    index = math.floor((difficulty - DIFFICULTY_MIN) / BIN_WIDTH)
+    return min(max(index, 0), BIN_COUNT - 1)
+
+
+class DifficultyTable:
+    """
+    Every problem of one task type, grouped into fixed-width difficulty bins.
+
+    Empty bins point at the nearest non-empty one when the table is built,
+    so a target difficulty maps to its candidates with one index lookup.
+    """
+
+    def __init__(self, problems: List[Problem]):
+        self.size = len(problems)
+        bins: List[List[Problem]] = [[] for _ in range(BIN_COUNT)]
+        for problem in problems:
+            bins[_bin_index(problem.difficulty)].append(problem)
+
+        filled = [index for index, problems in enumerate(bins) if problems]
+        self.bins = [
+            bins[min(filled, key=lambda f: (abs(f - index), f))]
+            for index in range(BIN_COUNT)
+        ]
+        self.min_difficulty = min(p.difficulty for p in problems)
+        self.max_difficulty = max(p.difficulty for p in problems)
+        self.by_operands = {problem.operands: problem for problem in problems}
+
+    def pick(self, target_difficulty: float, rng: random.Random) -> Problem:
+        return rng.choice(self.bins[_bin_index(target_difficulty)])
+
+    def find(self, operands: Tuple[int, ...]) -> Optional[Problem]:
+        return self.by_operands.get(operands)
+
+
+def _binary_problems(
+    operation: Callable[[int, int], int],
+    difficulty: Callable[[int, int], float],
+    first: range,
+    second: range,
+    allowed: Callable[[int, int], bool] = lambda a, b: True
+) -> List[Problem]:
+    return [
+        Problem((a, b), operation(a, b), round(difficulty(a, b), 4))
+        for a in first for b in second if allowed(a, b)
+    ]
+
+
+def _count_problems(difficulty: Callable[[int], float], counts: range) -> List[Problem]:
+    return [Problem((n,), n, round(difficulty(n), 4)) for n in counts]
+
+
+TABLES: Dict[str, DifficultyTable] = {
+    "addition": DifficultyTable(_binary_problems(
+        lambda a, b: a + b, addition_difficulty, range(0, 21), range(0, 21)
+    )),
+    # No negative answers
+    "subtraction": DifficultyTable(_binary_problems(
+        lambda a, b: a - b, subtraction_difficulty, range(0, 21), range(0, 21),
+        allowed=lambda a, b: b <= a
+    )),
+    "multiplication": DifficultyTable(_binary_problems(
+        lambda a, b: a * b, multiplication_difficulty, range(0, 11), range(0, 11)
+    )),
+    # Same ranges the numeracy record endpoints accept
+    "subitizing": DifficultyTable(_count_problems(subitizing_difficulty, range(1, 11))),
+    "counting": DifficultyTable(_count_problems(counting_difficulty, range(1, 31))),
+}
+
+GENERATED_TASK_TYPES = list(TABLES)
+
+_OPERATION_SYMBOLS = {"addition": "+", "subtraction": "-", "multiplication": "×"}
+
+HINTS = {
+    "addition": ["Start with the bigger number and count on!", "Try making a ten first."],
+    "subtraction": ["Count back from the first number.", "How many more to get from the small number to the big one?"],
+    "multiplication": ["Think of it as equal groups.", "Skip count by one of the numbers."],
+    "subitizing": ["Look for small groups you know, like pairs."],
+    "counting": ["Touch each one as you count.", "Say one number for each object."],
+}
+
+_default_rng = random.Random()
+
+
+# ============== Generation ==============
+
+def _options(answer: int, rng: random.Random) -> List[int]:
+    """The answer plus nearby distractors, shuffled; never negative."""
+    distractors = [answer + offset for offset in (-2, -1, 1, 2, 10, -10) if answer + offset >= 0]
+    options = [answer] + rng.sample(distractors, OPTION_COUNT - 1)
+    rng.shuffle(options)
+    return options
+
+
+def _prompt(task_type: str, operands: Tuple[int, ...]) -> str:
+    if task_type in _OPERATION_SYMBOLS:
+        return f"{operands[0]} {_OPERATION_SYMBOLS[task_type]} {operands[1]} = ?"
+    if task_type == "subitizing":
+        return "How many dots do you see?"
+    return "Count the objects!"
+
+
+def generate_problem(
+    task_type: str,
+    target_difficulty: float,
+    rng: Optional[random.Random] = None
+) -> Dict[str, Any]:
+    """
+    A problem of task_type as close as possible to target_difficulty.
+
+    The answer is left out; answers are checked against find_problem
+    when submitted. Raises KeyError for task types without a table.
+    """
+    rng = rng or _default_rng
+    problem = TABLES[task_type].pick(target_difficulty, rng)
+
+    if len(problem.operands) == 2:
+        parameters = {"operand1": problem.operands[0], "operand2": problem.operands[1]}
+    else:
+        parameters = {"count": problem.operands[0]}
+
+    return {
+        "task_type": task_type,
+        "difficulty": problem.difficulty,
+        "target_difficulty": round(target_difficulty, 4),
+        "content": {
+            "type": task_type,
+            "prompt": _prompt(task_type, problem.operands),
+            "options": _options(problem.answer, rng),
+            "hints": HINTS[task_type],
+        },
+        "parameters": parameters,
+    }
+
+
+def find_problem(task_type: str, parameters: Dict[str, int]) -> Optional[Problem]:
+    """The table problem generate_problem described with these parameters, if any."""
+    table = TABLES.get(task_type)
+    if table is None:
+        return None
+    if "count" in parameters:
+        operands = (parameters["count"],)
+    else:
+        operands = (parameters.get("operand1"), parameters.get("operand2"))
+    return table.find(operands)
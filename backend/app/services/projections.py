@@ -0,0 +1,555 @@
+"""
+WonderWorld Learning Adventure - Progress Projections
+Rebuilds the progress tables by replaying the learning event log
+
+Every service write that changes LiteracyProgress, NumeracyProgress,
+SelProgress or GameState also appends an event holding the raw inputs
+(see event_log.append_events). A projection folds a child's events into
+its table's columns with reducers that re-run the scoring rules, so
+after a rule change (bump the projection's version) history can be
+recomputed under the new rule.
+
+Checkpoints keep each child's projected state and the last event folded
+into it, so catching up only reads newer events. Events are appended in
+the same transaction that updates (and so locks) the child's progress
+row, and a catch-up locks those rows before reading events: any event
+it cannot see yet belongs to a transaction that has not taken the lock,
+whose event id will be higher than every id already read. Checkpointing
+on event id is therefore safe even though ids are not handed out in
+commit order.
+
+Run from the backend directory:
+    python -m app.services.projections [--child ID] [--replay]
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+from decimal import Decimal
+import asyncio
+import copy
+import logging
+
+from app.config import settings
+from app.database import async_session_maker, close_db
+from app.models.models import (
+    Child, LiteracyProgress, NumeracyProgress, SelProgress, GameState,
+    LearningEvent, LearningEventType, ProjectionCheckpoint
+)
+from app.schemas.schemas import WordLevelEnum
+from app.services.literacy_service import LEVEL_MASTERED_COLUMNS, NEW_SCORE_WEIGHT
+from app.services.numeracy_service import (
+    score_subitizing, score_operation, apply_shape_attempt, SHAPES
+)
+from app.services.game_service import ACHIEVEMENTS, take_star_ledger
+
+logger = logging.getLogger(__name__)
+
+Reducer = Callable[[Dict[str, Any], Dict[str, Any], datetime], None]
+
+# (event id, event type, payload, occurred_at)
+EventRow = Tuple[int, str, Dict[str, Any], datetime]
+
+
+class Projection:
+    """
+    Folds events into the projected columns of one progress table.
+
+    State is a JSON-safe dict of column -> value. Reducers take
+    (state, payload, occurred_at) and update state in place.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        version: int,
+        model: Any,
+        initial: Dict[str, Any],
+        reducers: Dict[LearningEventType, Reducer]
+    ):
+        self.name = name
+        self.version = version
+        self.model = model
+        self.initial = initial
+        self.reducers = {event_type.value: reducer for event_type, reducer in reducers.items()}
+
+    def initial_state(self) -> Dict[str, Any]:
+        return copy.deepcopy(self.initial)
+
+    def state_from_row(self, row: Any) -> Dict[str, Any]:
+        """Snapshot a progress row's projected columns."""
+        state = {}
+        for column, default in self.initial.items():
+            value = getattr(row, column)
+            if value is None:
+                value = default
+            elif isinstance(value, Decimal):
+                value = float(value)
+            state[column] = copy.deepcopy(value)
+        return state
+
+    def write_row(self, row: Any, state: Dict[str, Any]) -> None:
+        for column in self.initial:
+            setattr(row, column, copy.deepcopy(state[column]))
+
+
+def _clamp_mastery(value: float) -> float:
+    """Same bounds as numeracy_service.clamped_mastery."""
+    return max(0.0, min(100.0, value))
+
+
+def _add_unique(values: List[str], value: str) -> None:
+    if value not in values:
+        values.append(value)
+
+
+# ============== Literacy ==============
+
+def _letter_traced(state, payload, occurred_at):
+    letter = payload["letter"].upper()
+    accuracy = payload["accuracy"] / 100
+    entry = state["letter_mastery"].get(letter)
+
+    if entry is None:
+        old_mastery, new_mastery, attempts = 0.0, accuracy, 1
+        state["letters_traced"] += 1
+        sound_known = False
+    else:
+        old_mastery = entry.get("mastery") or 0.0
+        new_mastery = min(
+            1.0, old_mastery * (1 - NEW_SCORE_WEIGHT) + accuracy * NEW_SCORE_WEIGHT
+        )
+        attempts = (entry.get("attempts") or 0) + 1
+        sound_known = entry.get("sound_known", False)
+
+    state["letter_mastery"][letter] = {
+        "traced": True,
+        "sound_known": sound_known,
+        "mastery": new_mastery,
+        "attempts": attempts,
+    }
+    state["letter_mastery_sum"] += new_mastery - old_mastery
+    state["tracing_accuracy"] = state["letter_mastery_sum"] * 100 / state["letters_traced"]
+
+
+def _word_mastered(state, payload, occurred_at):
+    state[LEVEL_MASTERED_COLUMNS[WordLevelEnum(payload["level"])]] += 1
+
+
+LITERACY = Projection(
+    "literacy", 1, LiteracyProgress,
+    {
+        "letter_mastery": {},
+        "letter_mastery_sum": 0.0,
+        "letters_traced": 0,
+        "tracing_accuracy": 0.0,
+        **{column: 0 for column in LEVEL_MASTERED_COLUMNS.values()},
+    },
+    {
+        LearningEventType.LETTER_TRACED: _letter_traced,
+        LearningEventType.WORD_MASTERED: _word_mastered,
+    }
+)
+
+
+# ============== Numeracy ==============
+
+def _subitizing_attempt(state, payload, occurred_at):
+    _, _, delta = score_subitizing(
+        payload["shown_count"], payload["guessed_count"], payload["response_time_ms"]
+    )
+    state["subitizing_mastery"] = _clamp_mastery(state["subitizing_mastery"] + delta)
+
+
+def _counting_attempt(state, payload, occurred_at):
+    if payload["reached_count"] >= payload["target_count"]:
+        state["counting_range"] = max(state["counting_range"], payload["target_count"])
+
+
+def _numeral_recognition(state, payload, occurred_at):
+    state["numeral_recognition"][str(payload["numeral"])] = payload["recognized"]
+
+
+def _operation_attempt(state, payload, occurred_at):
+    _, _, mastery_attr, delta = score_operation(
+        payload["operation"], payload["operand1"], payload["operand2"],
+        payload["answer"], payload["used_manipulatives"]
+    )
+    state[mastery_attr] = _clamp_mastery(state[mastery_attr] + delta)
+
+
+def _st_puzzle_attempt(state, payload, occurred_at):
+    if payload["completed"]:
+        state["st_puzzles_completed"] += 1
+        state["st_current_level"] = max(state["st_current_level"], payload["puzzle_level"] + 1)
+
+
+def _nooms_interaction(state, payload, occurred_at):
+    state["nooms_interactions"] += 1
+
+
+def _shape_recognition(state, payload, occurred_at):
+    shape = payload["shape"].lower()
+    if shape in SHAPES:
+        state["shape_counters"], state["shapes_seen"] = apply_shape_attempt(
+            state["shape_counters"], state["shapes_seen"], SHAPES.index(shape), payload["recognized"]
+        )
+
+
+NUMERACY = Projection(
+    "numeracy", 2, NumeracyProgress,
+    {
+        "subitizing_mastery": 0.0,
+        "counting_range": 0,
+        "numeral_recognition": {},
+        "addition_mastery": 0.0,
+        "subtraction_mastery": 0.0,
+        "multiplication_intro": 0.0,
+        "st_puzzles_completed": 0,
+        "st_current_level": 1,
+        "nooms_interactions": 0,
+        "shape_counters": 0,
+        "shapes_seen": 0,
+    },
+    {
+        LearningEventType.SUBITIZING_ATTEMPT: _subitizing_attempt,
+        LearningEventType.COUNTING_ATTEMPT: _counting_attempt,
+        LearningEventType.NUMERAL_RECOGNITION: _numeral_recognition,
+        LearningEventType.OPERATION_ATTEMPT: _operation_attempt,
+        LearningEventType.ST_PUZZLE_ATTEMPT: _st_puzzle_attempt,
+        LearningEventType.NOOMS_INTERACTION: _nooms_interaction,
+        LearningEventType.SHAPE_RECOGNITION: _shape_recognition,
+    }
+)
+
+
+# ============== SEL ==============
+
+def _feelings_wheel_used(state, payload, occurred_at):
+    state["feelings_wheel_uses"] += 1
+    _add_unique(state["emotions_identified"], payload["emotion"].lower())
+
+
+def _emotion_logged(state, payload, occurred_at):
+    _add_unique(state["emotions_identified"], payload["emotion"].lower())
+
+
+def _kindness_task_completed(state, payload, occurred_at):
+    state["kindness_bingo_completed"] += 1
+
+
+def _sharing_scenario(state, payload, occurred_at):
+    if payload["was_prosocial"]:
+        state["sharing_scenarios_passed"] += 1
+
+
+def _calm_down_technique_learned(state, payload, occurred_at):
+    _add_unique(state["calm_down_techniques_learned"], payload["technique"])
+
+
+SEL = Projection(
+    "sel", 1, SelProgress,
+    {
+        "feelings_wheel_uses": 0,
+        "emotions_identified": [],
+        "kindness_bingo_completed": 0,
+        "sharing_scenarios_passed": 0,
+        "calm_down_techniques_learned": [],
+    },
+    {
+        LearningEventType.FEELINGS_WHEEL_USED: _feelings_wheel_used,
+        LearningEventType.EMOTION_LOGGED: _emotion_logged,
+        LearningEventType.KINDNESS_TASK_COMPLETED: _kindness_task_completed,
+        LearningEventType.SHARING_SCENARIO: _sharing_scenario,
+        LearningEventType.CALM_DOWN_TECHNIQUE_LEARNED: _calm_down_technique_learned,
+    }
+)
+
+
+# ============== Game ==============
+
+def _stars_added(state, payload, occurred_at):
+    state["stars_earned"] += payload["stars"]
+
+
+def _achievement_unlocked(state, payload, occurred_at):
+    achievement_id = payload["achievement_id"]
+    if achievement_id in ACHIEVEMENTS and achievement_id not in state["achievements"]:
+        state["achievements"].append(achievement_id)
+        state["stars_earned"] += ACHIEVEMENTS[achievement_id]["stars"]
+
+
+# Streaks stay with the live code: they follow play-session timing, not events
+GAME = Projection(
+    "game", 1, GameState,
+    {
+        "stars_earned": 0,
+        "achievements": [],
+    },
+    {
+        LearningEventType.STARS_ADDED: _stars_added,
+        LearningEventType.ACHIEVEMENT_UNLOCKED: _achievement_unlocked,
+    }
+)
+
+
+PROJECTIONS = (LITERACY, NUMERACY, SEL, GAME)
+
+PROJECTIONS_BY_NAME = {projection.name: projection for projection in PROJECTIONS}
+
+PROJECTION_BY_EVENT = {
+    event_type: projection
+    for projection in PROJECTIONS
+    for event_type in projection.reducers
+}
+
+
+def initial_checkpoints(child_id: str) -> List[ProjectionCheckpoint]:
+    """Checkpoints for a new child, whose whole history will be in the log."""
+    return [
+        ProjectionCheckpoint(
+            child_id=child_id,
+            projection=projection.name,
+            version=projection.version,
+            state=projection.initial_state(),
+            last_event_id=0,
+            baseline=projection.initial_state(),
+            baseline_event_id=0
+        )
+        for projection in PROJECTIONS
+    ]
+
+
+def fold_events(
+    jobs: List[Tuple[str, Dict[str, Dict[str, Any]], List[EventRow]]]
+) -> List[Tuple[str, Dict[str, Dict[str, Any]]]]:
+    """
+    Fold events into per-child checkpoints (runs in worker processes).
+
+    Each job is (child_id, projection name -> {"state", "last_event_id"},
+    events in id order). Events at or before a projection's
+    last_event_id are skipped. Returns the updated checkpoints, with
+    "changed" set on those that folded at least one event.
+    """
+    results = []
+    for child_id, checkpoints, events in jobs:
+        for event_id, event_type, payload, occurred_at in events:
+            projection = PROJECTION_BY_EVENT.get(event_type)
+            checkpoint = checkpoints.get(projection.name) if projection else None
+            if checkpoint is None or event_id <= checkpoint["last_event_id"]:
+                continue
+            projection.reducers[event_type](checkpoint["state"], payload or {}, occurred_at)
+            checkpoint["last_event_id"] = event_id
+            checkpoint["changed"] = True
+        results.append((child_id, checkpoints))
+    return results
+
+
+class ProjectionService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def catch_up(
+        self,
+        child_ids: List[str],
+        replay: bool = False,
+        executor: Optional[Executor] = None
+    ) -> int:
+        """
+        Bring the children's projections up to date and write the
+        projected columns to their progress rows, in one transaction.
+
+        Folding starts from each checkpoint; with replay, or when a
+        projection's version changed, it starts again from the baseline.
+        Children without checkpoints (created before the event log) are
+        baselined from their current rows. With an executor, folding is
+        split across its workers. Returns the number of progress rows
+        written.
+        """
+        child_ids = sorted(set(child_ids))
+        if not child_ids:
+            return 0
+
+        # Lock progress rows first (fixed table and child order)
+        rows: Dict[Tuple[str, str], Any] = {}
+        for projection in PROJECTIONS:
+            result = await self.db.execute(
+                select(projection.model)
+                .where(projection.model.child_id.in_(child_ids))
+                .order_by(projection.model.child_id)
+                .with_for_update()
+            )
+            for row in result.scalars():
+                rows[(row.child_id, projection.name)] = row
+
+        # Stars still on ledger shards belong to the row they were awarded to
+        ledger = await take_star_ledger(self.db, child_ids)
+        for child_id, stars in ledger.items():
+            row = rows.get((child_id, GAME.name))
+            if row is not None:
+                row.stars_earned = (row.stars_earned or 0) + stars
+
+        result = await self.db.execute(
+            select(ProjectionCheckpoint).where(ProjectionCheckpoint.child_id.in_(child_ids))
+        )
+        stored = {(cp.child_id, cp.projection): cp for cp in result.scalars()}
+
+        # Latest event already reflected in rows that have no checkpoint yet
+        unseeded = {child_id for child_id, name in rows if (child_id, name) not in stored}
+        seed_ids: Dict[Tuple[str, str], int] = {}
+        if unseeded:
+            result = await self.db.execute(
+                select(LearningEvent.child_id, LearningEvent.event_type, func.max(LearningEvent.id))
+                .where(
+                    LearningEvent.child_id.in_(unseeded),
+                    LearningEvent.event_type.in_(PROJECTION_BY_EVENT)
+                )
+                .group_by(LearningEvent.child_id, LearningEvent.event_type)
+            )
+            for child_id, event_type, event_id in result.all():
+                key = (child_id, PROJECTION_BY_EVENT[event_type].name)
+                seed_ids[key] = max(seed_ids.get(key, 0), event_id)
+
+        checkpoints: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (child_id, name), row in rows.items():
+            projection = PROJECTIONS_BY_NAME[name]
+            cp = stored.get((child_id, name))
+
+            if cp is None:
+                cp = ProjectionCheckpoint(
+                    child_id=child_id,
+                    projection=name,
+                    version=projection.version,
+                    baseline=projection.state_from_row(row),
+                    baseline_event_id=seed_ids.get((child_id, name), 0)
+                )
+                self.db.add(cp)
+                stored[(child_id, name)] = cp
+                state, last_event_id = cp.baseline, cp.baseline_event_id
+            elif replay or cp.version != projection.version:
+                state, last_event_id = cp.baseline, cp.baseline_event_id
+            else:
+                state, last_event_id = cp.state, cp.last_event_id
+
+            checkpoints.setdefault(child_id, {})[name] = {
+                # Columns added to a projection since the state was stored start at defaults
+                "state": {**projection.initial_state(), **copy.deepcopy(state)},
+                "last_event_id": last_event_id,
+                "changed": replay or cp.state is None or cp.version != projection.version,
+            }
+
+        after_id = min(
+            checkpoint["last_event_id"]
+            for child in checkpoints.values() for checkpoint in child.values()
+        )
+        result = await self.db.execute(
+            select(
+                LearningEvent.child_id, LearningEvent.id, LearningEvent.event_type,
+                LearningEvent.payload, LearningEvent.occurred_at
+            )
+            .where(
+                LearningEvent.child_id.in_(list(checkpoints)),
+                LearningEvent.event_type.in_(PROJECTION_BY_EVENT),
+                LearningEvent.id > after_id
+            )
+            .order_by(LearningEvent.child_id, LearningEvent.id)
+        )
+        events: Dict[str, List[EventRow]] = {}
+        for child_id, *event in result.all():
+            events.setdefault(child_id, []).append(tuple(event))
+
+        jobs = [
+            (child_id, child_checkpoints, events.get(child_id, []))
+            for child_id, child_checkpoints in checkpoints.items()
+        ]
+        folded = await self._fold(jobs, executor)
+
+        written = 0
+        for child_id, child_checkpoints in folded:
+            for name, checkpoint in child_checkpoints.items():
+                if not checkpoint["changed"]:
+                    continue
+                projection = PROJECTIONS_BY_NAME[name]
+                projection.write_row(rows[(child_id, name)], checkpoint["state"])
+
+                cp = stored[(child_id, name)]
+                cp.version = projection.version
+                cp.state = checkpoint["state"]
+                cp.last_event_id = checkpoint["last_event_id"]
+                written += 1
+
+        await self.db.commit()
+        return written
+
+    async def _fold(self, jobs, executor: Optional[Executor]):
+        if executor is None or len(jobs) < 2:
+            return fold_events(jobs)
+
+        workers = max(1, settings.projection_workers)
+        size = (len(jobs) + workers - 1) // workers
+        loop = asyncio.get_running_loop()
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(executor, fold_events, jobs[start:start + size])
+            for start in range(0, len(jobs), size)
+        ))
+        return [result for part in parts for result in part]
+
+
+async def rebuild_all(replay: bool = False) -> int:
+    """
+    Catch up (or with replay, recompute) every child's projections.
+
+    Children are processed in id order, projection_batch_size per
+    transaction, with folding spread over projection_workers processes.
+    Returns the number of progress rows written.
+    """
+    executor = ProcessPoolExecutor(settings.projection_workers) \
+        if settings.projection_workers > 0 else None
+    written = 0
+    last_id = ""
+
+    try:
+        while True:
+            async with async_session_maker() as db:
+                result = await db.execute(
+                    select(Child.id)
+                    .where(Child.id > last_id)
+                    .order_by(Child.id)
+                    .limit(settings.projection_batch_size)
+                )
+                child_ids = result.scalars().all()
+                if not child_ids:
+                    break
+
+                written += await ProjectionService(db).catch_up(child_ids, replay, executor)
+                last_id = child_ids[-1]
+                logger.info(f"Projections caught up through child {last_id} ({written} rows written)")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebuild progress tables from the event log")
+    parser.add_argument("--child", help="Only this child id")
+    parser.add_argument("--replay", action="store_true", help="Replay from each baseline")
+    args = parser.parse_args()
+
+    async def _main():
+        try:
+            if args.child:
+                async with async_session_maker() as db:
+                    written = await ProjectionService(db).catch_up([args.child], args.replay)
+            else:
+                written = await rebuild_all(args.replay)
+            print(f"{written} progress rows written")
+        finally:
+            await close_db()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main())
@@ -4,11 +4,13 @@ Handles Social-Emotional Learning activities
 """
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from app.models.models import SelProgress, MilestoneEvent
+from app.models.models import SelProgress, MilestoneEvent, LearningEventType
 from app.schemas.schemas import EmotionLogEntry
+from app.services.event_log import append_event
+from app.services.write_coalescer import write_coalescer
 
 
 # Available emotions for the feelings wheel
@@ -45,18 +47,32 @@ class SelService:
     async def record_feelings_wheel(
         self, 
         child_id: str, 
-        emotion: str
+        emotion: str,
+        progress: Optional[SelProgress] = None
     ) -> Dict[str, Any]:
         """Record a feelings wheel interaction."""
-        progress = await self._get_progress(child_id)
+        if progress is None:
+            progress = await self._get_progress(child_id)
         if not progress:
             return {"error": "Progress not found"}
         
+        event = (LearningEventType.FEELINGS_WHEEL_USED, {"emotion": emotion})
+        emotions = list(progress.emotions_identified or [])
+        
+        if write_coalescer.enabled and emotion.lower() in emotions:
+            # Only the usage count changes; write it behind the request
+            write_coalescer.add(SelProgress, child_id, {"feelings_wheel_uses": 1}, event=event)
+            write_coalescer.overlay(progress)
+            return {
+                "emotion": emotion,
+                "total_emotions_identified": len(emotions),
+                "feelings_wheel_uses": progress.feelings_wheel_uses
+            }
+        
         # Increment usage count
         progress.feelings_wheel_uses += 1
         
         # Track unique emotions identified
-        emotions = progress.emotions_identified or []
         if emotion.lower() not in emotions:
             emotions.append(emotion.lower())
             progress.emotions_identified = emotions
@@ -71,7 +87,9 @@ class SelService:
                     ["Ask your child to show you the feelings wheel!"]
                 )
         
+        await append_event(self.db, child_id, *event)
         await self.db.commit()
+        write_coalescer.overlay(progress)
         
         return {
             "emotion": emotion,
@@ -82,18 +100,24 @@ class SelService:
     async def log_emotion(
         self, 
         child_id: str, 
-        entry: EmotionLogEntry
+        entry: EmotionLogEntry,
+        progress: Optional[SelProgress] = None
     ) -> Dict[str, Any]:
         """Log an emotion identification."""
-        progress = await self._get_progress(child_id)
+        if progress is None:
+            progress = await self._get_progress(child_id)
         if not progress:
             return {"error": "Progress not found"}
         
-        emotions = progress.emotions_identified or []
+        emotions = list(progress.emotions_identified or [])
         if entry.emotion.lower() not in emotions:
             emotions.append(entry.emotion.lower())
             progress.emotions_identified = emotions
         
+        await append_event(self.db, child_id, LearningEventType.EMOTION_LOGGED, {
+            "emotion": entry.emotion,
+            "intensity": entry.intensity
+        })
         await self.db.commit()
         
         return {
@@ -105,10 +129,12 @@ class SelService:
     async def complete_kindness_task(
         self, 
         child_id: str, 
-        task: str
+        task: str,
+        progress: Optional[SelProgress] = None
     ) -> Dict[str, Any]:
         """Record completion of a kindness bingo task."""
-        progress = await self._get_progress(child_id)
+        if progress is None:
+            progress = await self._get_progress(child_id)
         if not progress:
             return {"error": "Progress not found"}
         
@@ -127,6 +153,9 @@ class SelService:
                 ]
             )
         
+        await append_event(self.db, child_id, LearningEventType.KINDNESS_TASK_COMPLETED, {
+            "task": task
+        })
         await self.db.commit()
         
         return {
@@ -139,16 +168,23 @@ class SelService:
         child_id: str,
         scenario_id: str,
         response_chosen: str,
-        was_prosocial: bool
+        was_prosocial: bool,
+        progress: Optional[SelProgress] = None
     ) -> Dict[str, Any]:
         """Record response to a sharing scenario."""
-        progress = await self._get_progress(child_id)
+        if progress is None:
+            progress = await self._get_progress(child_id)
         if not progress:
             return {"error": "Progress not found"}
         
         if was_prosocial:
             progress.sharing_scenarios_passed += 1
         
+        await append_event(self.db, child_id, LearningEventType.SHARING_SCENARIO, {
+            "scenario_id": scenario_id,
+            "response_chosen": response_chosen,
+            "was_prosocial": was_prosocial
+        })
         await self.db.commit()
         
         return {
@@ -160,14 +196,16 @@ class SelService:
     async def learn_calm_down_technique(
         self, 
         child_id: str, 
-        technique: str
+        technique: str,
+        progress: Optional[SelProgress] = None
     ) -> Dict[str, Any]:
         """Record learning of a calm-down technique."""
-        progress = await self._get_progress(child_id)
+        if progress is None:
+            progress = await self._get_progress(child_id)
         if not progress:
             return {"error": "Progress not found"}
         
-        techniques = progress.calm_down_techniques_learned or []
+        techniques = list(progress.calm_down_techniques_learned or [])
         
         if technique not in techniques:
             techniques.append(technique)
@@ -186,6 +224,9 @@ class SelService:
                     ]
                 )
         
+        await append_event(self.db, child_id, LearningEventType.CALM_DOWN_TECHNIQUE_LEARNED, {
+            "technique": technique
+        })
         await self.db.commit()
         
         return {
@@ -199,6 +240,7 @@ class SelService:
         progress = await self._get_progress(child_id)
         if not progress:
             return {"error": "Progress not found"}
+        write_coalescer.overlay(progress)
         
         emotions = progress.emotions_identified or []
         
@@ -0,0 +1,283 @@
+"""
+WonderWorld Learning Adventure - Stroke Analysis Engine
+Server-side scoring of letter traces against reference letter paths
+
+Submitted strokes and reference glyphs are joined in stroke order,
+resampled to a fixed number of points by arc length and normalized to
+a unit box. Accuracy comes from the discrete Fréchet distance between
+the two paths, smoothness from how much more the trace's turning angle
+jitters than the reference's.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+import asyncio
+
+import numpy as np
+
+from app.config import settings
+
+
+RESAMPLE_POINTS = 64
+
+# Fréchet distance (unit box) scoring 100% and 0% accuracy
+FRECHET_PERFECT = 0.05
+FRECHET_FAIL = 0.45
+
+# Extra mean turning-angle change (radians) that scores 0% smoothness
+ROUGHNESS_FAIL = 1.5
+
+Point = Tuple[float, float]
+Glyph = List[List[Point]]
+
+
+# ============== Reference Glyphs ==============
+# Strokes in teaching order, y pointing down. Uppercase letters span
+# 0..1; lowercase letters sit on an x-height of 0.4..1 with ascenders
+# from 0 and descenders to 1.4.
+
+def _arc(cx: float, cy: float, rx: float, ry: float, start: float, end: float) -> List[Point]:
+    """Points along an elliptical arc; angles in degrees, 90 = down."""
+    steps = max(4, int(abs(end - start) / 15))
+    angles = np.radians(np.linspace(start, end, steps + 1))
+    return list(zip(cx + rx * np.cos(angles), cy + ry * np.sin(angles)))
+
+
+def _build_glyphs() -> Dict[str, Glyph]:
+    upper_o = _arc(0.5, 0.5, 0.5, 0.5, -90, -450)
+    upper_p = [(0, 0), (0.6, 0)] + _arc(0.6, 0.25, 0.25, 0.25, -90, 90) + [(0, 0.5)]
+    lower_bowl_left = _arc(0.45, 0.7, 0.3, 0.3, 0, -360)
+
+    return {
+        # Uppercase
+        "A": [[(0, 1), (0.5, 0)], [(0.5, 0), (1, 1)], [(0.25, 0.55), (0.75, 0.55)]],
+        "B": [
+            [(0, 0), (0, 1)],
+            [(0, 0), (0.55, 0)] + _arc(0.55, 0.25, 0.25, 0.25, -90, 90)
+            + [(0, 0.5), (0.6, 0.5)] + _arc(0.6, 0.75, 0.25, 0.25, -90, 90) + [(0, 1)],
+        ],
+        "C": [_arc(0.5, 0.5, 0.5, 0.5, -45, -315)],
+        "D": [[(0, 0), (0, 1)], [(0, 0), (0.5, 0)] + _arc(0.5, 0.5, 0.5, 0.5, -90, 90) + [(0, 1)]],
+        "E": [[(0, 0), (0, 1)], [(0, 0), (1, 0)], [(0, 0.5), (0.8, 0.5)], [(0, 1), (1, 1)]],
+        "F": [[(0, 0), (0, 1)], [(0, 0), (1, 0)], [(0, 0.5), (0.8, 0.5)]],
+        "G": [_arc(0.5, 0.5, 0.5, 0.5, -45, -360), [(0.55, 0.5), (1, 0.5)]],
+        "H": [[(0, 0), (0, 1)], [(1, 0), (1, 1)], [(0, 0.5), (1, 0.5)]],
+        "I": [[(0.5, 0), (0.5, 1)], [(0.2, 0), (0.8, 0)], [(0.2, 1), (0.8, 1)]],
+        "J": [[(0.8, 0), (0.8, 0.7)] + _arc(0.45, 0.7, 0.35, 0.3, 0, 180)],
+        "K": [[(0, 0), (0, 1)], [(1, 0), (0, 0.55)], [(0.25, 0.4), (1, 1)]],
+        "L": [[(0, 0), (0, 1), (1, 1)]],
+        "M": [[(0, 1), (0, 0), (0.5, 0.6), (1, 0), (1, 1)]],
+        "N": [[(0, 1), (0, 0), (1, 1), (1, 0)]],
+        "O": [upper_o],
+        "P": [[(0, 0), (0, 1)], upper_p],
+        "Q": [upper_o, [(0.6, 0.7), (1, 1)]],
+        "R": [[(0, 0), (0, 1)], upper_p, [(0.35, 0.5), (1, 1)]],
+        "S": [_arc(0.5, 0.25, 0.45, 0.25, -30, -270) + _arc(0.5, 0.75, 0.45, 0.25, -90, 150)],
+        "T": [[(0, 0), (1, 0)], [(0.5, 0), (0.5, 1)]],
+        "U": [[(0, 0), (0, 0.6)] + _arc(0.5, 0.6, 0.5, 0.4, 180, 0) + [(1, 0)]],
+        "V": [[(0, 0), (0.5, 1), (1, 0)]],
+        "W": [[(0, 0), (0.25, 1), (0.5, 0.3), (0.75, 1), (1, 0)]],
+        "X": [[(0, 0), (1, 1)], [(1, 0), (0, 1)]],
+        "Y": [[(0, 0), (0.5, 0.5)], [(1, 0), (0.5, 0.5), (0.5, 1)]],
+        "Z": [[(0, 0), (1, 0), (0, 1), (1, 1)]],
+        # Lowercase
+        "a": [_arc(0.45, 0.7, 0.3, 0.3, -20, -380), [(0.75, 0.4), (0.75, 1)]],
+        "b": [[(0, 0), (0, 1)], _arc(0.3, 0.7, 0.3, 0.3, 180, 540)],
+        "c": [_arc(0.5, 0.7, 0.3, 0.3, -45, -315)],
+        "d": [lower_bowl_left, [(0.75, 0), (0.75, 1)]],
+        "e": [[(0.2, 0.7)] + _arc(0.5, 0.7, 0.3, 0.3, 0, -315)],
+        "f": [_arc(0.6, 0.2, 0.2, 0.2, -20, -180) + [(0.4, 1)], [(0.2, 0.45), (0.7, 0.45)]],
+        "g": [lower_bowl_left, [(0.75, 0.4), (0.75, 1.2)] + _arc(0.45, 1.2, 0.3, 0.2, 0, 150)],
+        "h": [[(0, 0), (0, 1)], _arc(0.3, 0.7, 0.3, 0.3, 180, 360) + [(0.6, 1)]],
+        "i": [[(0.5, 0.4), (0.5, 1)], [(0.5, 0.2), (0.5, 0.22)]],
+        "j": [[(0.6, 0.4), (0.6, 1.2)] + _arc(0.35, 1.2, 0.25, 0.2, 0, 180), [(0.6, 0.2), (0.6, 0.22)]],
+        "k": [[(0, 0), (0, 1)], [(0.6, 0.4), (0.05, 0.75), (0.6, 1)]],
+        "l": [[(0.5, 0), (0.5, 1)]],
+        "m": [
+            [(0, 0.4), (0, 1)],
+            _arc(0.25, 0.65, 0.25, 0.25, 180, 360) + [(0.5, 1)],
+            _arc(0.75, 0.65, 0.25, 0.25, 180, 360) + [(1, 1)],
+        ],
+        "n": [[(0, 0.4), (0, 1)], _arc(0.3, 0.7, 0.3, 0.3, 180, 360) + [(0.6, 1)]],
+        "o": [_arc(0.5, 0.7, 0.3, 0.3, -90, -450)],
+        "p": [[(0, 0.4), (0, 1.4)], _arc(0.3, 0.7, 0.3, 0.3, 180, 540)],
+        "q": [lower_bowl_left, [(0.75, 0.4), (0.75, 1.4)]],
+        "r": [[(0, 0.4), (0, 1)], _arc(0.3, 0.7, 0.3, 0.3, 180, 300)],
+        "s": [_arc(0.5, 0.55, 0.25, 0.15, -30, -270) + _arc(0.5, 0.85, 0.25, 0.15, -90, 150)],
+        "t": [[(0.4, 0.1), (0.4, 1)], [(0.15, 0.4), (0.7, 0.4)]],
+        "u": [[(0, 0.4)] + _arc(0.3, 0.7, 0.3, 0.3, 180, 0), [(0.6, 0.4), (0.6, 1)]],
+        "v": [[(0, 0.4), (0.4, 1), (0.8, 0.4)]],
+        "w": [[(0, 0.4), (0.2, 1), (0.4, 0.6), (0.6, 1), (0.8, 0.4)]],
+        "x": [[(0, 0.4), (0.6, 1)], [(0.6, 0.4), (0, 1)]],
+        "y": [[(0, 0.4), (0.35, 1)], [(0.7, 0.4), (0.2, 1.4)]],
+        "z": [[(0, 0.4), (0.6, 0.4), (0, 1), (0.6, 1)]],
+    }
+
+
+# ============== Path Geometry ==============
+
+def resample(points: np.ndarray, count: int = RESAMPLE_POINTS) -> np.ndarray:
+    """Resample a polyline to evenly spaced points along its length."""
+    if len(points) == 1:
+        return np.repeat(points, count, axis=0)
+
+    segment = np.hypot(*np.diff(points, axis=0).T)
+    distance = np.concatenate(([0.0], np.cumsum(segment)))
+    if distance[-1] == 0:
+        return np.repeat(points[:1], count, axis=0)
+
+    targets = np.linspace(0.0, distance[-1], count)
+    return np.column_stack((
+        np.interp(targets, distance, points[:, 0]),
+        np.interp(targets, distance, points[:, 1]),
+    ))
+
+
+def normalize(points: np.ndarray) -> np.ndarray:
+    """Center on the bounding box and scale its longer side to 1."""
+    low, high = points.min(axis=0), points.max(axis=0)
+    size = float((high - low).max())
+    return (points - (low + high) / 2) / (size if size > 0 else 1.0)
+
+
+def prepare_path(strokes: Sequence[np.ndarray]) -> np.ndarray:
+    """Join strokes in order, resample and normalize."""
+    joined = np.concatenate([np.asarray(stroke, dtype=np.float64).reshape(-1, 2) for stroke in strokes])
+    return normalize(resample(joined))
+
+
+def discrete_frechet(p: np.ndarray, q: np.ndarray) -> float:
+    """
+    Discrete Fréchet distance between two point sequences.
+
+    The coupling table is filled one anti-diagonal at a time: every cell
+    on a diagonal depends only on the previous two diagonals, so each
+    diagonal is a single vectorized step.
+    """
+    d = np.hypot(*(p[:, np.newaxis, :] - q[np.newaxis, :, :]).transpose(2, 0, 1))
+    n, m = d.shape
+
+    ca = np.empty_like(d)
+    ca[:, 0] = np.maximum.accumulate(d[:, 0])
+    ca[0, :] = np.maximum.accumulate(d[0, :])
+
+    for k in range(2, n + m - 1):
+        i = np.arange(max(1, k - m + 1), min(n, k))
+        j = k - i
+        prev = np.minimum(np.minimum(ca[i - 1, j], ca[i, j - 1]), ca[i - 1, j - 1])
+        ca[i, j] = np.maximum(prev, d[i, j])
+
+    return float(ca[-1, -1])
+
+
+def roughness(path: np.ndarray) -> float:
+    """Mean change in turning angle along a resampled path."""
+    steps = np.diff(path, axis=0)
+    headings = np.arctan2(steps[:, 1], steps[:, 0])
+    turning = np.angle(np.exp(1j * np.diff(headings)))  # Wrap to [-pi, pi]
+    if len(turning) < 2:
+        return 0.0
+    return float(np.abs(np.diff(turning)).mean())
+
+
+# ============== Scoring ==============
+
+@lru_cache(maxsize=1)
+def reference_paths() -> Dict[str, Tuple[np.ndarray, float]]:
+    """Prepared reference path and roughness per glyph, built once."""
+    references = {}
+    for glyph, strokes in _build_glyphs().items():
+        path = prepare_path([np.array(stroke) for stroke in strokes])
+        references[glyph] = (path, roughness(path))
+    return references
+
+
+def warm_reference_paths() -> int:
+    """Precompute reference paths (call at startup). Returns glyph count."""
+    return len(reference_paths())
+
+
+def glyph_for(letter: str, is_uppercase: bool) -> str:
+    return letter.upper() if is_uppercase else letter.lower()
+
+
+def score_trace(
+    letter: str,
+    is_uppercase: bool,
+    strokes: Sequence[np.ndarray]
+) -> Optional[Tuple[float, float]]:
+    """
+    Score a trace against its reference glyph.
+
+    Returns (accuracy, smoothness) on 0-100, or None if there is no
+    reference for the letter or no points to score.
+    """
+    reference = reference_paths().get(glyph_for(letter, is_uppercase))
+    if reference is None or not strokes or sum(len(stroke) for stroke in strokes) == 0:
+        return None
+
+    reference_path, reference_roughness = reference
+    path = prepare_path(strokes)
+
+    distance = discrete_frechet(path, reference_path)
+    accuracy = 1 - (distance - FRECHET_PERFECT) / (FRECHET_FAIL - FRECHET_PERFECT)
+
+    excess = max(0.0, roughness(path) - reference_roughness)
+    smoothness = 1 - excess / ROUGHNESS_FAIL
+
+    return (
+        round(float(np.clip(accuracy, 0, 1)) * 100, 2),
+        round(float(np.clip(smoothness, 0, 1)) * 100, 2),
+    )
+
+
+def score_packed_traces(
+    traces: List[Tuple[str, bool, bytes]]
+) -> List[Optional[Tuple[float, float]]]:
+    """Score (letter, is_uppercase, packed stroke blob) items in order."""
+    from app.services.stroke_codec import decode_strokes
+
+    return [
+        score_trace(letter, is_uppercase, decode_strokes(blob))
+        for letter, is_uppercase, blob in traces
+    ]
+
+
+# ============== Batch Scoring Pool ==============
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if _pool is None and settings.stroke_analysis_workers > 0:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.stroke_analysis_workers,
+            initializer=warm_reference_paths
+        )
+    return _pool
+
+
+async def score_packed_traces_async(
+    traces: List[Tuple[str, bool, bytes]]
+) -> List[Optional[Tuple[float, float]]]:
+    """
+    Score a batch of packed traces.
+
+    Small batches run inline; bursts at or above the configured threshold
+    are sent to the process pool so they don't block the event loop.
+    """
+    pool = _get_pool() if len(traces) >= settings.stroke_analysis_pool_threshold else None
+    if pool is None:
+        return score_packed_traces(traces)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, score_packed_traces, traces)
+
+
+def shutdown_pool() -> None:
+    """Stop the batch scoring workers (call at shutdown)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,172 @@
+"""
+WonderWorld Learning Adventure - Stroke Sample Codec
+Compact binary encoding for tracing stroke points
+
+Layout (little-endian):
+    header   magic "WWST", version u8, flags u8, scale u16,
+             stroke_count u16, point_count u32, origin_x i32, origin_y i32
+    lengths  stroke_count x u16 (points per stroke)
+    payload  point_count x (dx i16, dy i16), zlib-compressed if FLAG_ZLIB
+
+Coordinates are quantized to 1/scale units. The first point is a delta
+from the origin, every other point a delta from the previous one (across
+stroke boundaries), so a typical trace fits in 4 bytes per point.
+"""
+from typing import List, Sequence, Tuple
+import base64
+import binascii
+import struct
+import zlib
+
+import numpy as np
+
+
+MAGIC = b"WWST"
+VERSION = 1
+FLAG_ZLIB = 0x01
+
+HEADER = struct.Struct("<4sBBHHIii")
+MAX_STROKES = 64
+MAX_POINTS = 20000
+DEFAULT_SCALE = 10  # 0.1 canvas units
+
+Strokes = List[np.ndarray]  # one (n, 2) float array per stroke
+
+
+class StrokeCodecError(ValueError):
+    """Raised when stroke samples can't be encoded or decoded."""
+
+
+def encode_strokes(
+    strokes: Sequence[Sequence[Sequence[float]]],
+    scale: int = DEFAULT_SCALE,
+    compress: bool = True
+) -> bytes:
+    """Pack strokes (lists of (x, y) points) into the binary format."""
+    arrays = [np.asarray(stroke, dtype=np.float64).reshape(-1, 2) for stroke in strokes]
+    lengths = [len(stroke) for stroke in arrays]
+    _check_counts(len(arrays), sum(lengths), lengths)
+
+    if not arrays or sum(lengths) == 0:
+        points = np.empty((0, 2), dtype=np.int64)
+    else:
+        points = np.rint(np.concatenate(arrays) * scale).astype(np.int64)
+
+    origin = points[0] if len(points) else np.zeros(2, dtype=np.int64)
+    deltas = np.diff(points, axis=0, prepend=origin[np.newaxis, :])
+    if deltas.size and (deltas.min() < -32768 or deltas.max() > 32767):
+        raise StrokeCodecError("Stroke step too large for the chosen scale")
+
+    payload = deltas.astype("<i2").tobytes()
+    flags = 0
+    if compress:
+        packed = zlib.compress(payload, 6)
+        if len(packed) < len(payload):
+            payload, flags = packed, FLAG_ZLIB
+
+    header = HEADER.pack(
+        MAGIC, VERSION, flags, scale, len(arrays), len(points),
+        int(origin[0]), int(origin[1])
+    )
+    return header + np.asarray(lengths, dtype="<u2").tobytes() + payload
+
+
+def decode_strokes(blob: bytes) -> Strokes:
+    """Unpack a blob into one (n, 2) float array per stroke."""
+    scale, lengths, origin, payload, flags = _parse(blob)
+    payload = _raw_payload(payload, flags, sum(lengths))
+
+    deltas = np.frombuffer(payload, dtype="<i2").reshape(-1, 2).astype(np.int64)
+    points = (np.cumsum(deltas, axis=0) + origin) / scale
+
+    bounds = np.cumsum(lengths)[:-1]
+    return np.split(points, bounds) if lengths else []
+
+
+def compact(blob: bytes) -> bytes:
+    """
+    Validate a client-encoded blob and return the smallest equivalent.
+
+    Only the header is parsed; the payload is recompressed when the
+    client sent it raw and compression helps.
+    """
+    scale, lengths, origin, payload, flags = _parse(blob)
+    _raw_payload(payload, flags, sum(lengths))
+
+    if flags & FLAG_ZLIB:
+        return blob
+
+    packed = zlib.compress(payload, 6)
+    if len(packed) >= len(payload):
+        return blob
+
+    header_size = HEADER.size + 2 * len(lengths)
+    header = bytearray(blob[:header_size])
+    header[5] = flags | FLAG_ZLIB
+    return bytes(header) + packed
+
+
+def from_base64(text: str) -> bytes:
+    """Decode a base64 upload and return it compacted."""
+    try:
+        blob = base64.b64decode(text, validate=True)
+    except (binascii.Error, ValueError) as exc:
+        raise StrokeCodecError("stroke_samples is not valid base64") from exc
+    return compact(blob)
+
+
+def strokes_to_lists(strokes: Strokes) -> List[List[List[float]]]:
+    """Convert decoded strokes to JSON-friendly nested lists."""
+    return [stroke.tolist() for stroke in strokes]
+
+
+def _parse(blob: bytes) -> Tuple[int, List[int], np.ndarray, bytes, int]:
+    if len(blob) < HEADER.size:
+        raise StrokeCodecError("Stroke data too short")
+
+    magic, version, flags, scale, stroke_count, point_count, ox, oy = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise StrokeCodecError("Not stroke data")
+    if version != VERSION:
+        raise StrokeCodecError(f"Unsupported stroke format version {version}")
+    if scale == 0:
+        raise StrokeCodecError("Stroke scale must be positive")
+
+    lengths_end = HEADER.size + 2 * stroke_count
+    if len(blob) < lengths_end:
+        raise StrokeCodecError("Stroke data too short")
+
+    lengths = np.frombuffer(blob, dtype="<u2", count=stroke_count, offset=HEADER.size).tolist()
+    _check_counts(stroke_count, point_count, lengths)
+
+    origin = np.array([ox, oy], dtype=np.int64)
+    return scale, lengths, origin, blob[lengths_end:], flags
+
+
+def _raw_payload(payload: bytes, flags: int, point_count: int) -> bytes:
+    """Inflate the payload if needed and check it matches the header."""
+    expected = point_count * 4
+    if flags & FLAG_ZLIB:
+        inflater = zlib.decompressobj()
+        try:
+            # Bounded, so a crafted payload can't inflate past the header's size
+            payload = inflater.decompress(payload, expected + 1)
+        except zlib.error as exc:
+            raise StrokeCodecError("Corrupt stroke payload") from exc
+        if not inflater.eof:
+            raise StrokeCodecError("Stroke payload size does not match header")
+
+    if len(payload) != expected:
+        raise StrokeCodecError("Stroke payload size does not match header")
+    return payload
+
+
+def _check_counts(stroke_count: int, point_count: int, lengths: List[int]) -> None:
+    if stroke_count > MAX_STROKES:
+        raise StrokeCodecError(f"At most {MAX_STROKES} strokes allowed")
+    if point_count > MAX_POINTS:
+        raise StrokeCodecError(f"At most {MAX_POINTS} points allowed")
+    if sum(lengths) != point_count:
+        raise StrokeCodecError("Stroke lengths do not add up to point count")
+    if any(length > 65535 for length in lengths):
+        raise StrokeCodecError("Stroke too long")
@@ -0,0 +1,172 @@
+"""
+WonderWorld Learning Adventure - Word Bank Cache
+Process-local, versioned snapshot of the static word bank
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from pydantic import TypeAdapter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import asyncio
+import hashlib
+import time
+
+from app.config import settings
+from app.models.models import Word
+from app.schemas.schemas import WordResponse, WordLevelEnum, AgeGroupEnum
+
+
+# Age groups in ascending order, matching the database enum ordering
+AGE_ORDER = {age: index for index, age in enumerate(AgeGroupEnum)}
+
+_word_list_adapter = TypeAdapter(List[WordResponse])
+
+# (level, category, word_family, age_group, limit)
+CatalogKey = Tuple[
+    Optional[WordLevelEnum], Optional[str], Optional[str], Optional[AgeGroupEnum], int
+]
+
+
+def _build_index(words: List[WordResponse], key_fn) -> Dict[object, np.ndarray]:
+    """Map each key to the sorted positions of the words carrying it."""
+    positions: Dict[object, List[int]] = {}
+    for position, word in enumerate(words):
+        for key in key_fn(word):
+            positions.setdefault(key, []).append(position)
+    return {key: np.array(ids, dtype=np.int32) for key, ids in positions.items()}
+
+
+class WordBankSnapshot:
+    """
+    Immutable copy of the active words, grouped by level.
+
+    The version is a content hash, so it only changes when the word bank
+    itself does and can be used as a cache key or ETag.
+    """
+
+    def __init__(self, words: List[WordResponse]):
+        # Words arrive sorted by difficulty; positions in this list are the
+        # small integer ids used by the indexes, so sorted ids keep that order
+        self.words = words
+        self.by_level: Dict[WordLevelEnum, List[WordResponse]] = {
+            level: [] for level in WordLevelEnum
+        }
+        for word in words:
+            self.by_level[word.level].append(word)
+
+        digest = hashlib.sha256()
+        for word in words:
+            digest.update(word.model_dump_json().encode("utf-8"))
+        self.version = digest.hexdigest()[:16]
+
+        self._all_ids = np.arange(len(words), dtype=np.int32)
+        self._level_index = _build_index(words, lambda w: [w.level])
+        self._category_index = _build_index(words, lambda w: [w.category] if w.category else [])
+        self._family_index = _build_index(words, lambda w: [w.word_family] if w.word_family else [])
+        # A word is listed under every age group its range covers
+        self._age_index = _build_index(words, lambda w: [
+            age for age, order in AGE_ORDER.items()
+            if AGE_ORDER[w.age_group_min] <= order <= AGE_ORDER[w.age_group_max]
+        ])
+        self._responses: Dict[CatalogKey, bytes] = {}
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+    def count(self, level: WordLevelEnum) -> int:
+        return len(self.by_level[level])
+
+    def filter_ids(
+        self,
+        level: Optional[WordLevelEnum] = None,
+        category: Optional[str] = None,
+        word_family: Optional[str] = None,
+        age_group: Optional[AgeGroupEnum] = None
+    ) -> np.ndarray:
+        """Intersect the index entries for the given filters (difficulty order)."""
+        empty = np.empty(0, dtype=np.int32)
+        selected = [
+            index.get(key, empty)
+            for index, key in (
+                (self._level_index, level),
+                (self._category_index, category),
+                (self._family_index, word_family),
+                (self._age_index, age_group),
+            )
+            if key is not None
+        ]
+        if not selected:
+            return self._all_ids
+
+        # Start from the smallest set to keep intersections cheap
+        selected.sort(key=len)
+        ids = selected[0]
+        for other in selected[1:]:
+            ids = np.intersect1d(ids, other, assume_unique=True)
+        return ids
+
+    def render(
+        self,
+        level: Optional[WordLevelEnum] = None,
+        category: Optional[str] = None,
+        word_family: Optional[str] = None,
+        age_group: Optional[AgeGroupEnum] = None,
+        limit: int = 50
+    ) -> bytes:
+        """Serialized JSON list of matching words, cached per filter key."""
+        key = (level, category, word_family, age_group, limit)
+        body = self._responses.get(key)
+        if body is not None:
+            return body
+
+        ids = self.filter_ids(level, category, word_family, age_group)[:limit]
+        body = _word_list_adapter.dump_json([self.words[i] for i in ids])
+
+        # Free-text filters can take any value; only cache known keys
+        if (category is None or category in self._category_index) and \
+                (word_family is None or word_family in self._family_index):
+            self._responses[key] = body
+        return body
+
+
+class WordBank:
+    """
+    Serves the word bank from memory, reloading it after a TTL.
+
+    Words are seeded content that rarely changes, so every request
+    reading the full bank shares one snapshot instead of querying it.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[WordBankSnapshot] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self, db: AsyncSession) -> WordBankSnapshot:
+        """Return the current snapshot, loading it if missing or stale."""
+        if self._snapshot is not None and self._expires_at > time.monotonic():
+            return self._snapshot
+
+        async with self._lock:
+            # Another request may have reloaded while we waited
+            if self._snapshot is None or self._expires_at <= time.monotonic():
+                self._snapshot = await self._load(db)
+                self._expires_at = time.monotonic() + self.ttl_seconds
+
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        """Force a reload on the next read (e.g. after editing words)."""
+        self._expires_at = 0.0
+
+    async def _load(self, db: AsyncSession) -> WordBankSnapshot:
+        result = await db.execute(
+            select(Word).where(Word.is_active == True).order_by(Word.difficulty, Word.word)
+        )
+        words = [WordResponse.model_validate(word) for word in result.scalars().all()]
+        return WordBankSnapshot(words)
+
+
+word_bank = WordBank(ttl_seconds=settings.word_bank_ttl_seconds)
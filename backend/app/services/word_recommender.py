@@ -0,0 +1,122 @@
+"""
+WonderWorld Learning Adventure - Word Recommender
+Picks the words a child can decode next from phoneme bitsets
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.word_bank import WordBankSnapshot
+
+
+# Set bits per byte value, for popcount over uint64 masks
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Count set bits per row of a (n, chunks) uint64 mask array."""
+    as_bytes = masks.view(np.uint8).reshape(masks.shape[0], -1)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=1, dtype=np.int32)
+
+
+class WordRecommender:
+    """
+    Phoneme and word-family bitsets for one word bank snapshot.
+
+    Every phoneme in the bank gets a bit; each word's phonemes become a
+    row of uint64 chunks. Checking which words use only phonemes a child
+    already knows is then a vectorized AND over all words at once.
+    """
+
+    def __init__(self, snapshot: WordBankSnapshot):
+        self.snapshot = snapshot
+        words = snapshot.words
+
+        self.phonemes: List[str] = sorted({
+            phoneme.lower() for word in words for phoneme in word.phonemes
+        })
+        self.phoneme_bits: Dict[str, int] = {
+            phoneme: bit for bit, phoneme in enumerate(self.phonemes)
+        }
+        self.chunks = max(1, (len(self.phonemes) + 63) // 64)
+
+        self.masks = np.zeros((len(words), self.chunks), dtype=np.uint64)
+        for position, word in enumerate(words):
+            self.masks[position] = self.mask_of(word.phonemes)
+
+        families = sorted({word.word_family for word in words if word.word_family})
+        self.family_ids: Dict[str, int] = {family: index for index, family in enumerate(families)}
+        self.word_family = np.array(
+            [self.family_ids.get(word.word_family, -1) for word in words], dtype=np.int32
+        )
+
+        self.positions: Dict[str, int] = {word.id: position for position, word in enumerate(words)}
+
+    def mask_of(self, phonemes: Iterable[str]) -> np.ndarray:
+        """Bitset of the given phonemes (unknown phonemes are ignored)."""
+        mask = np.zeros(self.chunks, dtype=np.uint64)
+        for phoneme in phonemes:
+            bit = self.phoneme_bits.get(phoneme.lower())
+            if bit is not None:
+                mask[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        return mask
+
+    def phonemes_in(self, mask: np.ndarray) -> List[str]:
+        return [
+            phoneme for phoneme, bit in self.phoneme_bits.items()
+            if int(mask[bit // 64]) >> (bit % 64) & 1
+        ]
+
+    def recommend(
+        self,
+        mastered_word_ids: Iterable[str],
+        limit: int = 10,
+        max_new_phonemes: int = 1
+    ) -> List[Tuple[int, np.ndarray, bool]]:
+        """
+        Rank unmastered words by how easily the child can decode them.
+
+        Known phonemes are those of the mastered words. Words needing the
+        fewest new phonemes come first, then words from a family the child
+        has already mastered a word of, then easier words. Words needing
+        more than max_new_phonemes are skipped unless the child knows no
+        phonemes yet. Returns (position, new phoneme mask, in known family).
+        """
+        mastered = np.array(
+            [self.positions[word_id] for word_id in mastered_word_ids if word_id in self.positions],
+            dtype=np.int64
+        )
+
+        known = np.bitwise_or.reduce(self.masks[mastered], axis=0) if len(mastered) else \
+            np.zeros(self.chunks, dtype=np.uint64)
+        new_masks = self.masks & ~known
+        new_counts = popcount(new_masks)
+
+        known_families = np.unique(self.word_family[mastered]) if len(mastered) else np.empty(0)
+        in_known_family = np.isin(self.word_family, known_families[known_families >= 0])
+
+        candidates = np.ones(len(self.masks), dtype=bool)
+        candidates[mastered] = False
+        if known.any():
+            candidates &= new_counts <= max_new_phonemes
+
+        positions = np.flatnonzero(candidates)
+        # Positions are in difficulty order, so they break the final ties
+        order = np.lexsort((positions, ~in_known_family[positions], new_counts[positions]))
+        chosen = positions[order[:limit]]
+
+        return [
+            (int(position), new_masks[position], bool(in_known_family[position]))
+            for position in chosen
+        ]
+
+
+_recommender: Optional[WordRecommender] = None
+
+
+def recommender_for(snapshot: WordBankSnapshot) -> WordRecommender:
+    """Recommender for a snapshot, rebuilt only when the word bank changes."""
+    global _recommender
+    if _recommender is None or _recommender.snapshot.version != snapshot.version:
+        _recommender = WordRecommender(snapshot)
+    return _recommender
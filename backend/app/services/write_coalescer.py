@@ -0,0 +1,187 @@
+"""
+WonderWorld Learning Adventure - Write Coalescer
+Write-behind aggregation of counter increments on hot progress rows
+"""
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.models import GameState, LearningEventType
+from app.services.event_log import append_events
+
+logger = logging.getLogger(__name__)
+
+# (progress model, child_id)
+PendingKey = Tuple[Any, str]
+PendingEvent = Tuple[LearningEventType, Dict[str, Any]]
+
+
+class PendingWrites:
+    """Counter deltas and progress events waiting for one progress row."""
+
+    def __init__(self):
+        self.deltas: Dict[str, int] = {}
+        self.events: List[PendingEvent] = []
+
+    def merge(self, newer: "PendingWrites") -> None:
+        """Fold in writes queued after these ones."""
+        for column, delta in newer.deltas.items():
+            self.deltas[column] = self.deltas.get(column, 0) + delta
+        self.events.extend(newer.events)
+
+
+class WriteCoalescer:
+    """
+    Aggregates counter increments per progress row in memory and writes
+    them behind the request.
+
+    add() only records the delta, so a burst of tiny updates (stars,
+    Nooms taps, feelings wheel spins) costs no commit per request. Every
+    window_ms the background task applies all pending deltas as
+    col = col + delta UPDATEs and appends their events, in one
+    transaction. Reads see their own writes by passing loaded rows
+    through overlay(); a batch being flushed stays visible to them until
+    its transaction commits. stop() flushes what is left at shutdown.
+
+    Pending writes live in this process only, so they are lost if it
+    crashes, and other processes see them once flushed.
+    """
+
+    def __init__(self, window_ms: int, enabled: bool):
+        self.window = window_ms / 1000
+        self.enabled = enabled
+        self._pending: Dict[PendingKey, PendingWrites] = {}
+        # Batch being written by flush(), until it commits
+        self._in_flight: Dict[PendingKey, PendingWrites] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+
+    def add(
+        self,
+        model: Any,
+        child_id: str,
+        deltas: Dict[str, int],
+        event: Optional[PendingEvent] = None
+    ) -> None:
+        """Queue counter deltas (and their event) for a child's row."""
+        pending = self._pending.setdefault((model, child_id), PendingWrites())
+        for column, delta in deltas.items():
+            pending.deltas[column] = pending.deltas.get(column, 0) + delta
+        if event is not None:
+            pending.events.append(event)
+
+    def pending(self, model: Any, child_id: str) -> Dict[str, int]:
+        """Deltas not yet committed for a child's row."""
+        deltas: Dict[str, int] = {}
+        for writes in (self._in_flight, self._pending):
+            pending = writes.get((model, child_id))
+            if pending is not None:
+                for column, delta in pending.deltas.items():
+                    deltas[column] = deltas.get(column, 0) + delta
+        return deltas
+
+    def overlay(self, *rows: Any) -> None:
+        """
+        Add pending deltas to loaded progress rows (read-your-writes).
+
+        Values are set as committed state, so the rows are not marked
+        dirty and a later commit does not write them back.
+        """
+        for row in rows:
+            if row is None:
+                continue
+            for column, delta in self.pending(type(row), row.child_id).items():
+                set_committed_value(row, column, (getattr(row, column) or 0) + delta)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write all pending deltas."""
+        if self._task is not None:
+            self._stopping.set()
+            await self._task
+            self._task = None
+
+        if self._pending and not await self.flush():
+            logger.error(f"Dropping pending writes for {len(self._pending)} rows at shutdown")
+
+    async def flush(self) -> bool:
+        """Write every pending delta in one transaction. Returns False on error."""
+        async with self._flush_lock:
+            if not self._pending:
+                return True
+
+            batch, self._pending = self._pending, {}
+            self._in_flight = batch
+
+            # One executemany per table; rows are always locked in the same
+            # order, progress tables before game_states (which achievement
+            # unlocks lock after the progress row), so flushes cannot deadlock
+            by_model: Dict[Any, Dict[str, PendingWrites]] = {}
+            for (model, child_id), pending in batch.items():
+                by_model.setdefault(model, {})[child_id] = pending
+
+            try:
+                async with async_session_maker() as session:
+                    for model in sorted(by_model, key=lambda m: (m is GameState, m.__tablename__)):
+                        rows = by_model[model]
+                        table = model.__table__
+                        columns = sorted({column for pending in rows.values() for column in pending.deltas})
+                        if not columns:
+                            continue
+                        statement = (
+                            update(table)
+                            .where(table.c.child_id == bindparam("_child_id"))
+                            .values({column: table.c[column] + bindparam(f"_{column}") for column in columns})
+                        )
+                        await session.execute(statement, [
+                            {
+                                "_child_id": child_id,
+                                **{f"_{column}": rows[child_id].deltas.get(column, 0) for column in columns}
+                            }
+                            for child_id in sorted(rows)
+                        ])
+                    # Events follow their row's update, as append_events expects
+                    for (model, child_id), pending in batch.items():
+                        await append_events(session, child_id, pending.events)
+                    await session.commit()
+                    # Reads now find the deltas in the rows
+                    self._in_flight = {}
+            except Exception:
+                logger.exception(f"Failed to write pending deltas for {len(batch)} rows")
+                self._in_flight = {}
+                # Keep them for the next attempt, ahead of newer writes
+                for key, pending in batch.items():
+                    newer = self._pending.get(key)
+                    if newer is not None:
+                        pending.merge(newer)
+                    self._pending[key] = pending
+                return False
+
+            return True
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.window)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping.is_set():
+                break
+            if not await self.flush():
+                # Back off before retrying a failing database
+                await asyncio.sleep(self.window)
+
+
+write_coalescer = WriteCoalescer(
+    window_ms=settings.write_coalescing_window_ms,
+    enabled=settings.write_coalescing_enabled
+)
@@ -0,0 +1,48 @@
+"""
+WonderWorld Learning Adventure - Test Fixtures
+Tests that need PostgreSQL are skipped unless DATABASE_URL is set
+"""
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from app.database import engine, async_session_maker, init_db
+from app.models.models import Child, LiteracyProgress, NumeracyProgress, SelProgress, GameState
+from app.services.event_log import ensure_event_partitions
+
+
+@pytest_asyncio.fixture
+async def database():
+    """Tables and event partitions on the DATABASE_URL database."""
+    if not os.environ.get("DATABASE_URL"):
+        pytest.skip("DATABASE_URL is not set")
+    await init_db()
+    await ensure_event_partitions()
+    yield
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def child_id(database):
+    """A child with empty progress rows, deleted after the test."""
+    async with async_session_maker() as db:
+        child = Child(display_name="Test", device_id="test-device")
+        db.add(child)
+        await db.flush()
+        db.add_all([
+            LiteracyProgress(child_id=child.id),
+            NumeracyProgress(child_id=child.id),
+            SelProgress(child_id=child.id),
+            GameState(child_id=child.id, stars_earned=0),
+        ])
+        await db.commit()
+        child_id = child.id
+
+    yield child_id
+
+    async with async_session_maker() as db:
+        await db.execute(delete(Child).where(Child.id == child_id))
+        await db.commit()
@@ -0,0 +1,102 @@
+"""
+Concurrent numeracy attempts must not lose increments
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.orm import undefer
+
+from app.database import async_session_maker
+from app.models.models import NumeracyProgress, LearningEvent, LearningEventType
+from app.services import fact_fluency
+from app.services.numeracy_service import NumeracyService, MASTERY_MIN, MASTERY_MAX
+
+ATTEMPTS = 25
+
+
+async def _concurrently(count, attempt):
+    """Run count attempts at once, each in its own session like a request."""
+    async def one():
+        async with async_session_maker() as db:
+            return await attempt(NumeracyService(db))
+    return await asyncio.gather(*[one() for _ in range(count)])
+
+
+async def _progress(child_id):
+    async with async_session_maker() as db:
+        return await db.scalar(
+            select(NumeracyProgress)
+            .where(NumeracyProgress.child_id == child_id)
+            .options(undefer(NumeracyProgress.fact_matrix))
+        )
+
+
+async def _event_count(child_id, event_type):
+    async with async_session_maker() as db:
+        return await db.scalar(
+            select(func.count()).select_from(LearningEvent).where(
+                LearningEvent.child_id == child_id,
+                LearningEvent.event_type == event_type.value
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_subitizing_keeps_every_increment(child_id):
+    # Correct, fast, small count: +2.0 each
+    results = await _concurrently(
+        ATTEMPTS, lambda s: s.record_subitizing(child_id, 3, 3, 500)
+    )
+
+    assert all("error" not in result for result in results)
+    progress = await _progress(child_id)
+    assert progress.subitizing_mastery == pytest.approx(2.0 * ATTEMPTS)
+    assert await _event_count(child_id, LearningEventType.SUBITIZING_ATTEMPT) == ATTEMPTS
+
+
+@pytest.mark.asyncio
+async def test_concurrent_subitizing_mastery_is_clamped(child_id):
+    await _concurrently(60, lambda s: s.record_subitizing(child_id, 3, 3, 500))
+    assert (await _progress(child_id)).subitizing_mastery == MASTERY_MAX
+
+    # Wrong answers: -0.5 each, never below the minimum
+    await _concurrently(ATTEMPTS, lambda s: s.record_subitizing(child_id, 3, 4, 500))
+    assert (await _progress(child_id)).subitizing_mastery == pytest.approx(MASTERY_MAX - 0.5 * ATTEMPTS)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_wrong_answers_stop_at_minimum(child_id):
+    await _concurrently(ATTEMPTS, lambda s: s.record_subitizing(child_id, 5, 2, 500))
+    assert (await _progress(child_id)).subitizing_mastery == MASTERY_MIN
+
+
+@pytest.mark.asyncio
+async def test_concurrent_operations_keep_every_increment(child_id):
+    # Correct without manipulatives: +1.5 each
+    results = await _concurrently(
+        ATTEMPTS, lambda s: s.record_operation(child_id, "addition", 2, 3, 5, 800, False)
+    )
+
+    assert all(result["is_correct"] for result in results)
+    progress = await _progress(child_id)
+    assert progress.addition_mastery == pytest.approx(1.5 * ATTEMPTS)
+    assert progress.subtraction_mastery == 0
+
+    matrix = fact_fluency.decode_matrix(progress.fact_matrix)
+    index = fact_fluency.fact_index("addition", 2, 3)
+    assert matrix[index][fact_fluency.ATTEMPTS] == ATTEMPTS
+    assert await _event_count(child_id, LearningEventType.OPERATION_ATTEMPT) == ATTEMPTS
+
+
+@pytest.mark.asyncio
+async def test_concurrent_operations_mastery_is_clamped(child_id):
+    await _concurrently(
+        80, lambda s: s.record_operation(child_id, "subtraction", 9, 4, 5, 800, False)
+    )
+    assert (await _progress(child_id)).subtraction_mastery == MASTERY_MAX
+
+    await _concurrently(
+        ATTEMPTS, lambda s: s.record_operation(child_id, "multiplication", 3, 4, 11, 800, True)
+    )
+    assert (await _progress(child_id)).multiplication_intro == MASTERY_MIN
@@ -0,0 +1,107 @@
+"""
+Concurrent star awards and achievement unlocks must total exactly
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import select, func
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.models import (
+    GameState, StarLedgerShard, MilestoneEvent, LearningEvent, LearningEventType
+)
+from app.services.achievement_engine import ACHIEVEMENTS
+from app.services.game_service import GameService
+
+AWARDS = 60
+UNLOCKS = 10
+
+
+async def _concurrently(count, call):
+    """Run count calls at once, each in its own session like a request."""
+    async def one():
+        async with async_session_maker() as db:
+            return await call(GameService(db))
+    return await asyncio.gather(*[one() for _ in range(count)])
+
+
+async def _scalar(query):
+    async with async_session_maker() as db:
+        return await db.scalar(query)
+
+
+async def _stars_earned(child_id):
+    return await _scalar(select(GameState.stars_earned).where(GameState.child_id == child_id))
+
+
+async def _event_count(child_id, event_type):
+    return await _scalar(
+        select(func.count()).select_from(LearningEvent).where(
+            LearningEvent.child_id == child_id,
+            LearningEvent.event_type == event_type.value
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_direct_awards_total_exactly(child_id, monkeypatch):
+    monkeypatch.setattr(settings, "star_ledger_shards", 0)
+
+    results = await _concurrently(AWARDS, lambda game: game.add_stars(child_id, 1))
+
+    # Every award saw its own increment
+    assert sorted(result["total_stars"] for result in results) == list(range(1, AWARDS + 1))
+    assert await _stars_earned(child_id) == AWARDS
+    assert await _event_count(child_id, LearningEventType.STARS_ADDED) == AWARDS
+
+
+@pytest.mark.asyncio
+async def test_concurrent_ledger_awards_total_exactly_and_fold(child_id, monkeypatch):
+    monkeypatch.setattr(settings, "star_ledger_shards", 4)
+
+    results = await _concurrently(AWARDS, lambda game: game.add_stars(child_id, 2))
+
+    # Each response sums the shards committed so far, so only the
+    # stored total is exact
+    assert all(2 <= result["total_stars"] <= 2 * AWARDS for result in results)
+    assert await _stars_earned(child_id) == 0
+    shard_count = await _scalar(
+        select(func.count()).select_from(StarLedgerShard).where(StarLedgerShard.child_id == child_id)
+    )
+    assert 1 <= shard_count <= 4
+    async with async_session_maker() as db:
+        assert await GameService(db).get_total_stars(child_id) == 2 * AWARDS
+
+    monkeypatch.setattr(settings, "star_ledger_shards", 0)
+    async with async_session_maker() as db:
+        assert await GameService(db).fold_star_ledger() >= 1
+
+    assert await _stars_earned(child_id) == 2 * AWARDS
+    assert await _scalar(
+        select(func.count()).select_from(StarLedgerShard).where(StarLedgerShard.child_id == child_id)
+    ) == 0
+    assert await _event_count(child_id, LearningEventType.STARS_ADDED) == AWARDS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ledger_shards", [0, 4])
+async def test_racing_unlocks_award_once(child_id, monkeypatch, ledger_shards):
+    monkeypatch.setattr(settings, "star_ledger_shards", ledger_shards)
+    achievement_stars = ACHIEVEMENTS["first_word"]["stars"]
+
+    unlocks, awards = await asyncio.gather(
+        _concurrently(UNLOCKS, lambda game: game.unlock_achievement(child_id, "first_word")),
+        _concurrently(AWARDS, lambda game: game.add_stars(child_id, 1)),
+    )
+
+    assert sorted(unlock.stars_reward for unlock in unlocks) == [0] * (UNLOCKS - 1) + [achievement_stars]
+    async with async_session_maker() as db:
+        assert await GameService(db).get_total_stars(child_id) == AWARDS + achievement_stars
+        game_state = await db.scalar(select(GameState).where(GameState.child_id == child_id))
+        assert game_state.achievements == ["first_word"]
+
+    assert await _scalar(
+        select(func.count()).select_from(MilestoneEvent).where(MilestoneEvent.child_id == child_id)
+    ) == 1
+    assert await _event_count(child_id, LearningEventType.ACHIEVEMENT_UNLOCKED) == 1
@@ -0,0 +1,102 @@
+"""
+The mastered-word counter repair job must match word_progress
+"""
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update, delete, func
+
+from app.database import async_session_maker
+from app.models.models import AgeGroup, LiteracyProgress, Word, WordLevel, WordProgress
+from app.services.literacy_service import LiteracyService, LEVEL_MASTERED_COLUMNS
+
+# Words per level, and how many of them the child has mastered
+WORDS = {
+    WordLevel.TWO_LETTER: (3, 2),
+    WordLevel.THREE_LETTER: (4, 0),
+    WordLevel.FOUR_LETTER: (2, 2),
+    WordLevel.FIVE_LETTER: (5, 1),
+}
+
+
+@pytest_asyncio.fixture
+async def words(database):
+    """Throwaway words for every level, deleted after the test."""
+    async with async_session_maker() as db:
+        created = {
+            level: [
+                Word(
+                    word=f"t{uuid.uuid4().hex[:12]}",
+                    level=level,
+                    age_group_min=AgeGroup.AGE_4_5,
+                    age_group_max=AgeGroup.AGE_6_7
+                )
+                for _ in range(total)
+            ]
+            for level, (total, _) in WORDS.items()
+        }
+        db.add_all([word for level_words in created.values() for word in level_words])
+        await db.commit()
+        word_ids = {level: [word.id for word in level_words] for level, level_words in created.items()}
+
+    yield word_ids
+
+    async with async_session_maker() as db:
+        all_ids = [word_id for ids in word_ids.values() for word_id in ids]
+        await db.execute(delete(Word).where(Word.id.in_(all_ids)))
+        await db.commit()
+
+
+async def _counter_values(child_id):
+    async with async_session_maker() as db:
+        row = (await db.execute(
+            select(*(getattr(LiteracyProgress, attr) for attr in LEVEL_MASTERED_COLUMNS.values()))
+            .where(LiteracyProgress.child_id == child_id)
+        )).one()
+        return dict(zip(LEVEL_MASTERED_COLUMNS, row))
+
+
+async def _mastered_counts(child_id):
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(Word.level, func.count())
+            .select_from(WordProgress)
+            .join(Word, Word.id == WordProgress.word_id)
+            .where(WordProgress.child_id == child_id, WordProgress.is_mastered == True)
+            .group_by(Word.level)
+        )
+        counts = {level.value: count for level, count in result.all()}
+    return {level: counts.get(level.value, 0) for level in LEVEL_MASTERED_COLUMNS}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("one_child", [True, False])
+async def test_rebuild_words_mastered_counts_matches_word_progress(child_id, words, one_child):
+    async with async_session_maker() as db:
+        for level, (_, mastered) in WORDS.items():
+            db.add_all([
+                WordProgress(
+                    child_id=child_id,
+                    word_id=word_id,
+                    times_practiced=3,
+                    is_mastered=index < mastered
+                )
+                for index, word_id in enumerate(words[level])
+            ])
+        # Drifted counters
+        await db.execute(
+            update(LiteracyProgress)
+            .where(LiteracyProgress.child_id == child_id)
+            .values(**{attr: 7 for attr in LEVEL_MASTERED_COLUMNS.values()})
+        )
+        await db.commit()
+
+        rebuilt = await LiteracyService(db).rebuild_words_mastered_counts(
+            child_id if one_child else None
+        )
+
+    assert rebuilt >= 1
+    expected = await _mastered_counts(child_id)
+    assert expected == {level: WORDS[WordLevel(level.value)][1] for level in LEVEL_MASTERED_COLUMNS}
+    assert await _counter_values(child_id) == expected
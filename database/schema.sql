@@ -35,6 +35,9 @@ CREATE TYPE error_type AS ENUM ('factual', 'procedural', 'conceptual', 'visual_s
 -- Consent status for COPPA compliance
 CREATE TYPE consent_status AS ENUM ('pending', 'verified', 'revoked');
 
+-- Word bank levels
+CREATE TYPE word_level AS ENUM ('2-letter', '3-letter', '4-letter', '5-letter');
+
 -- =============================================================================
 -- PARENT/GUARDIAN ACCOUNTS
 -- =============================================================================
@@ -115,6 +118,8 @@ CREATE TABLE literacy_progress (
     
     -- Writing progress
     tracing_accuracy DECIMAL(5,2) DEFAULT 0, -- Average accuracy %
+    letter_mastery_sum DECIMAL(12,6) DEFAULT 0, -- Running sum of per-letter mastery
+    letters_traced INTEGER DEFAULT 0, -- Number of letters in letter_mastery
     independent_writing_level skill_level DEFAULT 'beginner',
     
     -- Comprehension (for ages 6-8)
@@ -129,6 +134,7 @@ CREATE INDEX idx_literacy_child ON literacy_progress(child_id);
 CREATE TABLE tracing_sessions (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     child_id UUID NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+    client_id VARCHAR(64), -- Device-generated id for offline batch uploads
     letter CHAR(1) NOT NULL,
     is_uppercase BOOLEAN DEFAULT TRUE,
     
@@ -140,12 +146,85 @@ CREATE TABLE tracing_sessions (
     
     -- PathMetrics comparison data
     path_deviation_data JSONB,
+    path_samples BYTEA, -- Packed stroke points (see stroke_codec.py)
     
     completed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE INDEX idx_tracing_child ON tracing_sessions(child_id);
 CREATE INDEX idx_tracing_letter ON tracing_sessions(letter);
+-- Covering indexes for keyset-paginated history
+CREATE INDEX ix_tracing_sessions_child_completed
+    ON tracing_sessions(child_id, completed_at DESC, id DESC)
+    INCLUDE (letter, word, stroke_accuracy, stroke_smoothness, time_taken_ms, attempt_number);
+CREATE INDEX ix_tracing_sessions_child_letter_completed
+    ON tracing_sessions(child_id, letter, completed_at DESC, id DESC)
+    INCLUDE (word, stroke_accuracy, stroke_smoothness, time_taken_ms, attempt_number);
+
+-- Word bank
+CREATE TABLE words (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    word VARCHAR(20) UNIQUE NOT NULL,
+    level word_level NOT NULL,
+    
+    -- Phonics info
+    phonemes VARCHAR[] DEFAULT '{}', -- ['c', 'a', 't']
+    syllables INTEGER DEFAULT 1,
+    word_family VARCHAR(20), -- e.g., "-at" family
+    
+    -- Categories
+    category VARCHAR(50), -- short_a, short_e, cvcc, sight_word, etc.
+    is_sight_word BOOLEAN DEFAULT FALSE,
+    
+    -- Teaching
+    difficulty DECIMAL(8,4) DEFAULT 0,
+    age_group_min age_group NOT NULL,
+    age_group_max age_group NOT NULL,
+    
+    -- Assets
+    image_url VARCHAR(500),
+    audio_url VARCHAR(500),
+    sentence_example TEXT,
+    
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_words_level ON words(level);
+
+-- Per-child word progress
+CREATE TABLE word_progress (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    child_id UUID NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+    word_id UUID NOT NULL REFERENCES words(id) ON DELETE CASCADE,
+    
+    -- Mastery tracking
+    times_practiced INTEGER DEFAULT 0,
+    times_correct INTEGER DEFAULT 0,
+    mastery_score DECIMAL(5,2) DEFAULT 0,
+    is_mastered BOOLEAN DEFAULT FALSE,
+    
+    -- Learning stages
+    can_recognize BOOLEAN DEFAULT FALSE,
+    can_sound_out BOOLEAN DEFAULT FALSE,
+    can_read BOOLEAN DEFAULT FALSE,
+    can_spell BOOLEAN DEFAULT FALSE,
+    
+    last_practiced_at TIMESTAMP WITH TIME ZONE,
+    mastered_at TIMESTAMP WITH TIME ZONE,
+    
+    -- Spaced repetition (SM-2)
+    review_streak INTEGER DEFAULT 0, -- Correct answers in a row
+    review_interval_days INTEGER DEFAULT 0,
+    ease_factor DECIMAL(4,2) DEFAULT 2.5,
+    next_review_at TIMESTAMP WITH TIME ZONE,
+    
+    -- One row per child and word (target of the practice upsert)
+    CONSTRAINT uq_word_progress_child_id UNIQUE (child_id, word_id)
+);
+
+-- "Next K due words" is a single index range read
+CREATE INDEX ix_word_progress_child_next_review ON word_progress(child_id, next_review_at);
 
 -- =============================================================================
 -- MATHEMATICS ENGINE
@@ -158,7 +237,9 @@ CREATE TABLE numeracy_progress (
     -- Core skills by milestone
     subitizing_mastery DECIMAL(5,2) DEFAULT 0, -- Ages 2-3
     counting_range INTEGER DEFAULT 0, -- How high can they count
-    numeral_recognition JSONB DEFAULT '{}', -- {"1": true, "2": true, ...}
+    numeral_seen BYTEA, -- 128-bit bitmap: numeral n attempted (bit n, set_bit order)
+    numeral_recognized BYTEA, -- 128-bit bitmap: numeral n recognized on its latest attempt
+    numeral_recognition JSONB, -- Legacy {"1": true, ...}, merged into the bitmaps at startup, then cleared
     
     -- Operations (Ages 4-8)
     addition_mastery DECIMAL(5,2) DEFAULT 0,
@@ -176,6 +257,13 @@ CREATE TABLE numeracy_progress (
     -- Digital manipulatives usage
     nooms_interactions INTEGER DEFAULT 0,
     
+    -- Per-fact fluency: uint16 [operation][operand1][operand2][attempts, accuracy, latency]
+    fact_matrix BYTEA,
+    
+    -- Shape recognition: 4-bit counter per shape, bitmask of shapes attempted
+    shape_counters BIGINT DEFAULT 0,
+    shapes_seen INTEGER DEFAULT 0,
+    
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -314,6 +402,14 @@ CREATE TABLE game_states (
 
 CREATE INDEX idx_gamestate_child ON game_states(child_id);
 
+-- Sharded star ledger: star sub-counters per child, summed on read
+CREATE TABLE star_ledger (
+    child_id UUID NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+    shard INTEGER NOT NULL,
+    stars INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (child_id, shard)
+);
+
 -- Session tracking for analytics
 CREATE TABLE play_sessions (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -358,6 +454,42 @@ CREATE TABLE milestone_events (
 
 CREATE INDEX idx_milestones_child ON milestone_events(child_id);
 
+-- Append-only learning event log, range-partitioned by month
+-- (monthly partitions are created at application startup)
+CREATE TABLE learning_events (
+    id BIGSERIAL,
+    occurred_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    child_id UUID NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+    
+    module learning_module, -- NULL for game events
+    event_type VARCHAR(50) NOT NULL,
+    payload JSONB DEFAULT '{}',
+    
+    recorded_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, occurred_at)
+) PARTITION BY RANGE (occurred_at);
+
+CREATE TABLE learning_events_default PARTITION OF learning_events DEFAULT;
+CREATE INDEX idx_learning_events_child_occurred ON learning_events(child_id, occurred_at);
+CREATE INDEX idx_learning_events_child_id ON learning_events(child_id, id);
+
+-- Projection checkpoints: progress state rebuilt from learning_events
+CREATE TABLE projection_checkpoints (
+    child_id UUID NOT NULL REFERENCES children(id) ON DELETE CASCADE,
+    projection VARCHAR(50) NOT NULL,
+    version INTEGER NOT NULL,
+    
+    state JSONB NOT NULL,
+    last_event_id BIGINT NOT NULL DEFAULT 0,
+    
+    -- Replays start here (progress from before the event log)
+    baseline JSONB NOT NULL,
+    baseline_event_id BIGINT NOT NULL DEFAULT 0,
+    
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (child_id, projection)
+);
+
 -- Joint quests for parent-child co-learning
 CREATE TABLE joint_quests (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),